@@ -0,0 +1,68 @@
+# bench_alloc.py
+# Micro-benchmarks of the pure helpers (no network): allocation (proportional_split,
+# split_missing_minutes, plan_worklogs for a month and a year), working_days, the Jira
+# time/date formats, issue-key extraction and date ranges.
+# Usage:  python bench/bench_alloc.py [--number 2000]
+
+import os
+import sys
+import random
+import timeit
+import argparse
+import datetime as dt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jira_worklog_helpers import (  # noqa: E402
+    extract_issue_key, local_iso_with_tz, minutes_to_jira_time, proportional_split,
+    resolve_range, split_missing_minutes, working_days,
+)
+from jira_worklog_runner import plan_worklogs  # noqa: E402
+
+
+def cases():
+    month = working_days(dt.date(2025, 10, 1), dt.date(2025, 10, 31))
+    year = working_days(dt.date(2025, 1, 1), dt.date(2025, 12, 31))
+    few = [{"issue": f"PRJ-{i}", "weight": 1 + i % 3} for i in range(5)]
+    many = [{"issue": f"PRJ-{i}", "weight": 1 + i % 7} for i in range(50)]
+    half_logged = {d: 240 for d in year[::2]}
+    weights5 = [t["weight"] for t in few]
+    weights50 = [t["weight"] for t in many]
+    return {
+        "alloc.proportional_split.5": lambda: proportional_split(480, weights5),
+        "alloc.proportional_split.50": lambda: proportional_split(480, weights50),
+        "alloc.split_missing.5": lambda: split_missing_minutes(233, weights5),
+        "alloc.working_days.year": lambda: working_days(dt.date(2025, 1, 1), dt.date(2025, 12, 31)),
+        "helpers.minutes_to_jira_time": lambda: minutes_to_jira_time(455),
+        "helpers.local_iso_with_tz": lambda: local_iso_with_tz(dt.date(2025, 10, 6)),
+        "helpers.extract_issue_key.url": lambda: extract_issue_key("https://x.atlassian.net/browse/sint-1234"),
+        "helpers.extract_issue_key.key": lambda: extract_issue_key(" SINT-1234 "),
+        "helpers.resolve_range.last_week": lambda: resolve_range("last_week", dt.date(2025, 10, 8)),
+        "alloc.plan.month.5": lambda: plan_worklogs(few, month),
+        "alloc.plan.year.50": lambda: plan_worklogs(many, year, half_logged),
+        "alloc.plan.year.50.random3": lambda: plan_worklogs(many, year, half_logged, 3, random.Random(1)),
+    }
+
+
+def run(number=2000, repeat=5):
+    """{case: {"us_per_call"}} – best of `repeat` timeit runs; heavy cases get fewer calls."""
+    results = {}
+    for name, fn in cases().items():
+        n = max(number // 100, 1) if ".year." in name else number
+        best = min(timeit.repeat(fn, number=n, repeat=repeat)) / n
+        results[name] = {"us_per_call": round(best * 1e6, 2)}
+    return results
+
+
+def main_cli():
+    ap = argparse.ArgumentParser(description="Micro-benchmark the pure worklog helpers.")
+    ap.add_argument("--number", type=int, default=2000, help="calls per timing run (year plans: /100)")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    for name, r in run(args.number, args.repeat).items():
+        print(f"{name:<30} {r['us_per_call']:>12.2f} µs/call")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,62 @@
+# bench_ingest.py
+# Compares the ingest paths of main.py ("search" = search with inline worklogs, /worklog only for
+# issues with more than one inline page, vs. "bulk" = worklog/updated + list)
+# against the local stub server. Usage:  python bench/bench_ingest.py [--issues 300] [--latency 0.01]
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main  # noqa: E402
+from stub_jira import StubJira  # noqa: E402
+
+
+def run_mode(stub, mode, user):
+    stub.reset_counts()
+    t0 = time.perf_counter()
+    result = main.tracked_hours_with_details(user, mode=mode)
+    elapsed = time.perf_counter() - t0
+    calls = sum(stub.counts.values())
+    return elapsed, calls, dict(stub.counts), result
+
+
+def normalize(result):
+    return sorted((day, e["issue"], e["hours"]) for day, entries in result.items() for e in entries)
+
+
+def main_cli():
+    ap = argparse.ArgumentParser(description="Benchmark main.py ingest modes against a stub Jira.")
+    ap.add_argument("--issues", type=int, default=300)
+    ap.add_argument("--worklogs-per-issue", type=int, default=6)
+    ap.add_argument("--latency", type=float, default=0.01, help="simulated server latency per request [s]")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    with StubJira(issues=args.issues, worklogs_per_issue=args.worklogs_per_issue, latency=args.latency) as stub:
+        main.JIRA_URL = stub.base_url
+        rows = {}
+        for mode in ("search", "bulk"):
+            best = None
+            for _ in range(args.repeat):
+                elapsed, calls, counts, result = run_mode(stub, mode, "me")
+                if best is None or elapsed < best[0]:
+                    best = (elapsed, calls, counts, result)
+            rows[mode] = best
+
+    same = normalize(rows["search"][3]) == normalize(rows["bulk"][3])
+    print(f"issues={args.issues} worklogs/issue={args.worklogs_per_issue} latency={args.latency * 1000:.1f}ms")
+    print("mode   |  best [s] | HTTP calls | per endpoint")
+    print("-------|-----------|------------|-------------")
+    for mode, (elapsed, calls, counts, _) in rows.items():
+        detail = ", ".join(f"{k}={v}" for k, v in sorted(counts.items()))
+        print(f"{mode:<6} | {elapsed:>9.3f} | {calls:>10} | {detail}")
+    print(f"identical results: {'yes' if same else 'NO'}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
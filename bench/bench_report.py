@@ -0,0 +1,78 @@
+# bench_report.py
+# End-to-end main.py report generation against the stub: console report (search/bulk),
+# team summary, a CSV export and the paged issue search, timed with the same data and simulated latency.
+# Usage:  python bench/bench_report.py [--issues 300] [--latency 0.01] [--repeat 3]
+
+import io
+import os
+import sys
+import time
+import argparse
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main  # noqa: E402
+from stub_jira import StubJira  # noqa: E402
+
+USERS = ["me", "alice", "bob"]
+
+
+def best_of(stub, fn, repeat):
+    """(best seconds, HTTP calls of one run) – the output of `fn` is swallowed."""
+    best = None
+    for _ in range(repeat):
+        stub.reset_counts()
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, sum(stub.counts.values())
+
+
+def run(issues=300, latency=0.01, repeat=3):
+    """{case: {"best_s", "calls"}} for the main.py report paths."""
+    start, end = main.month_range(main.date.today())
+    with StubJira(issues=issues, users=USERS, latency=latency) as stub:
+        main.JIRA_URL = stub.base_url
+        cases = {
+            "report.table.search": lambda: main.report_users(["me"], start, end, mode="search"),
+            "report.table.bulk": lambda: main.report_users(["me"], start, end, mode="bulk"),
+            "report.team.search": lambda: main.report_users(USERS, start, end, mode="search", team=True),
+            "report.team.bulk": lambda: main.report_users(USERS, start, end, mode="bulk", team=True),
+            "report.csv.bulk": lambda: main.export_rows(USERS, start, end, "csv", os.devnull, mode="bulk"),
+        }
+        results = {}
+        for name, fn in cases.items():
+            best, calls = best_of(stub, fn, repeat)
+            results[name] = {"best_s": round(best, 4), "calls": calls}
+        main.finish_run()  # drop the spans recorded by main.SESSION
+    # the issue search alone, with Jira capping pages at 50 issues (first page, then the rest in parallel)
+    with StubJira(issues=issues, users=USERS, latency=latency, search_max=50) as stub:
+        main.JIRA_URL = stub.base_url
+        best, calls = best_of(stub, lambda: list(main.fetch_my_issues(USERS, start, end)), repeat)
+        results["search.pages.50"] = {"best_s": round(best, 4), "calls": calls}
+        main.finish_run()
+    return results
+
+
+def main_cli():
+    ap = argparse.ArgumentParser(description="Benchmark main.py report generation against a stub Jira.")
+    ap.add_argument("--issues", type=int, default=300)
+    ap.add_argument("--latency", type=float, default=0.01, help="simulated server latency per request [s]")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    results = run(args.issues, args.latency, args.repeat)
+    print(f"issues={args.issues} latency={args.latency * 1000:.1f}ms users={','.join(USERS)}")
+    print("case                 |  best [s] | HTTP calls")
+    print("---------------------|-----------|-----------")
+    for name, r in results.items():
+        print(f"{name:<20} | {r['best_s']:>9.3f} | {r['calls']:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,92 @@
+# bench_store.py
+# Memory and aggregation time: dict-of-lists (tracked_hours_by_user) vs. WorklogStore.
+# Usage:  python bench/bench_store.py [--users 20] [--days 250] [--per-day 6]
+
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from collections import defaultdict
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+def make_rows(users, days, per_day, issues=400, seed=1):
+    rnd = random.Random(seed)
+    first = date(2025, 1, 1)
+    summaries = [f"Summary of a fairly typical ticket number {i}" for i in range(issues)]
+    for u in range(users):
+        for d in range(days):
+            day = (first + timedelta(days=d)).strftime("%Y-%m-%d")
+            for _ in range(per_day):
+                i = rnd.randrange(issues)
+                seconds = rnd.choice((900, 1800, 3600, 7200))
+                # fresh strings per row, like json.loads produces them
+                yield {
+                    "user": f"user{u}", "date": "".join(day), "issue": f"PRJ-{i}",
+                    "summary": "".join(summaries[i]), "seconds": seconds,
+                    "hours": round(seconds / 3600, 2),
+                }
+
+
+def build_dict_of_lists(rows):
+    result = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        result[row["user"]][row["date"]].append(
+            {"issue": row["issue"], "summary": row["summary"], "hours": row["hours"]})
+    return result
+
+
+def totals_dict_of_lists(result):
+    return {(u, d): sum(e["hours"] for e in logs) for u, days in result.items() for d, logs in days.items()}
+
+
+def measure(build, rows_args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    obj = build(make_rows(*rows_args))
+    t_build = time.perf_counter() - t0
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, t_build, current
+
+
+def main_cli():
+    ap = argparse.ArgumentParser(description="Benchmark WorklogStore vs. dict-of-lists.")
+    ap.add_argument("--users", type=int, default=20)
+    ap.add_argument("--days", type=int, default=250)
+    ap.add_argument("--per-day", type=int, default=6)
+    args = ap.parse_args()
+    rows_args = (args.users, args.days, args.per_day)
+    n = args.users * args.days * args.per_day
+
+    dol, t_dol, m_dol = measure(build_dict_of_lists, rows_args)
+    t0 = time.perf_counter()
+    dol_totals = totals_dict_of_lists(dol)
+    a_dol = time.perf_counter() - t0
+    del dol
+
+    store, t_store, m_store = measure(main.WorklogStore.from_rows, rows_args)
+    t0 = time.perf_counter()
+    store_totals = store.totals("user", "day")
+    a_store = time.perf_counter() - t0
+
+    same = all(abs(dol_totals[k] - v / 3600) < 0.01 for k, v in store_totals.items()) \
+        and len(dol_totals) == len(store_totals)
+    print(f"rows={n} (users={args.users} days={args.days} per day={args.per_day}) "
+          f"numpy={'yes' if main.np is not None else 'no'}")
+    print("structure     | memory [MB] | build [s] | user×day totals [s]")
+    print("--------------|-------------|-----------|--------------------")
+    print(f"dict-of-lists | {m_dol / 2**20:>11.1f} | {t_dol:>9.3f} | {a_dol:>18.4f}")
+    print(f"WorklogStore  | {m_store / 2**20:>11.1f} | {t_store:>9.3f} | {a_store:>18.4f}")
+    print(f"identical totals: {'yes' if same else 'NO'}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
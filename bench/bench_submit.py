@@ -0,0 +1,139 @@
+# bench_submit.py
+# Cloud submission path of the GUI/runner (CloudEngine + run_logging, i.e. what
+# _do_logging does in "jira_worklog_new_jiraV2 - 1.py"), undoing that run and issue
+# resolution against the stub.
+# A fresh stub per repetition, so fill_gaps sees the same already-logged minutes every time.
+# Usage:  python bench/bench_submit.py [--tickets 5] [--latency 0.01] [--throttle-every 25]
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import datetime as dt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import jira_worklog_runner  # noqa: E402
+from jira_worklog_runner import CloudEngine, FileLog, build_session, last_run, run_logging, undo_run  # noqa: E402
+from jira_worklog_trace import finish_run  # noqa: E402
+from stub_jira import StubJira  # noqa: E402
+
+EMAIL = "me@example.com"
+
+
+def previous_month(today=None):
+    first = (today or dt.date.today()).replace(day=1)
+    end = first - dt.timedelta(days=1)
+    return end.replace(day=1), end
+
+
+@contextlib.contextmanager
+def temp_runner_log():
+    """Point the runner's module-level LOG at a temp file, so benches never touch ~/.jira_worklog_gui.log."""
+    with tempfile.TemporaryDirectory() as tmp:
+        saved, jira_worklog_runner.LOG = jira_worklog_runner.LOG, FileLog(os.path.join(tmp, "runner.log"))
+        try:
+            yield
+        finally:
+            jira_worklog_runner.LOG.flush()
+            jira_worklog_runner.LOG = saved
+
+
+def submit_once(issues, tickets, latency, throttle_every):
+    start, end = previous_month()
+    with StubJira(issues=issues, latency=latency, throttle_every=throttle_every) as stub, \
+            tempfile.TemporaryDirectory() as tmp:
+        engine = CloudEngine(build_session(), stub.base_url, EMAIL, "token")
+        plan = [{"issue": f"PRJ-{i + 1}", "weight": 1 + i % 3} for i in range(tickets)]
+        t0 = time.perf_counter()
+        stats = run_logging(engine, plan, start, end, on_status=lambda line: None, journal=None,
+                            outbox=os.path.join(tmp, "outbox.json"))
+        elapsed = time.perf_counter() - t0
+        return elapsed, stats, dict(stub.counts)
+
+
+def undo_once(issues, tickets, latency, workers):
+    """Log last month for `tickets` (journaled to a temp file), then time undoing that run."""
+    start, end = previous_month()
+    with StubJira(issues=issues, latency=latency) as stub, tempfile.TemporaryDirectory() as tmp:
+        journal = os.path.join(tmp, "runs.json")
+        engine = CloudEngine(build_session(), stub.base_url, EMAIL, "token")
+        run_logging(engine, [{"issue": f"PRJ-{i + 1}", "weight": 1} for i in range(tickets)], start, end,
+                    on_status=lambda line: None, journal=journal, outbox=os.path.join(tmp, "outbox.json"))
+        run = last_run("cloud", stub.base_url, EMAIL, journal)
+        t0 = time.perf_counter()
+        failed = undo_run(run, "token", session=engine.session, workers=workers)
+        elapsed = time.perf_counter() - t0
+        left = sum(1 for wl in stub.created if int(wl["id"]) in stub.worklogs)
+        return elapsed, len(run["created"]), len(failed) + left
+
+
+def resolve_once(issues, count, latency):
+    # mix of the inputs users paste: keys, lower-case keys, browse URLs, numeric ids
+    raw = []
+    for i in range(count):
+        n = 1 + i % issues
+        raw.append((f"PRJ-{n}", f"prj-{n}", f"https://x.atlassian.net/browse/PRJ-{n}", str(10000 + n - 1))[i % 4])
+    with StubJira(issues=issues, latency=latency) as stub:
+        engine = CloudEngine(build_session(), stub.base_url, EMAIL, "token")
+        t0 = time.perf_counter()
+        resolved = engine.resolve([{"issue": r, "weight": 1} for r in raw])
+        elapsed = time.perf_counter() - t0
+        assert len(resolved) == count
+        return elapsed, sum(stub.counts.values())
+
+
+def run(issues=300, tickets=5, latency=0.01, repeat=3, throttle_every=25, resolve_count=40):
+    """{case: metrics} for Cloud submission (with/without 429s) and issue resolution."""
+    with temp_runner_log():
+        results = {}
+        for name, throttle in (("submit.cloud", 0), ("submit.cloud.429", throttle_every)):
+            if name.endswith("429") and not throttle:
+                continue
+            best = None
+            for _ in range(repeat):
+                elapsed, stats, counts = submit_once(issues, tickets, latency, throttle)
+                if best is None or elapsed < best[0]:
+                    best = (elapsed, stats, counts)
+            elapsed, stats, counts = best
+            results[name] = {
+                "best_s": round(elapsed, 4),
+                "calls": sum(counts.values()),
+                "worklogs": stats["ok"],
+                "failed": stats["failed"],
+                "throttled": counts.get("429", 0),
+                "worklogs_per_s": round(stats["ok"] / elapsed, 2) if elapsed else 0.0,
+            }
+        for workers in (1, 8):
+            best = min(undo_once(issues, tickets, latency, workers) for _ in range(repeat))
+            results[f"undo.cloud.w{workers}"] = {"best_s": round(best[0], 4), "worklogs": best[1],
+                                                 "failed": best[2]}
+        best = min(resolve_once(issues, resolve_count, latency) for _ in range(repeat))
+        results["resolve.cloud"] = {"best_s": round(best[0], 4), "calls": best[1], "tickets": resolve_count}
+        finish_run()  # spans of the bench sessions are not interesting here
+    return results
+
+
+def main_cli():
+    ap = argparse.ArgumentParser(description="Benchmark Cloud worklog submission and issue resolution against a stub Jira.")
+    ap.add_argument("--issues", type=int, default=300)
+    ap.add_argument("--tickets", type=int, default=5, help="tickets split over every workday of last month")
+    ap.add_argument("--latency", type=float, default=0.01, help="simulated server latency per request [s]")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--throttle-every", type=int, default=25, help="every N-th request gets 429 (0 = off)")
+    ap.add_argument("--resolve", type=int, default=40, help="ticket inputs to resolve")
+    args = ap.parse_args()
+
+    results = run(args.issues, args.tickets, args.latency, args.repeat, args.throttle_every, args.resolve)
+    print(f"issues={args.issues} tickets={args.tickets} latency={args.latency * 1000:.1f}ms")
+    for name, r in results.items():
+        detail = ", ".join(f"{k}={v}" for k, v in r.items() if k != "best_s")
+        print(f"{name:<17} | {r['best_s']:>8.3f} s | {detail}")
+    return 0 if all(r.get("failed", 0) == 0 for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
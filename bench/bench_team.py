@@ -0,0 +1,48 @@
+# bench_team.py
+# Team report: one run per user (old way) vs. one combined fetch for all users.
+# Usage:  python bench/bench_team.py [--issues 300] [--latency 0.01]
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main  # noqa: E402
+from stub_jira import StubJira  # noqa: E402
+
+
+def main_cli():
+    ap = argparse.ArgumentParser(description="Benchmark per-user vs. combined team fetch.")
+    ap.add_argument("--issues", type=int, default=300)
+    ap.add_argument("--latency", type=float, default=0.01)
+    ap.add_argument("--mode", choices=("search", "bulk"), default="search")
+    args = ap.parse_args()
+
+    users = ["me", "alice", "bob"]
+    start, end = main.month_range(main.date.today())
+    with StubJira(issues=args.issues, users=users, latency=args.latency) as stub:
+        main.JIRA_URL = stub.base_url
+
+        stub.reset_counts()
+        t0 = time.perf_counter()
+        separate = {u: main.tracked_hours_with_details(u, start, end, mode=args.mode) for u in users}
+        t_separate, c_separate = time.perf_counter() - t0, sum(stub.counts.values())
+
+        stub.reset_counts()
+        t0 = time.perf_counter()
+        team = main.tracked_hours_by_user(users, start, end, mode=args.mode, cache=main.new_cache())
+        t_team, c_team = time.perf_counter() - t0, sum(stub.counts.values())
+
+    same = all(main.daily_totals(separate[u]) == main.daily_totals(team[u]) for u in users)
+    print(f"users={len(users)} issues={args.issues} mode={args.mode} latency={args.latency * 1000:.1f}ms")
+    print(f"per user : {t_separate:8.3f} s  {c_separate:5} HTTP calls")
+    print(f"team     : {t_team:8.3f} s  {c_team:5} HTTP calls")
+    print(f"identical totals: {'yes' if same else 'NO'}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,31 @@
+# check_helpers.py
+# Thin wrapper around the Hypothesis properties in tests/test_helpers.py (pure helpers and
+# plan_worklogs) with many more examples than a plain pytest run; exit code 1 on a counterexample.
+# Run before/after optimizing the allocation or date math.
+# Usage:  python bench/check_helpers.py [--examples 2000] [--seed 1] [extra pytest args]
+
+import os
+import sys
+import argparse
+
+import pytest
+
+TESTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "test_helpers.py")
+
+
+def main_cli():
+    ap = argparse.ArgumentParser(description="Property checks for the pure worklog helpers (Hypothesis).")
+    ap.add_argument("--examples", type=int, default=2000, help="examples per property")
+    ap.add_argument("--seed", type=int, default=1)
+    args, rest = ap.parse_known_args()
+    try:
+        from hypothesis import settings
+    except ImportError:
+        print("check_helpers needs hypothesis (pip install hypothesis)", file=sys.stderr)
+        return 2
+    settings.register_profile("check", max_examples=args.examples, deadline=None)
+    return pytest.main([TESTS, "-q", "--hypothesis-profile=check", f"--hypothesis-seed={args.seed}", *rest])
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,102 @@
+# run_all.py
+# Runs the benchmark suite against the local stub Jira and writes one results file per run,
+# so runs on different commits can be compared:
+#   python bench/run_all.py                       # -> bench/results/<timestamp>-<commit>.json
+#   python bench/run_all.py --quick --compare bench/results/<older>.json
+
+import os
+import sys
+import json
+import argparse
+import platform
+import subprocess
+import datetime as dt
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import bench_alloc  # noqa: E402
+import bench_report  # noqa: E402
+import bench_submit  # noqa: E402
+
+# metric compared between runs per case (lower is better)
+PRIMARY = ("best_s", "us_per_call")
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def primary(metrics):
+    for key in PRIMARY:
+        if key in metrics:
+            return key, metrics[key]
+    return None, None
+
+
+def compare(old, new):
+    print(f"\n{'case':<30} {'old':>10} {'new':>10} {'change':>8}")
+    for name, metrics in new["results"].items():
+        key, value = primary(metrics)
+        prev = old["results"].get(name, {}).get(key)
+        if prev is None:
+            print(f"{name:<30} {'-':>10} {value:>10} {'new':>8}")
+            continue
+        change = (value - prev) / prev * 100 if prev else 0.0
+        print(f"{name:<30} {prev:>10} {value:>10} {change:>+7.1f}%")
+
+
+def main_cli():
+    ap = argparse.ArgumentParser(description="Run all benchmarks against the stub Jira and save the results.")
+    ap.add_argument("--issues", type=int, default=300)
+    ap.add_argument("--latency", type=float, default=0.01, help="simulated server latency per request [s]")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--quick", action="store_true", help="smaller data and one repetition")
+    ap.add_argument("--out", default=os.path.join(HERE, "results"), help="results directory (default: %(default)s)")
+    ap.add_argument("--compare", metavar="FILE", help="earlier results file to diff against")
+    args = ap.parse_args()
+    if args.quick:
+        args.issues, args.repeat = 100, 1
+
+    results = {}
+    steps = (
+        ("report", lambda: bench_report.run(args.issues, args.latency, args.repeat)),
+        ("submit", lambda: bench_submit.run(args.issues, latency=args.latency, repeat=args.repeat)),
+        ("alloc", lambda: bench_alloc.run(number=200 if args.quick else 2000)),
+    )
+    for label, step in steps:
+        print(f"… {label}", flush=True)
+        results.update(step())
+
+    doc = {
+        "created": dt.datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"issues": args.issues, "latency": args.latency, "repeat": args.repeat, "quick": args.quick},
+        "results": results,
+    }
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"{dt.datetime.now():%Y%m%d-%H%M%S}-{doc['commit']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2)
+
+    for name, metrics in results.items():
+        key, value = primary(metrics)
+        print(f"{name:<30} {key:>12} = {value}")
+    print(f"\nresults: {path}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), doc)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
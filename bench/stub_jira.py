@@ -0,0 +1,326 @@
+# stub_jira.py
+# Minimal in-process Jira REST stub for benchmarks (stdlib only).
+# Serves deterministic issues/worklogs so different ingest paths can be timed
+# against each other with the same data and the same simulated latency.
+# REST v2 (Server, main.py) and v3 (Cloud GUI/runner) share the same data:
+#   GET  /search, /issue/{key|id}, /issue/{key}/worklog, /myself, /worklog/updated
+#   POST /worklog/list, /issue/{key}/worklog (create)
+#   DELETE /issue/{key}/worklog/{id}
+# `throttle_every=N` answers every N-th request with 429 + Retry-After to exercise retries.
+
+import re
+import json
+import time
+import base64
+import random
+import datetime as dt
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+UPDATED_PAGE_SIZE = 1000
+WORKLOG_LIST_MAX = 1000
+
+
+def _epoch_ms(d: dt.datetime) -> int:
+    return int(d.timestamp() * 1000)
+
+
+class StubJira:
+    """Generated Jira data + HTTP server. Use as a context manager."""
+
+    def __init__(self, issues=200, worklogs_per_issue=6, users=("me", "alice", "bob"),
+                 latency=0.005, seed=1, today=None, throttle_every=0, retry_after=0, search_max=1000):
+        self.latency = latency
+        self.search_max = search_max  # like Jira, /search silently caps maxResults
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.users = list(users)
+        self.counts = Counter()
+        self.created = []  # worklogs POSTed by clients, in order
+        self._served = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.base_url = ""
+
+        rnd = random.Random(seed)
+        today = today or dt.date.today()
+        month_start = dt.date(today.year, today.month, 1)
+        prev_month = month_start - dt.timedelta(days=20)
+
+        self.issues = {}      # key -> issue dict
+        self.worklogs = {}    # worklog id -> worklog dict
+        self.by_issue = {}    # key -> [worklog ids]
+        wl_id = 500000
+        for i in range(issues):
+            key = f"PRJ-{i + 1}"
+            issue_id = str(10000 + i)
+            self.issues[key] = {"id": issue_id, "key": key, "fields": {"summary": f"Task number {i + 1}"}}
+            self.by_issue[key] = []
+            for _ in range(worklogs_per_issue):
+                base = month_start if rnd.random() < 0.8 else prev_month
+                day = base + dt.timedelta(days=rnd.randrange(0, 27))
+                started = dt.datetime(day.year, day.month, day.day, 16, 0)
+                updated = started + dt.timedelta(minutes=rnd.randrange(0, 600))
+                wl_id += 1
+                self.worklogs[wl_id] = {
+                    "id": str(wl_id),
+                    "issueId": issue_id,
+                    "author": self._author(rnd.choice(self.users)),
+                    "started": started.strftime("%Y-%m-%dT%H:%M:%S.000+0000"),
+                    "timeSpentSeconds": rnd.choice((900, 1800, 3600, 7200)),
+                    "updated": _epoch_ms(updated),
+                }
+                self.by_issue[key].append(wl_id)
+        self._issues_by_id = {v["id"]: v for v in self.issues.values()}
+        self._next_wl_id = wl_id + 1
+
+    # ---------- lifecycle ----------
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._handle(self, "GET", None)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                stub._handle(self, "POST", body)
+
+            def do_DELETE(self):
+                stub._handle(self, "DELETE", None)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_counts(self):
+        with self._lock:
+            self.counts.clear()
+            self._served = 0
+
+    @staticmethod
+    def _author(name):
+        return {"name": name, "accountId": f"acc-{name}", "emailAddress": f"{name}@example.com"}
+
+    def _caller(self, req):
+        """Basic auth 'me@example.com' / 'me' -> 'me'; anything else (Bearer PAT) is the first user."""
+        auth = req.headers.get("Authorization", "")
+        if auth.startswith("Basic "):
+            user = base64.b64decode(auth[6:]).decode("utf-8").split(":", 1)[0]
+            return user.split("@", 1)[0]
+        return self.users[0]
+
+    # ---------- routing ----------
+    def _handle(self, req, method, body):
+        url = urlparse(req.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = re.sub(r"^/rest/api/[23]", "", url.path)
+        user = self._caller(req)
+
+        with self._lock:
+            self._served += 1
+            throttled = self.throttle_every and self._served % self.throttle_every == 0
+        m = re.fullmatch(r"/issue/([^/]+)(/worklog)?", path)
+        m_wl = re.fullmatch(r"/issue/([^/]+)/worklog/(\d+)", path)
+        if throttled:
+            status, data = 429, {"errorMessages": ["Rate limit exceeded"]}
+            name = "429"
+        elif method == "GET" and path == "/search":
+            status, data = self._search(q, user)
+            name = "GET /search"
+        elif method == "GET" and path == "/myself":
+            status, data = 200, self._author(user)
+            name = "GET /myself"
+        elif method == "GET" and path == "/worklog/updated":
+            status, data = self._updated(q)
+            name = "GET /worklog/updated"
+        elif method == "POST" and path == "/worklog/list":
+            status, data = self._list(body)
+            name = "POST /worklog/list"
+        elif method == "GET" and m and m.group(2):
+            status, data = self._issue_worklogs(m.group(1))
+            name = "GET /issue/{key}/worklog"
+        elif method == "POST" and m and m.group(2):
+            status, data = self._create_worklog(m.group(1), body, user)
+            name = "POST /issue/{key}/worklog"
+        elif method == "GET" and m:
+            status, data = self._issue(m.group(1), q)
+            name = "GET /issue/{key}"
+        elif method == "DELETE" and m_wl:
+            status, data = self._delete_worklog(m_wl.group(1), int(m_wl.group(2)), user)
+            name = "DELETE /issue/{key}/worklog/{id}"
+        else:
+            status, data = 404, {"errorMessages": [f"No route {method} {url.path}"]}
+            name = "404"
+
+        with self._lock:
+            self.counts[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        raw = json.dumps(data).encode("utf-8") if data is not None else b""
+        req.send_response(status)
+        req.send_header("Content-Type", "application/json")
+        req.send_header("Content-Length", str(len(raw)))
+        if status == 429:
+            req.send_header("Retry-After", str(self.retry_after))
+        req.end_headers()
+        req.wfile.write(raw)
+
+    # ---------- endpoints ----------
+    def _public(self, wl):
+        return {k: v for k, v in wl.items() if k != "updated"}
+
+    def _lookup(self, key_or_id):
+        return self.issues.get(key_or_id.upper()) or self._issues_by_id.get(key_or_id)
+
+    def _with_fields(self, issue, fields):
+        out = {"id": issue["id"], "key": issue["key"], "fields": dict(issue["fields"])}
+        if "worklog" in fields:
+            wls = [self._public(self.worklogs[w]) for w in self.by_issue[issue["key"]]]
+            out["fields"]["worklog"] = {"startAt": 0, "maxResults": 20, "total": len(wls), "worklogs": wls[:20]}
+        return out
+
+    def _search(self, q, user):
+        jql = q.get("jql", "")
+        start_at = int(q.get("startAt", 0))
+        max_results = min(int(q.get("maxResults", 50)), self.search_max)
+        fields = q.get("fields", "summary")
+
+        m = re.search(r"id in \(([^)]*)\)", jql)
+        m_id = re.fullmatch(r"\s*id\s*=\s*(\d+)\s*", jql)
+        if m:
+            wanted = {x.strip() for x in m.group(1).split(",") if x.strip()}
+            matched = [self._issues_by_id[i] for i in sorted(wanted, key=int) if i in self._issues_by_id]
+        elif m_id:
+            matched = [self._issues_by_id[m_id.group(1)]] if m_id.group(1) in self._issues_by_id else []
+        elif re.search(r"key in \(([^)]*)\)", jql):
+            wanted = [k.strip().strip('"').upper() for k in re.search(r"key in \(([^)]*)\)", jql).group(1).split(",")]
+            matched = [self.issues[k] for k in dict.fromkeys(wanted) if k in self.issues]
+        else:
+            authors = None
+            if re.search(r"worklogAuthor\s*=\s*currentUser\(\)", jql):
+                authors = {user}
+            m = re.search(r'worklogAuthor\s*=\s*"([^"]+)"', jql)
+            if m:
+                authors = {m.group(1)}
+            m = re.search(r"worklogAuthor\s+in\s*\(([^)]*)\)", jql)
+            if m:
+                authors = {a.strip().strip('"') for a in m.group(1).split(",")}
+            date_from = date_to = None
+            if "startOfMonth()" in jql:
+                today = dt.date.today()
+                date_from = dt.date(today.year, today.month, 1).isoformat()
+            m = re.search(r'worklogDate\s*>=\s*"([\d-]+)"', jql)
+            if m:
+                date_from = m.group(1)
+            m = re.search(r'worklogDate\s*<=\s*"([\d-]+)"', jql)
+            if m:
+                date_to = m.group(1)
+
+            matched = []
+            for key, issue in self.issues.items():
+                for wid in self.by_issue[key]:
+                    wl = self.worklogs[wid]
+                    day = wl["started"][:10]
+                    if authors is not None and wl["author"]["name"] not in authors:
+                        continue
+                    if date_from and day < date_from:
+                        continue
+                    if date_to and day > date_to:
+                        continue
+                    matched.append(issue)
+                    break
+
+        page = [self._with_fields(i, fields) for i in matched[start_at:start_at + max_results]]
+        return 200, {"startAt": start_at, "maxResults": max_results, "total": len(matched), "issues": page}
+
+    def _issue(self, key_or_id, q):
+        issue = self._lookup(key_or_id)
+        if issue is None:
+            return 404, {"errorMessages": ["Issue does not exist or you do not have permission to see it."]}
+        return 200, self._with_fields(issue, q.get("fields", "summary"))
+
+    def _create_worklog(self, key_or_id, body, user):
+        issue = self._lookup(key_or_id)
+        if issue is None:
+            return 404, {"errorMessages": ["Issue does not exist or you do not have permission to see it."]}
+        body = body or {}
+        if int(body.get("timeSpentSeconds", 0)) <= 0 or not body.get("started"):
+            return 400, {"errorMessages": [], "errors": {"timeLogged": "You must indicate the time spent working."}}
+        with self._lock:
+            wl_id = self._next_wl_id
+            self._next_wl_id += 1
+            wl = {
+                "id": str(wl_id),
+                "issueId": issue["id"],
+                "author": self._author(user),
+                "started": body["started"],
+                "timeSpentSeconds": int(body["timeSpentSeconds"]),
+                "updated": _epoch_ms(dt.datetime.now()),
+            }
+            self.worklogs[wl_id] = wl
+            self.by_issue[issue["key"]].append(wl_id)
+            self.created.append(wl)
+        return 201, self._public(wl)
+
+    def _delete_worklog(self, key_or_id, wl_id, user):
+        issue = self._lookup(key_or_id)
+        with self._lock:
+            wl = self.worklogs.get(wl_id)
+            if issue is None or wl is None or wl["issueId"] != issue["id"]:
+                return 404, {"errorMessages": ["Worklog does not exist"]}
+            if wl["author"]["name"] != user:
+                return 403, {"errorMessages": ["You do not have permission to delete the worklog"]}
+            del self.worklogs[wl_id]
+            self.by_issue[issue["key"]].remove(wl_id)
+        return 204, None
+
+    def _issue_worklogs(self, key):
+        issue = self._lookup(key)
+        if issue is None:
+            return 404, {"errorMessages": ["Issue does not exist"]}
+        wls = [self._public(self.worklogs[w]) for w in self.by_issue[issue["key"]]]
+        return 200, {"startAt": 0, "maxResults": len(wls), "total": len(wls), "worklogs": wls}
+
+    def _updated(self, q):
+        since = int(q.get("since", 0))
+        rows = sorted((wl["updated"], int(wl["id"])) for wl in self.worklogs.values() if wl["updated"] >= since)
+        page = rows[:UPDATED_PAGE_SIZE]
+        last = len(rows) <= UPDATED_PAGE_SIZE
+        until = page[-1][0] if page else since
+        return 200, {
+            "values": [{"worklogId": wid, "updatedTime": upd} for upd, wid in page],
+            "since": since,
+            "until": until,
+            "lastPage": last,
+        }
+
+    def _list(self, body):
+        ids = (body or {}).get("ids", [])
+        if len(ids) > WORKLOG_LIST_MAX:
+            return 400, {"errorMessages": [f"Max {WORKLOG_LIST_MAX} ids per request"]}
+        return 200, [self._public(self.worklogs[int(i)]) for i in ids if int(i) in self.worklogs]
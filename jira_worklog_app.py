@@ -0,0 +1,300 @@
+# jira_worklog_app.py
+# Runtime shared by both GUIs (Cloud and Server): the worker -> Tk queue, warm-up of the
+# next run, the offline outbox, undo of the last run, pause / cancel and a clean close.
+# The GUIs keep their widgets, Slovak labels and engine choice; everything that reacts to
+# threads lives here once, so a fix lands in both windows.
+import queue
+import datetime as dt
+import threading
+from tkinter import messagebox
+
+from jira_worklog_runner import (
+    LOG_PATH, AuthError, RunControl, Warmup, build_session, flush_outbox, last_run, log_exc, log_text,
+    outbox_entries, run_entries, undo_run, update_run,
+)
+from jira_worklog_helpers import format_logged_days, working_days
+from jira_worklog_trace import finish_run, start_run
+
+UI_POLL_MS = 50  # how often the Tk thread drains the queue (one redraw per tick)
+WARMUP_DEBOUNCE_MS = 800  # start the warm-up once the user stops typing credentials / dates / tickets
+OUTBOX_RETRY_MS = 60_000  # while idle, retry sending worklogs queued during an outage this often
+CLOSE_DEADLINE_S = 25  # on close, wait this long for the requests in flight (requests time out after 20 s)
+
+
+class WorklogAppMixin:
+    """Thread-facing half of a worklog window; mix into the tk.Tk subclass.
+
+    The window provides the widgets (`status_var`, `progress`, `run_btn`, `undo_btn`,
+    `pause_btn`, `cancel_btn`, the range / option variables), `RUN_KIND` and `JIRA_BASE`
+    (journal key of its runs), `MISSING_CREDENTIALS` (message when a field is empty) and:
+
+    - `_credentials()` -> (account, secret) as typed
+    - `_credential_entries()` -> the entry widgets of those two
+    - `_engine(secret, headless=False)` -> a run engine for the typed account
+    - `read_checked_tickets()` -> the tickets a run would log
+    - `_save_and_destroy()` -> persist the settings and destroy the window
+
+    Call `_init_runtime()` before building the widgets and `_start_runtime()` after.
+    """
+
+    RUN_KIND = "cloud"
+    JIRA_BASE = ""
+    MISSING_CREDENTIALS = "Zadaj prihlasovacie údaje."
+    CLOSE_DEADLINE_S = CLOSE_DEADLINE_S
+
+    def _init_runtime(self):
+        # Worker threads never touch Tk directly – they post here, _drain_ui_queue applies it.
+        # Callables are never dropped; status lines and progress rows are coalesced instead
+        # (one marker in the queue, the newest text / changed rows kept under _ui_lock).
+        self._ui_queue = queue.Queue()
+        self._ui_lock = threading.Lock()
+        self._ui_status = None    # newest status line not drawn yet
+        self._ui_entries = set()  # progress rows changed since the last draw
+
+        # One pooled session for every action; the warm-up prefetches what the next run needs
+        # and reports the time already logged in the range (shown under the range)
+        self.session = build_session()
+        self.warmup = Warmup(on_logged=lambda start, end, logged, error: self._post_ui(
+            lambda: self._show_logged(start, end, logged, error)))
+        self._warmup_job = None
+
+        # Pause / cancel of the running job (None when idle)
+        self._control = None
+        self._worker = None
+        self._flushing = False  # the offline outbox is being sent (see _flush_outbox_tick)
+        # Undo and outbox flush run beside it; close cancels them through _bg_control and
+        # waits for their request in flight, so no DELETE / POST is cut off unjournaled
+        self._bg_control = RunControl()
+        self._undoer = None
+        self._flusher = None
+
+    def _start_runtime(self):
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(UI_POLL_MS, self._drain_ui_queue)
+        self.after(WARMUP_DEBOUNCE_MS, self._flush_outbox_tick)
+        # credentials are validated when their field loses focus, never per keystroke
+        # (bad passwords would end in a CAPTCHA on Jira Server)
+        for entry in self._credential_entries():
+            entry.bind("<FocusOut>", self._schedule_warmup, add="+")
+        for var in (self.start_var, self.end_var, self.fill_gaps_var, self.skip_weekends_var, self.skip_holidays_var):
+            var.trace_add("write", self._schedule_warmup)
+        self._schedule_warmup()
+
+    def _range(self):
+        """(start, end) typed in the range fields, or (None, None) while they don't parse."""
+        try:
+            return (dt.datetime.strptime(self.start_var.get().strip(), "%d.%m.%Y").date(),
+                    dt.datetime.strptime(self.end_var.get().strip(), "%d.%m.%Y").date())
+        except ValueError:
+            return None, None
+
+    # ---------- Warm-up ----------
+    def _schedule_warmup(self, *args):
+        """Debounced: credentials, range or checked tickets changed."""
+        if self._warmup_job is not None:
+            self.after_cancel(self._warmup_job)
+        self._warmup_job = self.after(WARMUP_DEBOUNCE_MS, self._warmup_now)
+
+    def _warmup_now(self):
+        """Validate auth, resolve the checked tickets and read logged time of the range in the background."""
+        self._warmup_job = None
+        account, secret = self._credentials()
+        if not account or not secret or self._control is not None:
+            return
+        if self.focus_get() in self._credential_entries():
+            return  # still typing credentials; <FocusOut> schedules the warm-up again
+        start, end = self._range()
+        valid = start is not None and start <= end
+        engine = self._engine(secret)
+        logged = self.warmup.logged(engine, start, end) if valid else None
+        if logged is not None:
+            self._show_logged(start, end, logged)
+        else:
+            self.logged_var.set("Načítavam zalogovaný čas…" if valid else "")
+        self.warmup.request(engine, self.read_checked_tickets(), start, end, bool(self.fill_gaps_var.get()))
+
+    def _show_logged(self, start, end, logged, error=None):
+        """Time already logged per workday, unless the range was edited since it was requested."""
+        if self._range() != (start, end):
+            return
+        if logged is None:
+            self.logged_var.set(f"Zalogovaný čas sa nepodarilo načítať: {error}"[:300])
+            return
+        days = working_days(start, end, bool(self.skip_weekends_var.get()), bool(self.skip_holidays_var.get()))
+        self.logged_var.set("Zalogované: " + format_logged_days(days, logged))
+
+    # ---------- Offline outbox ----------
+    def _flush_outbox_tick(self):
+        """Periodically, while idle: send the worklogs queued when Jira was unreachable."""
+        self.after(OUTBOX_RETRY_MS, self._flush_outbox_tick)
+        account, secret = self._credentials()
+        if self._flushing or self._control is not None or self._bg_control.cancelled or not account or not secret:
+            return
+        # no window for a browser engine; it only starts once REST /myself answers
+        engine = self._engine(secret, headless=True)
+        if not outbox_entries(engine) or self.warmup.refused(engine):
+            return
+        self._flushing = True
+        self._flusher = threading.Thread(target=self._do_flush, args=(engine,), daemon=True)
+        self._flusher.start()
+
+    def _do_flush(self, engine):
+        try:
+            sent, left = flush_outbox(engine, on_status=self._append_status, control=self._bg_control)
+            if sent:
+                self.warmup.forget(engine)
+                self._post_ui(self._schedule_warmup)
+        except AuthError as e:
+            self.warmup.refuse(engine, str(e))
+        except Exception as e:
+            log_exc("_do_flush", e)
+        finally:
+            engine.close()
+            self._post_ui(lambda: setattr(self, "_flushing", False))
+
+    # ---------- Pause / cancel ----------
+    def pause_clicked(self):
+        if self._control is None:
+            return
+        if self._control.paused:
+            self._control.resume()
+            self.pause_btn.config(text="Pozastaviť")
+            self.status_var.set("Prebieha logovanie…")
+        else:
+            self._control.pause()
+            self.pause_btn.config(text="Pokračovať")
+            self.status_var.set("Pozastavujem po aktuálnom worklogu…")
+
+    def cancel_clicked(self):
+        if self._control is not None:
+            self._control.cancel()
+            self.pause_btn.config(state="disabled")
+            self.cancel_btn.config(state="disabled")
+            self.status_var.set("Ruším – dokončujem rozpracovaný worklog…")
+
+    # ---------- Undo ----------
+    def undo_clicked(self):
+        """Delete every worklog the last recorded run of this account created (REST, in parallel)."""
+        if self._bg_control.cancelled:
+            return
+        account, secret = self._credentials()
+        if not account or not secret:
+            messagebox.showerror("Prihlásenie", self.MISSING_CREDENTIALS)
+            return
+        run = last_run(self.RUN_KIND, self.JIRA_BASE, account)
+        if run is None:
+            messagebox.showinfo("Vrátiť beh", "Nie je čo vrátiť – žiadny zaznamenaný beh.")
+            return
+        days = sorted(e["day"] for e in run["created"])
+        if not messagebox.askyesno("Vrátiť beh", f"Zmazať {len(days)} worklogov z behu {run['id']}"
+                                                 f" ({days[0]} – {days[-1]})?"):
+            return
+        self.run_btn.config(state="disabled")
+        self.undo_btn.config(state="disabled")
+        self.status_var.set("Mažem worklogy…")
+        self._undoer = threading.Thread(target=self._do_undo, args=(run, secret), daemon=True)
+        self._undoer.start()
+
+    def _do_undo(self, run, secret):
+        scope = start_run()
+        entries = run_entries(run)
+        self._post_ui(lambda: self.progress.set_plan(entries))
+        try:
+            failed = undo_run(run, secret, entries, session=self.session,
+                              on_entry=lambda i, entry: self._post_entry(i), control=self._bg_control)
+            self.warmup.forget()
+            update_run(run["id"], failed)
+            if failed:
+                self._set_status(f"⚠ Zmazaných {len(entries) - len(failed)}/{len(entries)}, zvyšok skús znova.")
+            else:
+                self._set_status(f"✅ Beh {run['id']} vrátený: zmazaných {len(entries)} worklogov.")
+        except Exception as e:
+            log_exc("_do_undo", e)
+            self._fail_with_popup(f"Vrátenie behu zlyhalo: {e}")
+        finally:
+            log_text("Jira calls of this undo:\n" + finish_run(scope=scope))
+            self._reenable()
+
+    # ---------- UI helpers (safe to call from any thread) ----------
+    def _post_ui(self, action):
+        """Queue a Tk action (a callable); it runs on the Tk thread in posting order."""
+        self._ui_queue.put(action)
+
+    def _post_entry(self, i: int):
+        """Redraw progress row `i`; rows changed within one tick are drawn once."""
+        with self._ui_lock:
+            pending = bool(self._ui_entries)
+            self._ui_entries.add(i)
+        if not pending:
+            self._ui_queue.put("entries")
+
+    def _drain_ui_queue(self):
+        # next tick first – a modal dialog inside an action must not stop the polling
+        self.after(UI_POLL_MS, self._drain_ui_queue)
+        while True:
+            try:
+                action = self._ui_queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                if action == "status":
+                    with self._ui_lock:
+                        status, self._ui_status = self._ui_status, None
+                    if status is not None:
+                        self.status_var.set(status)  # only the newest status line gets drawn
+                elif action == "entries":
+                    with self._ui_lock:
+                        rows, self._ui_entries = self._ui_entries, set()
+                    for i in sorted(rows):
+                        self.progress.update_entry(i)
+                else:
+                    action()
+            except Exception as e:
+                log_exc("_drain_ui_queue", e)
+
+    def _set_status(self, msg: str):
+        with self._ui_lock:
+            pending = self._ui_status is not None
+            self._ui_status = msg
+        if not pending:
+            self._ui_queue.put("status")
+
+    def _append_status(self, line: str):
+        self._set_status(line)
+
+    def _fail_with_popup(self, msg: str):
+        self._set_status(msg)
+        self._post_ui(lambda: messagebox.showerror("Chyba", f"{msg}\n\nPozri log: {LOG_PATH}"))
+
+    def _reenable(self):
+        def idle():
+            self._control = None
+            for btn in (self.run_btn, self.undo_btn):
+                btn.config(state="normal")
+            self.pause_btn.config(state="disabled", text="Pozastaviť")
+            self.cancel_btn.config(state="disabled")
+            self._schedule_warmup()  # refresh the logged time shown for the range
+        self._post_ui(idle)
+
+    # ---------- Close ----------
+    def _busy(self):
+        """Run, undo or outbox threads still alive."""
+        return [t for t in (self._worker, self._undoer, self._flusher) if t is not None and t.is_alive()]
+
+    def on_close(self):
+        """Cancel running jobs first; the window closes once their requests in flight are done."""
+        self.warmup.cancel()
+        self._bg_control.cancel()  # no new undo / flush either
+        if self._busy():
+            if self._control is not None:
+                self._control.cancel()
+            self.status_var.set("Ukončujem – čakám na rozpracovaný worklog…")
+            self._close_when_idle(dt.datetime.now() + dt.timedelta(seconds=self.CLOSE_DEADLINE_S))
+            return
+        self._save_and_destroy()
+
+    def _close_when_idle(self, deadline):
+        if self._busy() and dt.datetime.now() < deadline:
+            self.after(100, lambda: self._close_when_idle(deadline))
+            return
+        self._save_and_destroy()
@@ -8,12 +8,10 @@
 import os
 import json
 import base64
-import random
 import datetime as dt
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
-from collections import defaultdict
 
 
 # --- Optional: bezpečné uloženie hesla ---
@@ -28,33 +26,30 @@ try:
 except Exception:
     Calendar = None
 
-# --- Selenium ---
-from selenium import webdriver  # pip install selenium
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+# --- Selenium (vyplnenie tokenu na time-tracking stránke) ---
+from selenium.webdriver.common.by import By  # pip install selenium
+
+# --- Plánovanie a zápis worklogov (spoločné s headless runnerom) ---
+from jira_worklog_runner import (
+    RunControl, RunError, SeleniumEngine, drop_pending, format_error_report, last_run, log_text, run_logging,
+)
+from jira_worklog_helpers import end_of_week, first_day_of_month, last_day_of_month, start_of_week
+from jira_worklog_trace import finish_run, start_run
+from jira_worklog_progress import ProgressPanel
+from jira_worklog_tickets import Ticket, TicketTable
+# --- fronta pre Tk, warm-up, offline fronta, vrátenie behu a zatvorenie (spoločné s Cloud GUI) ---
+from jira_worklog_app import WorklogAppMixin
 
 
 # ================== KONFIGURÁCIA ==================
 JIRA_URL = "https://jira.cargo-partner.com"
 DEFAULT_USERNAME = ""
+CLOSE_DEADLINE_S = 30  # pri zatváraní čakáme na rozpracovaný worklog (formulár čaká až 15 s)
 CONFIG_PATH = os.path.join(os.path.expanduser("~"), ".jira_logger_config.json")
 
 TIME_TRACKING_URL = ""
 TIME_TRACKING_TOKEN = ""  # token na kontrolnej stránke
 
-# Slovenské sviatky 2025
-SK_HOLIDAYS_2025 = {
-    dt.date(2025, 1, 1), dt.date(2025, 1, 6),
-    dt.date(2025, 4, 18), dt.date(2025, 4, 21),
-    dt.date(2025, 5, 1),  dt.date(2025, 5, 8),
-    dt.date(2025, 7, 5),  dt.date(2025, 8, 29),
-    dt.date(2025, 9, 1),  dt.date(2025, 9, 15),
-    dt.date(2025, 11, 1), dt.date(2025, 11, 17),
-    dt.date(2025, 12, 24),dt.date(2025, 12, 25), dt.date(2025, 12, 26),
-}
-
-
 # ===== Pomocné funkcie – config & heslá =====
 def load_config():
     if os.path.exists(CONFIG_PATH):
@@ -127,82 +122,17 @@ def clear_saved_password(username: str):
         save_config(cfg)
 
 
-# ===== Pomocné funkcie – dátumy, rozdelenie času =====
-def format_jira_date(date_obj: dt.date) -> str:
-    return date_obj.strftime("%d/%b/%y")  # napr. 19/Aug/25
-
-
-def working_days(start: dt.date, end: dt.date, skip_weekends=True, skip_sk_holidays=True):
-    d = start
-    out = []
-    while d <= end:
-        if (not skip_weekends or d.weekday() < 5) and (not skip_sk_holidays or d not in SK_HOLIDAYS_2025):
-            out.append(d)
-        d += dt.timedelta(days=1)
-    return out
-
-
-def minutes_to_jira_time(m: int) -> str:
-    h = m // 60
-    rem = m % 60
-    if h and rem:
-        return f"{h}h {rem}m"
-    if h:
-        return f"{h}h"
-    return f"{rem}m"
-
-
-def proportional_split(total_minutes, weights, round_to=15):
-    """Rozdelí total_minutes podľa váh v krokoch round_to minút a doladí súčet k cieľu."""
-    if not weights or sum(weights) == 0:
-        n = len(weights)
-        if n == 0:
-            return []
-        base = total_minutes // n
-        res = [base] * n
-        for i in range(total_minutes - base * n):
-            res[i % n] += 1
-    else:
-        s = sum(weights)
-        raw = [total_minutes * w / s for w in weights]
-        res = [int(round(x / round_to) * round_to) for x in raw]
-        diff = total_minutes - sum(res)
-        step = round_to if diff > 0 else -round_to
-        i = 0
-        while diff != 0 and len(res) > 0:
-            new_val = res[i] + step
-            if new_val >= 0:
-                res[i] = new_val
-                diff -= step
-            i = (i + 1) % len(res)
-    return res
-
-
-def start_of_week(d: dt.date) -> dt.date:
-    return d - dt.timedelta(days=d.weekday())
-
-
-def end_of_week(d: dt.date) -> dt.date:
-    return start_of_week(d) + dt.timedelta(days=4)  # Po-Pia
-
-
-def first_day_of_month(d: dt.date) -> dt.date:
-    return dt.date(d.year, d.month, 1)
-
-
-def last_day_of_month(d: dt.date) -> dt.date:
-    if d.month == 12:
-        return dt.date(d.year, 12, 31)
-    next_month = dt.date(d.year, d.month + 1, 1)
-    return next_month - dt.timedelta(days=1)
-
-
 # ===== Hlavná aplikácia (Tkinter GUI) =====
-class App(tk.Tk):
+class App(WorklogAppMixin, tk.Tk):
+    RUN_KIND = "server"
+    JIRA_BASE = JIRA_URL
+    MISSING_CREDENTIALS = "Zadaj používateľa aj heslo."
+    CLOSE_DEADLINE_S = CLOSE_DEADLINE_S
+
     def __init__(self):
         super().__init__()
         self.title("Jira Worklog – Multi-ticket Tracker")
-        self.geometry("980x880")
+        self.geometry("980x960")
         self.resizable(False, False)
 
         self.cfg = load_config()
@@ -222,6 +152,7 @@ class App(tk.Tk):
 
         self.skip_weekends_var = tk.BooleanVar(value=True)
         self.skip_holidays_var = tk.BooleanVar(value=True)
+        self.fill_gaps_var = tk.BooleanVar(value=self.cfg.get("fill_gaps", True))
 
         # Tikety a váhy (track default True, name voliteľný)
         self.tickets = self.cfg.get("tickets", [{"issue": "147331", "name": "Môj task", "weight": 1, "track": True}])
@@ -240,16 +171,19 @@ class App(tk.Tk):
         self._edit_item = None
         self._edit_col = None
 
+        # REST session, warm-up (zalogovaný čas po dňoch sa zobrazí pri období), pozastavenie / zrušenie
+        self._init_runtime()
+        self.logged_var = tk.StringVar(value="")
+
         self._build_ui()
+        # fronta pre Tk, offline fronta, warm-up a zatvorenie okna (uloženie konfigurácie a hesla)
+        self._start_runtime()
 
         # Reakcie na zmeny používateľa/hesla/checkboxu
         self.username_var.trace_add("write", self._on_username_change)
         self.password_var.trace_add("write", self._on_password_change)
         self.save_password_var.trace_add("write", self._on_save_password_toggle)
 
-        # Hook na zavretie okna – uloženie konfigurácie a (ak je zaškrtnuté) hesla
-        self.protocol("WM_DELETE_WINDOW", self.on_close)
-
     # ---------- UI ----------
     def _build_ui(self):
         pad = {"padx": 8, "pady": 6}
@@ -259,10 +193,12 @@ class App(tk.Tk):
         fr_auth.place(x=10, y=10, width=960, height=120)
 
         ttk.Label(fr_auth, text="Používateľ:").grid(row=0, column=0, sticky="w", **pad)
-        ttk.Entry(fr_auth, textvariable=self.username_var, width=24).grid(row=0, column=1, **pad)
+        self.username_entry = ttk.Entry(fr_auth, textvariable=self.username_var, width=24)
+        self.username_entry.grid(row=0, column=1, **pad)
 
         ttk.Label(fr_auth, text="Heslo:").grid(row=0, column=2, sticky="w", **pad)
-        ttk.Entry(fr_auth, textvariable=self.password_var, width=24, show="•").grid(row=0, column=3, **pad)
+        self.password_entry = ttk.Entry(fr_auth, textvariable=self.password_var, width=24, show="•")
+        self.password_entry.grid(row=0, column=3, **pad)
 
         ttk.Checkbutton(fr_auth, text="Uložiť heslo", variable=self.save_password_var).grid(row=1, column=1, sticky="w", **pad)
         ttk.Checkbutton(fr_auth, text="Pamätať nastavenia", variable=self.remember_settings_var).grid(row=1, column=3, sticky="w", **pad)
@@ -284,10 +220,15 @@ class App(tk.Tk):
 
         ttk.Checkbutton(fr_dates, text="Preskočiť víkendy", variable=self.skip_weekends_var).grid(row=2, column=0, sticky="w", **pad)
         ttk.Checkbutton(fr_dates, text="Preskočiť SK sviatky", variable=self.skip_holidays_var).grid(row=2, column=1, sticky="w", **pad)
+        ttk.Checkbutton(fr_dates, text="Doplniť len chýbajúci čas do 8h", variable=self.fill_gaps_var).grid(row=2, column=2, columnspan=2, sticky="w", **pad)
+
+        # už zalogovaný čas po dňoch v rozsahu (doplní warm-up)
+        ttk.Label(fr_dates, textvariable=self.logged_var, wraplength=440, justify="left",
+                  foreground="#555").grid(row=0, column=4, rowspan=3, sticky="nw", **pad)
 
         # --- Tikety a váhy ---
         fr_tickets = ttk.LabelFrame(self, text="Tikety a váhy (8h/deň sa rozdelí podľa váh; trackuje sa len označené)")
-        fr_tickets.place(x=10, y=290, width=960, height=520)
+        fr_tickets.place(x=10, y=290, width=960, height=400)
 
         # Horná lišta: master checkbox + náhodný výber
         topbar = ttk.Frame(fr_tickets)
@@ -303,6 +244,11 @@ class App(tk.Tk):
         self.spin_k = tk.Spinbox(topbar, from_=1, to=50, width=5, textvariable=self.randomize_k_var)
         self.spin_k.grid(row=0, column=3, padx=(0, 8))
 
+        # filter počas písania (nad modelom v pamäti)
+        self.filter_var = tk.StringVar()
+        ttk.Label(topbar, text="Filter:").grid(row=0, column=4, padx=(16, 4))
+        ttk.Entry(topbar, textvariable=self.filter_var, width=24).grid(row=0, column=5)
+
         # Treeview so stĺpcom "Názov"
         columns = ("track", "issue", "name", "weight")
         self.tree = ttk.Treeview(fr_tickets, columns=columns, show="headings", height=12)
@@ -326,15 +272,15 @@ class App(tk.Tk):
         fr_tickets.grid_columnconfigure(0, weight=1)
         fr_tickets.grid_rowconfigure(1, weight=1)
 
-        vsb = ttk.Scrollbar(fr_tickets, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=vsb.set)
+        # v strome sú len viditeľné riadky, scrollbar posúva okno nad modelom
+        vsb = ttk.Scrollbar(fr_tickets, orient="vertical")
         vsb.grid(row=1, column=4, sticky="ns", pady=(4, 4))
 
-        for t in self.tickets:
-            self.tree.insert(
-                "", "end",
-                values=("☑" if t.get("track", True) else "☐", t.get("issue", ""), t.get("name", ""), t.get("weight", 1))
-            )
+        # model tiketov je zdroj pravdy, strom ho len zrkadlí
+        self.table = TicketTable(self.tree, columns, yscrollcommand=vsb.set, on_change=self._schedule_warmup)
+        vsb.configure(command=self.table.yview)
+        self.table.load(Ticket.from_config(t, "track", "name") for t in self.tickets)
+        self.filter_var.trace_add("write", lambda *a: self.table.set_filter(self.filter_var.get()))
 
         # spodná pridávacia časť (vnútorný rámik -> zarovnanie naľavo)
         self.new_issue_var = tk.StringVar()
@@ -369,61 +315,47 @@ class App(tk.Tk):
 
         # --- Akcie ---
         fr_actions = ttk.Frame(self)
-        fr_actions.place(x=10, y=820, width=960, height=50)
+        fr_actions.place(x=10, y=695, width=960, height=80)
 
         self.run_btn = ttk.Button(fr_actions, text="Spustiť logovanie (8h/deň podľa váh)", command=self.run_clicked)
         self.run_btn.grid(row=0, column=0, padx=8, pady=8, sticky="w")
 
-        ttk.Button(fr_actions, text="Ukončiť", command=self.on_close).grid(row=0, column=1, padx=8, pady=8, sticky="w")
+        self.pause_btn = ttk.Button(fr_actions, text="Pozastaviť", command=self.pause_clicked, state="disabled")
+        self.pause_btn.grid(row=0, column=1, padx=8, pady=8, sticky="w")
+        self.cancel_btn = ttk.Button(fr_actions, text="Zrušiť beh", command=self.cancel_clicked, state="disabled")
+        self.cancel_btn.grid(row=0, column=2, padx=8, pady=8, sticky="w")
+
+        self.undo_btn = ttk.Button(fr_actions, text="Vrátiť posledný beh", command=self.undo_clicked)
+        self.undo_btn.grid(row=0, column=3, padx=8, pady=8, sticky="w")
+
+        ttk.Button(fr_actions, text="Ukončiť", command=self.on_close).grid(row=0, column=4, padx=8, pady=8, sticky="w")
 
         ttk.Checkbutton(fr_actions, text="Otvoriť time-tracking po dokončení (vyplniť token)",
                         variable=self.open_tracking_var).grid(row=1, column=0, columnspan=2, padx=8, pady=(0, 8), sticky="w")
 
         self.status_var = tk.StringVar(value="Pripravené.")
-        ttk.Label(fr_actions, textvariable=self.status_var).grid(row=0, column=2, padx=8, pady=8, sticky="w")
+        ttk.Label(fr_actions, textvariable=self.status_var).grid(row=1, column=2, columnspan=3, padx=8, pady=(0, 8), sticky="w")
+
+        # --- Priebeh behu (riadok na každý naplánovaný worklog) ---
+        fr_progress = ttk.LabelFrame(self, text="Priebeh")
+        fr_progress.place(x=10, y=780, width=960, height=170)
+        self.progress = ProgressPanel(fr_progress)
+        self.progress.pack(fill="both", expand=True, padx=8, pady=6)
 
     # ---------- Tree helpers ----------
     def _tree_sort(self, col, reverse=False):
-        # mapovanie na index stĺpca
-        idx_map = {"track": 0, "issue": 1, "name": 2, "weight": 3}
-        cidx = idx_map[col]
-
-        rows = []
-        for iid in self.tree.get_children(""):
-            vals = self.tree.item(iid, "values")
-            key = vals[cidx]
-            if col == "weight":
-                try:
-                    key = int(key)
-                except Exception:
-                    key = 0
-            elif col == "track":
-                # "☑" pred "☐"
-                key = 1 if key == "☑" else 0
-            else:
-                key = str(key).lower()
-            rows.append((key, iid))
-
-        rows.sort(reverse=reverse)
-        for i, (_, iid) in enumerate(rows):
-            self.tree.move(iid, "", i)
-
-    # prepnúť smer pri ďalšom kliku
-    self.tree.heading(col, command=lambda: self._tree_sort(col, not reverse))
+        # triedi model (váha číselne, track ☐ pred ☑) a strom preusporiada jedným volaním
+        self.table.sort(self.table.field_of[col], reverse)
+        # prepnúť smer pri ďalšom kliku
+        self.tree.heading(col, command=lambda: self._tree_sort(col, not reverse))
 
     def _toggle_track_item(self, iid):
-        trk, issue, name, weight = self.tree.item(iid, "values")
-        new_trk = "☐" if trk == "☑" else "☑"
-        self.tree.item(iid, values=(new_trk, issue, name, weight))
-        # aktualizuj master checkbox podľa stavu
-        all_vals = [self.tree.item(x, "values")[0] for x in self.tree.get_children()]
-        self.master_track_var.set(all(v == "☑" for v in all_vals))
+        self.table.toggle(iid)
+        # aktualizuj master checkbox podľa stavu (počítadlo v modeli, bez prechodu riadkov)
+        self.master_track_var.set(self.table.all_checked)
 
     def _set_all_track(self, track_bool: bool):
-        new_val = "☑" if track_bool else "☐"
-        for iid in self.tree.get_children():
-            trk, issue, name, weight = self.tree.item(iid, "values")
-            self.tree.item(iid, values=(new_val, issue, name, weight))
+        self.table.set_all(track_bool)
 
     def _on_single_click(self, event):
         # ak klik v stĺpci #1 (track), prepni checkbox
@@ -460,13 +392,15 @@ class App(tk.Tk):
         x, y, w, h = self._cell_bbox(item, col)
         if x is None:
             return
-        old_vals = self.tree.item(item, "values")
         col_idx = int(col[1:]) - 1  # "#2" -> 1
-        old_text = old_vals[col_idx]
 
         # editujeme len issue (#2), name (#3), weight (#4)
         if col_idx not in (1, 2, 3):
             return
+        ticket = self.table.get(item)
+        if ticket is None:
+            return
+        old_text = ticket.cell(self.table.field_of[self.tree["columns"][col_idx]])
 
         self._edit_item = item
         self._edit_col = col
@@ -497,16 +431,14 @@ class App(tk.Tk):
             self._destroy_editor()
             return
         new_val = self._edit_entry.get().strip()
-        vals = list(self.tree.item(self._edit_item, "values"))
         col_idx = int(self._edit_col[1:]) - 1  # 0-based
 
         # #4 -> Váha
         if col_idx == 3:
             try:
-                w = int(new_val)
-                if w < 0:
+                new_val = int(new_val)
+                if new_val < 0:
                     raise ValueError()
-                new_val = str(w)
             except Exception:
                 messagebox.showwarning("Zlá váha", "Váha musí byť celé nezáporné číslo.")
                 self._destroy_editor()
@@ -520,8 +452,8 @@ class App(tk.Tk):
 
         # #3 -> Názov (môže byť prázdny)
 
-        vals[col_idx] = new_val
-        self.tree.item(self._edit_item, values=tuple(vals))
+        field = self.table.field_of[self.tree["columns"][col_idx]]
+        self.table.update(self._edit_item, **{field: new_val})
         self._destroy_editor()
 
     def _destroy_editor(self):
@@ -535,24 +467,23 @@ class App(tk.Tk):
         self._edit_col = None
 
     def read_tickets(self, only_tracked=False):
-        items = []
-        for iid in self.tree.get_children():
-            trk, issue, name, weight = self.tree.item(iid, "values")
-            try:
-                w = int(weight)
-            except Exception:
-                w = 1
-            item = {
-                "issue": str(issue).strip(),
-                "name": str(name).strip(),
-                "weight": max(0, w),
-                "track": (trk == "☑"),
-            }
-            items.append(item)
-        items = [t for t in items if t["issue"]]
-        if only_tracked:
-            items = [t for t in items if t["track"]]
-        return items
+        return [t.to_config("track", "name", bool)
+                for t in self.table.tickets(only_checked=only_tracked) if t.issue]
+
+    def read_checked_tickets(self):
+        return self.read_tickets(only_tracked=True)
+
+    # ---------- Háčiky pre WorklogAppMixin ----------
+    def _credentials(self):
+        return self.username_var.get().strip(), self.password_var.get()
+
+    def _credential_entries(self):
+        return self.username_entry, self.password_entry
+
+    def _engine(self, secret, headless=False):
+        # REST session na overenie / čítanie, prehliadač sa štartuje až pri zápise
+        return SeleniumEngine(JIRA_URL, self.username_var.get().strip(), secret, headless=headless,
+                              session=self.session)
 
     # ---------- Reakcie na zmeny (heslo/užívateľ/checkbox) ----------
     def _on_username_change(self, *args):
@@ -632,18 +563,16 @@ class App(tk.Tk):
             messagebox.showwarning("Zlá váha", "Váha musí byť celé nezáporné číslo.")
             return
 
-        self.tree.insert("", "end", values=("☑", issue, name, w))
+        self.table.add(Ticket(issue, w, name))
         self.new_issue_var.set("")
         self.new_name_var.set("")
         self.new_weight_var.set("1")
         # uprav master checkbox
-        self.master_track_var.set(all(self.tree.item(i, "values")[0] == "☑" for i in self.tree.get_children()))
+        self.master_track_var.set(self.table.all_checked)
 
     def remove_selected(self):
-        sel = self.tree.selection()
-        for s in sel:
-            self.tree.delete(s)
-        self.master_track_var.set(all(self.tree.item(i, "values")[0] == "☑" for i in self.tree.get_children()))
+        self.table.remove(self.table.selection())
+        self.master_track_var.set(self.table.all_checked)
 
     # ---------- Spustenie ----------
     def run_clicked(self):
@@ -663,15 +592,30 @@ class App(tk.Tk):
         if not username or not password:
             messagebox.showerror("Prihlásenie", "Zadaj používateľa aj heslo.")
             return
+        if self._flushing:
+            messagebox.showinfo("Fronta", "Práve sa odosielajú worklogy z offline fronty, skús to o chvíľu.")
+            return
+
+        # zrušený beh môže pokračovať presne neodoslanými worklogmi
+        resume = last_run("server", JIRA_URL, username, field="pending")
+        if resume is not None:
+            answer = messagebox.askyesnocancel(
+                "Prerušený beh", f"Beh {resume['id']} má {len(resume['pending'])} neodoslaných worklogov.\n\n"
+                                 "Pokračovať v ňom? (Nie = naplánovať nový beh)")
+            if answer is None:
+                return
+            if not answer:
+                drop_pending(resume["id"])
+                resume = None
 
         all_tickets = self.read_tickets(only_tracked=False)
         tickets = self.read_tickets(only_tracked=True)
 
-        if not all_tickets:
+        if resume is None and not all_tickets:
             messagebox.showerror("Tikety", "Pridaj aspoň jeden tiket.")
             return
 
-        if not tickets:
+        if resume is None and not tickets:
             messagebox.showerror("Tikety", "Nie je označený žiadny tiket na trackovanie.")
             return
 
@@ -685,6 +629,7 @@ class App(tk.Tk):
             cfg["save_password"] = bool(self.save_password_var.get())
             cfg["randomize_enabled"] = bool(self.randomize_var.get())
             cfg["randomize_k"] = int(self.randomize_k_var.get() or 1)
+            cfg["fill_gaps"] = bool(self.fill_gaps_var.get())
             save_config(cfg)
 
         if self.save_password_var.get():
@@ -694,153 +639,84 @@ class App(tk.Tk):
 
         # Spustiť v thready (neblokovať GUI)
         self.run_btn.config(state="disabled")
+        self.undo_btn.config(state="disabled")
+        self.pause_btn.config(state="normal", text="Pozastaviť")
+        self.cancel_btn.config(state="normal")
         self.status_var.set("Prebieha logovanie…")
-        th = threading.Thread(
+        # Tk premenné čítame tu – nikdy nie z worker threadu
+        opts = {
+            "resume": resume,
+            "skip_weekends": bool(self.skip_weekends_var.get()),
+            "skip_holidays": bool(self.skip_holidays_var.get()),
+            "fill_gaps": bool(self.fill_gaps_var.get()),
+            "randomize_k": int(self.randomize_k_var.get() or 1) if self.randomize_var.get() else 0,
+        }
+        self._control = RunControl()
+        self._worker = threading.Thread(
             target=self._do_logging,
-            args=(
-                username, password, tickets,
-                start, end,
-                self.open_tracking_var.get(),
-                bool(self.randomize_var.get()),
-                int(self.randomize_k_var.get() or 1),
-            ),
+            args=(username, password, tickets, start, end, bool(self.open_tracking_var.get()), opts),
             daemon=True,
         )
-        th.start()
+        self._worker.start()
 
-    def _do_logging(self, username, password, tickets, start, end, open_tracking, randomize_enabled, randomize_k):
-        driver = None
+    def _do_logging(self, username, password, tickets, start, end, open_tracking, opts):
+        engine = self._engine(password)
+        scope = start_run()  # súhrn len z volaní tohto behu, nie z warm-upu a fronty popri ňom
         try:
-            days = working_days(start, end, self.skip_weekends_var.get(), self.skip_holidays_var.get())
-            if not days:
-                self._set_status("Žiadne pracovné dni v zadanom rozsahu.")
-                self._reenable()
+            stats = run_logging(engine, tickets, start, end, on_status=self._append_status, control=self._control,
+                                warm=self.warmup,
+                                on_plan=lambda plan: self._post_ui(lambda: self.progress.set_plan(plan)),
+                                on_entry=lambda i, entry: self._post_entry(i),
+                                **opts)
+            if not stats["days"]:
+                return
+            if stats["cancelled"]:
+                self._set_status(f"⏹ Beh zrušený: natrackované {stats['ok']}, zvyšok sa dá dokončiť ďalším spustením.")
+                return
+            if stats["queued"]:
+                self._set_status(f"📤 Natrackované {stats['ok']}, {stats['queued']} čaká vo fronte – odošlú sa"
+                                 " automaticky, keď bude Jira znova dostupná.")
                 return
 
-            driver = webdriver.Chrome()
-            wait = WebDriverWait(driver, 15)
-
-            ok_logs = 0
-            fail_logs = 0
-            planned_logs = 0  # podľa skutočne plánovaných zápisov v daný deň
-
-            try:
-                # Login
-                driver.get(JIRA_URL)
-                wait.until(EC.presence_of_element_located((By.ID, "login-form-username"))).send_keys(username)
-                driver.find_element(By.ID, "login-form-password").send_keys(password)
-                driver.find_element(By.ID, "login").click()
-
-                # Skontroluj prípadnú chybovú hlášku
-                try:
-                    err = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.ID, "login-error-message"))
-                    )
-                    if err.is_displayed():
-                        raise RuntimeError("Nesprávne meno alebo heslo do Jira.")
-                except Exception:
-                    pass
-
-                # Logovanie – s presným dorovnaním na 8h/deň
-                for day in days:
-                    day_str = format_jira_date(day)
-                    day_time = "04:00 PM"
-                    dt_str = f"{day_str} {day_time}"
-
-                    # 1) Podmnožina tiketov pre tento deň
-                    todays_tickets = list(tickets)
-                    if randomize_enabled and len(todays_tickets) > 1:
-                        k = max(1, min(int(randomize_k or 1), len(todays_tickets)))
-                        todays_tickets = random.sample(todays_tickets, k)
-
-                    # 2) Rozdelenie 8h len medzi vybranú podmnožinu podľa ich váh
-                    weights = [max(0, int(t.get("weight", 1))) for t in todays_tickets]
-                    if sum(weights) == 0:
-                        weights = [1] * len(todays_tickets)
-
-                    minutes_for_subset = proportional_split(8 * 60, weights, round_to=15)
-
-                    # 3) Dorovnanie na presne 480 min (kvôli zaokrúhľovaniu)
-                    total_min = sum(minutes_for_subset)
-                    if total_min != 8 * 60 and len(minutes_for_subset) > 0:
-                        diff = (8 * 60) - total_min
-                        step = 15 if diff > 0 else -15
-                        order = sorted(range(len(weights)), key=lambda i: weights[i], reverse=True)
-                        i = 0
-                        while diff != 0:
-                            idx = order[i % len(order)]
-                            if minutes_for_subset[idx] + step >= 0:
-                                minutes_for_subset[idx] += step
-                                diff -= step
-                            i += 1
-
-                    # 4) Trackni len tie, ktoré majú > 0 minút
-                    for idx, t in enumerate(todays_tickets):
-                        mins = minutes_for_subset[idx] if idx < len(minutes_for_subset) else 0
-                        if mins <= 0:
-                            continue
-                        planned_logs += 1
-
-                        issue = t["issue"]
-                        time_str = minutes_to_jira_time(mins)
-
-                        log_url = f"{JIRA_URL}/secure/CreateWorklog!default.jspa?id={issue}"
-                        driver.get(log_url)
-
-                        try:
-                            time_spent_input = wait.until(
-                                EC.presence_of_element_located((By.ID, "log-work-time-logged"))
-                            )
-                            time_spent_input.clear()
-                            time_spent_input.send_keys(time_str)
-
-                            date_picker = wait.until(
-                                EC.presence_of_element_located((By.ID, "log-work-date-logged-date-picker"))
-                            )
-                            date_picker.clear()
-                            date_picker.send_keys(dt_str)
-
-                            submit_button = driver.find_element(By.ID, "log-work-submit")
-                            submit_button.click()
-
-                            ok_logs += 1
-                            self._append_status(f"✔ {day_str} – {issue}: {time_str}")
-                        except Exception as e:
-                            fail_logs += 1
-                            self._append_status(f"✖ {day_str} – {issue}: {e}")
-
-                # Otvoriť time-tracking len ak je checkbox zapnutý
-                if open_tracking:
-                    q_user = username or DEFAULT_USERNAME
-                    q_from = start.strftime("%Y-%m-%d")
-                    q_to = end.strftime("%Y-%m-%d")
-                    final_url = f"{TIME_TRACKING_URL}?user={q_user}&from={q_from}&to={q_to}"
-                    driver.get(final_url)
-
-                    # Vyplniť token
-                    self._fill_token_on_page(driver, TIME_TRACKING_TOKEN)
-                    self._append_status("Token vyplnený do time-tracking stránky.")
-                else:
-                    self._append_status("Dokončené. Stránka na kontrolu sa neotvárala (checkbox vypnutý).")
-
-            finally:
-                # Po dokončení pre istotu zavri prehliadač
-                try:
-                    if driver is not None:
-                        driver.quit()
-                except Exception:
-                    pass
-
-                if planned_logs > 0 and fail_logs == 0:
-                    self._set_status("✅ Všetko úspešne natrackované.")
-                elif planned_logs == 0:
-                    self._set_status("ℹ Nebolo čo trackovať (0 minút na rozdelenie).")
-                else:
-                    self._set_status(f"⚠ Čiastočne dokončené: úspešne {ok_logs}/{planned_logs}, neúspešné {fail_logs}.")
-
+            # Otvoriť time-tracking len ak je checkbox zapnutý
+            if open_tracking:
+                q_user = username or DEFAULT_USERNAME
+                q_from = start.strftime("%Y-%m-%d")
+                q_to = end.strftime("%Y-%m-%d")
+                final_url = f"{TIME_TRACKING_URL}?user={q_user}&from={q_from}&to={q_to}"
+                driver = engine.ensure_driver()
+                driver.get(final_url)
+
+                # Vyplniť token
+                self._fill_token_on_page(driver, TIME_TRACKING_TOKEN)
+                self._append_status("Token vyplnený do time-tracking stránky.")
+            else:
+                self._append_status("Dokončené. Stránka na kontrolu sa neotvárala (checkbox vypnutý).")
+
+            planned, ok, failed = stats["planned"], stats["ok"], stats["failed"]
+            if planned > 0 and failed == 0:
+                done = "✅ Všetko úspešne natrackované."
+                self._set_status(f"{done} Už plných dní: {stats['full_days']}." if stats["full_days"] else done)
+            elif planned == 0 and stats["full_days"] == stats["days"]:
+                self._set_status(f"ℹ Všetkých {stats['days']} dní už má 8h – nie je čo dopĺňať.")
+            elif planned == 0:
+                self._set_status("ℹ Nebolo čo trackovať (0 minút na rozdelenie).")
+            else:
+                self._set_status(f"⚠ Čiastočne dokončené: úspešne {ok}/{planned}, neúspešné {failed},"
+                                 f" preskočené {stats['skipped']}.")
+            if stats["errors"]:
+                report = format_error_report(stats["errors"])
+                self._post_ui(lambda: messagebox.showerror("Chyby pri logovaní", report))
+
+        except RunError as e:
+            self._set_status(str(e))
         except Exception as e:
             self._set_status(f"Chyba: {e}")
         finally:
+            # Po dokončení pre istotu zavri prehliadač
+            engine.close()
+            # súhrn volaní do Jira (p50/p95 na endpoint) do logu, spany aj do súboru ak je nastavený
+            log_text("Jira volania tohto behu:\n" + finish_run(scope=scope))
             self._reenable()
 
     # --- Token vyplnenie (robustné) ---
@@ -923,17 +799,8 @@ class App(tk.Tk):
         except Exception:
             pass
 
-    # --- UI pomocníci ---
-    def _set_status(self, msg: str):
-        self.status_var.set(msg)
-
-    def _append_status(self, line: str):
-        self.status_var.set(line)
-
-    def _reenable(self):
-        self.run_btn.config(state="normal")
-
-    def on_close(self):
+    # --- Zatvorenie okna ---
+    def _save_and_destroy(self):
         """Uloží nastavenia a (ak je zaškrtnuté) heslo, potom ukončí aplikáciu."""
         try:
             cfg = load_config()
@@ -944,6 +811,7 @@ class App(tk.Tk):
             cfg["save_password"] = bool(self.save_password_var.get())
             cfg["randomize_enabled"] = bool(self.randomize_var.get())
             cfg["randomize_k"] = int(self.randomize_k_var.get() or 1)
+            cfg["fill_gaps"] = bool(self.fill_gaps_var.get())
             save_config(cfg)
 
             if self.save_password_var.get():
@@ -954,26 +822,6 @@ class App(tk.Tk):
             self.destroy()
 
 
-# ===== Date helpers used above (duplicity kvôli čitateľnosti) =====
-def start_of_week(d: dt.date) -> dt.date:
-    return d - dt.timedelta(days=d.weekday())
-
-
-def end_of_week(d: dt.date) -> dt.date:
-    return start_of_week(d) + dt.timedelta(days=4)
-
-
-def first_day_of_month(d: dt.date) -> dt.date:
-    return dt.date(d.year, d.month, 1)
-
-
-def last_day_of_month(d: dt.date) -> dt.date:
-    if d.month == 12:
-        return dt.date(d.year, 12, 31)
-    next_month = dt.date(d.year, d.month + 1, 1)
-    return next_month - dt.timedelta(days=1)
-
-
 if __name__ == "__main__":
     app = App()
     app.mainloop()
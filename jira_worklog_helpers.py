@@ -0,0 +1,193 @@
+# jira_worklog_helpers.py
+# Pure helpers shared by main.py, the headless runner and both GUIs: issue keys,
+# workdays/holidays, the 8h split, Jira time/date formats and date ranges.
+# No I/O and no third-party imports, so every caller can use them (and bench/ can time them).
+import re
+import datetime as dt
+from functools import lru_cache
+from typing import List, Tuple
+
+DAY_TARGET_MINUTES = 8 * 60
+
+# Slovak holidays 2025
+SK_HOLIDAYS_2025 = {
+    dt.date(2025, 1, 1), dt.date(2025, 1, 6), dt.date(2025, 4, 18), dt.date(2025, 4, 21),
+    dt.date(2025, 5, 1), dt.date(2025, 5, 8), dt.date(2025, 7, 5), dt.date(2025, 8, 29),
+    dt.date(2025, 9, 1), dt.date(2025, 9, 15), dt.date(2025, 11, 1), dt.date(2025, 11, 17),
+    dt.date(2025, 12, 24), dt.date(2025, 12, 25), dt.date(2025, 12, 26),
+}
+
+# ================== TEXT / KEY HELPERS ==================
+KEY_RE = re.compile(r"[A-Z][A-Z0-9_]+-\d+$")
+BROWSE_RE = re.compile(r"/browse/([A-Z][A-Z0-9_]+-\d+)", re.IGNORECASE)
+NUMERIC_ID_RE = re.compile(r"\d+$")
+# numeric id in the old-style pages, e.g. /secure/ViewIssue.jspa?id=147331, CreateWorklog!default.jspa?id=…
+JSPA_ID_RE = re.compile(r"\.jspa\?(?:[^#\s]*&)?id=(\d+)(?:[&#]|$)", re.IGNORECASE)
+PASTE_SPLIT_RE = re.compile(r"[\s,;|]+")
+# "<field> <operator>" – enough to tell a pasted JQL query from a list of keys/URLs
+JQL_RE = re.compile(
+    r"\b(?:project|key|issuekey|id|assignee|reporter|status|sprint|labels|component|fixVersion|parent|"
+    r"worklogAuthor|worklogDate|updated|created|resolution|text|summary|filter)\s*"
+    r"(?:!=|=|~|[<>]=?|not\s+in\b|in\b|is\b)",
+    re.IGNORECASE,
+)
+
+@lru_cache(maxsize=4096)
+def extract_issue_key(s: str) -> str:
+    s = (s or "").strip()
+    m = BROWSE_RE.search(s)
+    if m:
+        return m.group(1).upper()
+    m = JSPA_ID_RE.search(s)
+    if m:
+        return m.group(1)
+    if KEY_RE.match(s.upper()):
+        return s.upper()
+    return s
+
+def looks_like_jql(text: str) -> bool:
+    # URL query strings (?id=147331, ?filter=10001) are not JQL – leave URLs out
+    text = " ".join(t for t in (text or "").split() if "://" not in t)
+    return JQL_RE.search(text) is not None
+
+def parse_ticket_block(text: str) -> Tuple[List[str], List[str]]:
+    """Split a pasted block into issue keys / numeric ids (in order, deduplicated) and the rest.
+
+    Accepts keys, /browse/ and ViewIssue.jspa?id= URLs and numeric ids separated by whitespace, commas or semicolons.
+    """
+    tickets, skipped, seen = [], [], set()
+    for token in PASTE_SPLIT_RE.split(text or ""):
+        if not token:
+            continue
+        issue = extract_issue_key(token)
+        if not (KEY_RE.match(issue) or NUMERIC_ID_RE.match(issue)):
+            skipped.append(token)
+        elif issue not in seen:
+            seen.add(issue)
+            tickets.append(issue)
+    return tickets, skipped
+
+# ================== DATE/TIME HELPERS ==================
+def is_workday(d: dt.date) -> bool:
+    return d.weekday() < 5 and d not in SK_HOLIDAYS_2025
+
+def working_days(start: dt.date, end: dt.date, skip_weekends=True, skip_sk_holidays=True):
+    d = start
+    out = []
+    while d <= end:
+        if (not skip_weekends or d.weekday() < 5) and (not skip_sk_holidays or d not in SK_HOLIDAYS_2025):
+            out.append(d)
+        d += dt.timedelta(days=1)
+    return out
+
+def proportional_split(total_minutes: int, weights: List[int], round_to=15) -> List[int]:
+    if not weights or sum(weights) == 0:
+        n = len(weights)
+        if n == 0:
+            return []
+        base = total_minutes // n
+        res = [base] * n
+        for i in range(total_minutes - base * n):
+            res[i % n] += 1
+    else:
+        s = sum(weights)
+        raw = [total_minutes * w / s for w in weights]
+        res = [int(round(x / round_to) * round_to) for x in raw]
+        diff = total_minutes - sum(res)
+        step = round_to if diff > 0 else -round_to
+        i = 0
+        while diff != 0 and len(res) > 0:
+            new_val = res[i] + step
+            if new_val >= 0:
+                res[i] = new_val
+                diff -= step
+            i = (i + 1) % len(res)
+    return res
+
+def split_missing_minutes(missing: int, weights: List[int], round_to=15) -> List[int]:
+    """Split `missing` minutes by weights in round_to steps; the remainder goes to the heaviest ticket."""
+    if missing <= 0 or not weights:
+        return [0] * len(weights)
+    rem = missing % round_to
+    res = proportional_split(missing - rem, weights, round_to=round_to)
+    if rem:
+        res[max(range(len(weights)), key=lambda i: weights[i])] += rem
+    return res
+
+def day_balances(days: List[dt.date], logged_minutes: dict, target=DAY_TARGET_MINUTES) -> List[Tuple[dt.date, int]]:
+    """(day, target - already logged) per day; > 0 deficit, < 0 overtime."""
+    return [(d, target - int(logged_minutes.get(d, 0))) for d in days]
+
+def minutes_to_jira_time(m: int) -> str:
+    h = m // 60
+    rem = m % 60
+    if h and rem:
+        return f"{h}h {rem}m"
+    if h:
+        return f"{h}h"
+    return f"{rem}m"
+
+def format_logged_days(days: List[dt.date], logged_minutes: dict, target=DAY_TARGET_MINUTES) -> str:
+    """'Po 06.10 8h · Ut 07.10 – · … | spolu 12h z 40h' – already logged time per workday of a range.
+
+    The total covers `days` only; time on other fetched days (weekends, holidays) is
+    shown after it as '+ mimo týchto dní 2h'.
+    """
+    names = ("Po", "Ut", "St", "Št", "Pi", "So", "Ne")
+    parts = [f"{names[d.weekday()]} {d:%d.%m} {minutes_to_jira_time(logged_minutes[d]) if logged_minutes.get(d) else '–'}"
+             for d in days]
+    total = sum(int(logged_minutes.get(d, 0)) for d in days)
+    text = " · ".join(parts) + f" | spolu {minutes_to_jira_time(total)} z {minutes_to_jira_time(target * len(days))}"
+    other = sum(int(m) for m in logged_minutes.values()) - total
+    if other > 0:
+        text += f" + mimo týchto dní {minutes_to_jira_time(other)}"
+    return text
+
+def format_jira_date(date_obj: dt.date) -> str:
+    return date_obj.strftime("%d/%b/%y")  # e.g. 19/Aug/25
+
+def local_iso_with_tz(day: dt.date, hour=16, minute=0) -> str:
+    local_naive = dt.datetime(day.year, day.month, day.day, hour, minute, 0, 0)
+    local_aware = local_naive.astimezone()
+    tz_offset = local_aware.strftime("%z")
+    return local_aware.strftime("%Y-%m-%dT%H:%M:%S") + ".000" + tz_offset
+
+def start_of_week(d: dt.date) -> dt.date:
+    return d - dt.timedelta(days=d.weekday())
+
+def end_of_week(d: dt.date) -> dt.date:
+    return start_of_week(d) + dt.timedelta(days=4)
+
+def last_week_range(today=None) -> Tuple[dt.date, dt.date]:
+    """Last week's Mon..Fri relative to today."""
+    last_monday = start_of_week(today or dt.date.today()) - dt.timedelta(days=7)
+    return last_monday, last_monday + dt.timedelta(days=4)
+
+def first_day_of_month(d: dt.date) -> dt.date:
+    return dt.date(d.year, d.month, 1)
+
+def last_day_of_month(d: dt.date) -> dt.date:
+    if d.month == 12:
+        return dt.date(d.year, 12, 31)
+    next_month = dt.date(d.year, d.month + 1, 1)
+    return next_month - dt.timedelta(days=1)
+
+def month_range(d: dt.date) -> Tuple[dt.date, dt.date]:
+    return first_day_of_month(d), last_day_of_month(d)
+
+def resolve_range(spec, today=None) -> Tuple[dt.date, dt.date]:
+    """"today" | "this_week" | "last_week" | "this_month" | {"from": "YYYY-MM-DD", "to": "YYYY-MM-DD"}."""
+    today = today or dt.date.today()
+    if isinstance(spec, dict):
+        return dt.date.fromisoformat(spec["from"]), dt.date.fromisoformat(spec["to"])
+    if spec in (None, "today"):
+        return today, today
+    if spec == "this_week":
+        s = start_of_week(today)
+        return s, s + dt.timedelta(days=4)
+    if spec == "last_week":
+        s = start_of_week(today) - dt.timedelta(days=7)
+        return s, s + dt.timedelta(days=4)
+    if spec == "this_month":
+        return first_day_of_month(today), last_day_of_month(today)
+    raise ValueError(f"Unknown range: {spec!r}")
@@ -1,14 +1,11 @@
 # jira_worklog_gui_cloud.py
 import os
-import re
 import json
 import base64
 import datetime as dt
 import threading
-import traceback
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import List, Tuple
 
 # --- Optional safe password store ---
 try:
@@ -16,46 +13,32 @@ try:
 except Exception:
     keyring = None
 
-# --- HTTP client (requests with retries) ---
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+# --- Jira Cloud client, planning & submission (shared with the headless runner) ---
+from jira_worklog_runner import (
+    LOG_PATH, RunControl, RunError, CloudEngine, cached_my_issues, discover_my_issues, drop_pending,
+    format_error_report, jira_get_myself, jira_resolve_issue, jira_resolve_issues, jira_search_issues, last_run,
+    log_exc, log_text, run_logging,
+)
+from jira_worklog_helpers import (
+    end_of_week, extract_issue_key, first_day_of_month, last_day_of_month, last_week_range, looks_like_jql,
+    parse_ticket_block, start_of_week,
+)
+from jira_worklog_trace import finish_run, start_run
+from jira_worklog_progress import ProgressPanel
+from jira_worklog_tickets import Ticket, TicketTable
+# --- UI queue, warm-up, outbox, undo and close (shared with the Server GUI) ---
+from jira_worklog_app import WorklogAppMixin
 
 # ================== CONFIG ==================
 JIRA_CLOUD_BASE = "https://xxx.atlassian.net"
 DEFAULT_EMAIL = "xxx"
+SUMMARY_DEBOUNCE_MS = 150  # rows scrolled into view within this window share one summary lookup
 CONFIG_PATH = os.path.join(os.path.expanduser("~"), ".jira_logger_config.json")
-LOG_PATH = os.path.join(os.path.expanduser("~"), ".jira_worklog_gui.log")
 
 # Optional ping
 TIME_TRACKING_URL = "https://time-tracking-dev-time-tracking.apps.dev.cp.cloud/"
 TIME_TRACKING_TOKEN = "xxx"
 
-# Slovak holidays 2025
-SK_HOLIDAYS_2025 = {
-    dt.date(2025, 1, 1), dt.date(2025, 1, 6), dt.date(2025, 4, 18), dt.date(2025, 4, 21),
-    dt.date(2025, 5, 1), dt.date(2025, 5, 8), dt.date(2025, 7, 5), dt.date(2025, 8, 29),
-    dt.date(2025, 9, 1), dt.date(2025, 9, 15), dt.date(2025, 11, 1), dt.date(2025, 11, 17),
-    dt.date(2025, 12, 24), dt.date(2025, 12, 25), dt.date(2025, 12, 26),
-}
-
-# ================== LOGGING HELPERS ==================
-def log_exc(prefix: str, exc: Exception):
-    try:
-        with open(LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(f"\n[{dt.datetime.now().isoformat()}] {prefix}: {repr(exc)}\n")
-            f.write("".join(traceback.format_exception(type(exc), exc, exc.__traceback__)))
-            f.write("\n")
-    except Exception:
-        pass
-
-def log_text(text: str):
-    try:
-        with open(LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(f"[{dt.datetime.now().isoformat()}] {text}\n")
-    except Exception:
-        pass
-
 # ================== CONFIG & SECRET HELPERS ==================
 def load_config():
     if os.path.exists(CONFIG_PATH):
@@ -127,174 +110,16 @@ def clear_saved_secret(email: str):
         cfg["saved_api_tokens"] = sp
         save_config(cfg)
 
-# ================== TEXT / KEY HELPERS ==================
-KEY_RE = re.compile(r"[A-Z][A-Z0-9_]+-\d+$")
-
-def extract_issue_key(s: str) -> str:
-    s = (s or "").strip()
-    m = re.search(r"/browse/([A-Z][A-Z0-9_]+-\d+)", s, re.IGNORECASE)
-    if m:
-        return m.group(1).upper()
-    if KEY_RE.match(s.upper()):
-        return s.upper()
-    return s
-
-# ================== DATE/TIME HELPERS ==================
-def working_days(start: dt.date, end: dt.date, skip_weekends=True, skip_sk_holidays=True):
-    d = start
-    out = []
-    while d <= end:
-        if (not skip_weekends or d.weekday() < 5) and (not skip_sk_holidays or d not in SK_HOLIDAYS_2025):
-            out.append(d)
-        d += dt.timedelta(days=1)
-    return out
-
-def proportional_split(total_minutes: int, weights: List[int], round_to=15) -> List[int]:
-    if not weights or sum(weights) == 0:
-        n = len(weights)
-        if n == 0:
-            return []
-        base = total_minutes // n
-        res = [base] * n
-        for i in range(total_minutes - base * n):
-            res[i % n] += 1
-    else:
-        s = sum(weights)
-        raw = [total_minutes * w / s for w in weights]
-        res = [int(round(x / round_to) * round_to) for x in raw]
-        diff = total_minutes - sum(res)
-        step = round_to if diff > 0 else -round_to
-        i = 0
-        while diff != 0 and len(res) > 0:
-            new_val = res[i] + step
-            if new_val >= 0:
-                res[i] = new_val
-                diff -= step
-            i = (i + 1) % len(res)
-    return res
-
-def start_of_week(d: dt.date) -> dt.date:
-    return d - dt.timedelta(days=d.weekday())
-
-def end_of_week(d: dt.date) -> dt.date:
-    return start_of_week(d) + dt.timedelta(days=4)
-
-def last_week_range(today=None) -> Tuple[dt.date, dt.date]:
-    if today is None:
-        today = dt.date.today()
-    # last week's Mon..Fri relative to today
-    this_monday = start_of_week(today)
-    last_monday = this_monday - dt.timedelta(days=7)
-    last_friday = last_monday + dt.timedelta(days=4)
-    return last_monday, last_friday
-
-def first_day_of_month(d: dt.date) -> dt.date:
-    return dt.date(d.year, d.month, 1)
-
-def last_day_of_month(d: dt.date) -> dt.date:
-    if d.month == 12:
-        return dt.date(d.year, 12, 31)
-    next_month = dt.date(d.year, d.month + 1, 1)
-    return next_month - dt.timedelta(days=1)
-
-def local_iso_with_tz(day: dt.date, hour=16, minute=0) -> str:
-    local_naive = dt.datetime(day.year, day.month, day.day, hour, minute, 0, 0)
-    local_aware = local_naive.astimezone()
-    tz_offset = local_aware.strftime("%z")
-    return local_aware.strftime("%Y-%m-%dT%H:%M:%S") + ".000" + tz_offset
-
-# ================== JIRA CLOUD CLIENT ==================
-def build_session() -> requests.Session:
-    s = requests.Session()
-    retries = Retry(
-        total=5, connect=3, read=3, backoff_factor=0.6,
-        status_forcelist=(429, 500, 502, 503, 504),
-        allowed_methods=frozenset(["HEAD","GET","POST","PUT","DELETE","OPTIONS","TRACE","PATCH"])
-    )
-    adapter = HTTPAdapter(max_retries=retries)
-    s.mount("https://", adapter)
-    s.mount("http://", adapter)
-    s.headers.update({"Accept": "application/json"})
-    return s
-
-def jira_get_myself(session: requests.Session, base_url: str, email: str, api_token: str) -> Tuple[bool, str]:
-    try:
-        resp = session.get(f"{base_url}/rest/api/3/myself", auth=(email, api_token), timeout=15)
-        if resp.status_code == 200:
-            return True, ""
-        return False, f"/myself status {resp.status_code}: {resp.text[:500]}"
-    except Exception as e:
-        log_exc("jira_get_myself", e)
-        return False, repr(e)
-
-def jira_resolve_issue(session: requests.Session, base_url: str, email: str, api_token: str, raw_input: str) -> Tuple[bool, str, str, str]:
-    """Resolve input to (key, summary)."""
-    candidate = extract_issue_key(raw_input)
-
-    try:
-        r = session.get(f"{base_url}/rest/api/3/issue/{candidate}?fields=key,summary",
-                        auth=(email, api_token), timeout=15)
-        if r.status_code == 200:
-            data = r.json()
-            key = data.get("key", candidate).upper()
-            summary = (data.get("fields", {}) or {}).get("summary", "")
-            return True, key, summary or "", ""
-    except Exception as e:
-        log_exc("jira_resolve_issue(GET)", e)
-        return False, "", "", repr(e)
-
-    if candidate.isdigit():
-        try:
-            jql = f"id={candidate}"
-            sr = session.get(f"{base_url}/rest/api/3/search",
-                             params={"jql": jql, "fields": "key,summary"},
-                             auth=(email, api_token), timeout=20)
-            if sr.status_code == 200:
-                issues = sr.json().get("issues", [])
-                if issues:
-                    key = issues[0]["key"].upper()
-                    summary = (issues[0].get("fields", {}) or {}).get("summary", "")
-                    return True, key, summary or "", ""
-            return False, "", "", f"{raw_input}: Nie je možné nájsť podľa numerického ID. Použi issue key (napr. SINT-1234)."
-        except Exception as e:
-            log_exc("jira_resolve_issue(JQL)", e)
-            return False, "", "", repr(e)
-
-    try:
-        txt = r.text[:500]
-    except Exception:
-        txt = "neznáma odpoveď"
-    return False, "", "", f"{raw_input}: status {r.status_code if 'r' in locals() else '?'}: {txt}"
-
-def log_work_cloud(session: requests.Session, base_url: str, email: str, api_token: str,
-                   issue_key: str, started_iso_tz: str, seconds: int, comment: str = None) -> Tuple[bool, str]:
-    url = f"{base_url}/rest/api/3/issue/{issue_key}/worklog"
-    payload = {"started": started_iso_tz, "timeSpentSeconds": int(seconds)}
-    if comment:
-        payload["comment"] = {
-            "type": "doc", "version": 1,
-            "content": [{"type": "paragraph", "content": [{"type": "text", "text": comment}]}],
-        }
-    try:
-        resp = session.post(url, json=payload, auth=(email, api_token), timeout=20)
-    except Exception as e:
-        log_exc("log_work_cloud(request)", e)
-        return False, f"request error: {repr(e)}"
-
-    if resp.status_code == 201:
-        return True, ""
-    try:
-        data = resp.json()
-    except Exception:
-        data = {"raw": resp.text}
-    return False, f"HTTP {resp.status_code}: {data}"
-
 # ================== TKINTER GUI APP ==================
-class App(tk.Tk):
+class App(WorklogAppMixin, tk.Tk):
+    RUN_KIND = "cloud"
+    JIRA_BASE = JIRA_CLOUD_BASE
+    MISSING_CREDENTIALS = "Zadaj Email aj API token."
+
     def __init__(self):
         super().__init__()
         self.title("Jira Cloud Worklog – Multi-ticket Tracker")
-        self.geometry("920x760")
+        self.geometry("920x960")
         self.resizable(False, False)
 
         self.cfg = load_config()
@@ -313,6 +138,7 @@ class App(tk.Tk):
 
         self.skip_weekends_var = tk.BooleanVar(value=True)
         self.skip_holidays_var = tk.BooleanVar(value=True)
+        self.fill_gaps_var = tk.BooleanVar(value=self.cfg.get("fill_gaps", True))
 
         # Table data
         saved = self.cfg.get("tickets", [{"issue": "SINT-1234", "weight": 1, "summary": "", "checked": 1}])
@@ -321,11 +147,17 @@ class App(tk.Tk):
             t.setdefault("checked", 1)
         self.tickets = saved
 
-        self._build_ui()
-        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Summaries are loaded lazily for rows that scroll into view (see _on_rows_visible)
+        self._summary_requested = set()
+        self._summary_pending = []
+        self._summary_job = None
+
+        # Session, warm-up (time already logged is shown under "Obdobie"), pause / cancel state
+        self._init_runtime()
+        self.logged_var = tk.StringVar(value="")
 
-        # Try to auto-refresh summaries on startup (non-blocking)
-        self.after(100, self.refresh_table_async)
+        self._build_ui()
+        self._start_runtime()
 
     # ---------- UI ----------
     def _build_ui(self):
@@ -336,10 +168,12 @@ class App(tk.Tk):
         fr_auth.place(x=10, y=10, width=900, height=150)
 
         ttk.Label(fr_auth, text="Email:").grid(row=0, column=0, sticky="w", **pad)
-        ttk.Entry(fr_auth, textvariable=self.email_var, width=34).grid(row=0, column=1, **pad)
+        self.email_entry = ttk.Entry(fr_auth, textvariable=self.email_var, width=34)
+        self.email_entry.grid(row=0, column=1, **pad)
 
         ttk.Label(fr_auth, text="API token:").grid(row=0, column=2, sticky="w", **pad)
-        ttk.Entry(fr_auth, textvariable=self.api_token_var, width=30, show="•").grid(row=0, column=3, **pad)
+        self.api_token_entry = ttk.Entry(fr_auth, textvariable=self.api_token_var, width=30, show="•")
+        self.api_token_entry.grid(row=0, column=3, **pad)
 
         ttk.Checkbutton(fr_auth, text="Uložiť API token", variable=self.save_token_var).grid(row=1, column=1, sticky="w", **pad)
         ttk.Checkbutton(fr_auth, text="Pamätať nastavenia", variable=self.remember_settings_var).grid(row=1, column=3, sticky="w", **pad)
@@ -363,6 +197,11 @@ class App(tk.Tk):
 
         ttk.Checkbutton(fr_dates, text="Preskočiť víkendy", variable=self.skip_weekends_var).grid(row=2, column=0, sticky="w", **pad)
         ttk.Checkbutton(fr_dates, text="Preskočiť SK sviatky", variable=self.skip_holidays_var).grid(row=2, column=1, sticky="w", **pad)
+        ttk.Checkbutton(fr_dates, text="Doplniť len chýbajúci čas do 8h", variable=self.fill_gaps_var).grid(row=2, column=2, columnspan=2, sticky="w", **pad)
+
+        # already logged time per day of the range (filled in by the warm-up)
+        ttk.Label(fr_dates, textvariable=self.logged_var, wraplength=400, justify="left",
+                  foreground="#555").grid(row=0, column=4, rowspan=3, sticky="nw", **pad)
 
         # --- Tickets table ---
         fr_tickets = ttk.LabelFrame(self, text="Tikety (zaškrtni riadky, ktoré chceš logovať)")
@@ -370,7 +209,7 @@ class App(tk.Tk):
 
         # Order: [checkbox], ID, Summary, Váha
         self.columns = ("checked", "issue", "summary", "weight")
-        self.tree = ttk.Treeview(fr_tickets, columns=self.columns, show="headings", height=11)
+        self.tree = ttk.Treeview(fr_tickets, columns=self.columns, show="headings", height=10)
         self.tree.heading("checked", text="✓")
         self.tree.column("checked", width=36, anchor="center")
         self.tree.heading("issue", text="ID")
@@ -381,14 +220,15 @@ class App(tk.Tk):
         self.tree.column("weight", width=70, anchor="center")
         self.tree.grid(row=0, column=0, columnspan=6, padx=8, pady=(8, 4), sticky="nsew")
 
-        vsb = ttk.Scrollbar(fr_tickets, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=vsb.set)
+        # Only the visible rows exist in the tree; the scrollbar moves a window over the model
+        vsb = ttk.Scrollbar(fr_tickets, orient="vertical")
         vsb.grid(row=0, column=6, sticky="ns", pady=(8, 4))
 
-        # Fill initial rows
-        for t in self.tickets:
-            chk = "☑" if t.get("checked", 1) else "☐"
-            self.tree.insert("", "end", values=(chk, t["issue"], t.get("summary",""), t.get("weight",1)))
+        # Fill initial rows (the model is the source of truth, the tree mirrors it)
+        self.table = TicketTable(self.tree, self.columns, yscrollcommand=vsb.set, on_visible=self._on_rows_visible,
+                                 on_change=self._schedule_warmup)
+        vsb.configure(command=self.table.yview)
+        self.table.load(Ticket.from_config(t) for t in self.tickets)
 
         # Add/remove & refresh
         self.new_issue_var = tk.StringVar()
@@ -402,6 +242,14 @@ class App(tk.Tk):
         ttk.Button(fr_tickets, text="Pridať", command=self.add_ticket).grid(row=1, column=2, padx=8, pady=4, sticky="w")
         ttk.Button(fr_tickets, text="Odstrániť vybrané", command=self.remove_selected).grid(row=1, column=3, padx=8, pady=4, sticky="w")
         ttk.Button(fr_tickets, text="Obnoviť tabuľku", command=self.refresh_table_async).grid(row=1, column=4, padx=8, pady=4, sticky="w")
+        ttk.Button(fr_tickets, text="Hromadný import…", command=self.open_bulk_import).grid(row=1, column=5, padx=8, pady=4, sticky="w")
+
+        # Filter-as-you-type over ID + summary (in memory, no Jira calls)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *a: self.table.set_filter(self.filter_var.get()))
+        ttk.Label(fr_tickets, text="Filter:").grid(row=2, column=0, padx=8, pady=(0, 4), sticky="w")
+        ttk.Entry(fr_tickets, textvariable=self.filter_var, width=30).grid(row=2, column=0, padx=(110, 8), pady=(0, 4), sticky="w")
+        ttk.Button(fr_tickets, text="Načítať moje tikety", command=self.load_my_tickets).grid(row=2, column=2, columnspan=2, padx=8, pady=(0, 4), sticky="w")
 
         # Toggle checkbox on click + inline edit on double-click
         self.tree.bind("<Button-1>", self.on_tree_click)
@@ -412,12 +260,26 @@ class App(tk.Tk):
         fr_actions.place(x=10, y=670, width=900, height=70)
 
         self.run_btn = ttk.Button(fr_actions, text="Spustiť logovanie (8h/deň podľa váh, len zaškrtnuté)", command=self.run_clicked)
-        self.run_btn.grid(row=0, column=0, padx=8, pady=8)
+        self.run_btn.grid(row=0, column=0, padx=8, pady=(6, 2))
+
+        self.pause_btn = ttk.Button(fr_actions, text="Pozastaviť", command=self.pause_clicked, state="disabled")
+        self.pause_btn.grid(row=0, column=1, padx=8, pady=(6, 2))
+        self.cancel_btn = ttk.Button(fr_actions, text="Zrušiť beh", command=self.cancel_clicked, state="disabled")
+        self.cancel_btn.grid(row=0, column=2, padx=8, pady=(6, 2))
+
+        self.undo_btn = ttk.Button(fr_actions, text="Vrátiť posledný beh", command=self.undo_clicked)
+        self.undo_btn.grid(row=0, column=3, padx=8, pady=(6, 2))
 
-        ttk.Button(fr_actions, text="Ukončiť", command=self.on_close).grid(row=0, column=1, padx=8, pady=8)
+        ttk.Button(fr_actions, text="Ukončiť", command=self.on_close).grid(row=0, column=4, padx=8, pady=(6, 2))
 
         self.status_var = tk.StringVar(value="Pripravené.")
-        ttk.Label(fr_actions, textvariable=self.status_var).grid(row=0, column=2, padx=8, pady=8, sticky="w")
+        ttk.Label(fr_actions, textvariable=self.status_var).grid(row=1, column=0, columnspan=5, padx=8, pady=(0, 4), sticky="w")
+
+        # --- Live progress (one row per planned worklog) ---
+        fr_progress = ttk.LabelFrame(self, text="Priebeh")
+        fr_progress.place(x=10, y=740, width=900, height=210)
+        self.progress = ProgressPanel(fr_progress)
+        self.progress.pack(fill="both", expand=True, padx=8, pady=6)
 
     # ---------- Tree events ----------
     def on_tree_click(self, event):
@@ -430,9 +292,7 @@ class App(tk.Tk):
         if not row_id:
             return
         if col_id == "#1":  # checkbox column
-            vals = list(self.tree.item(row_id, "values"))
-            vals[0] = "☐" if vals[0] == "☑" else "☑"
-            self.tree.item(row_id, values=vals)
+            self.table.toggle(row_id)
 
     def on_tree_double_click(self, event):
         # Inline edit for ID / Summary / Váha
@@ -457,10 +317,9 @@ class App(tk.Tk):
             # Validate & normalize
             if colname == "weight":
                 try:
-                    iv = int(new_val)
-                    if iv < 0:
+                    new_val = int(new_val)
+                    if new_val < 0:
                         raise ValueError
-                    new_val = str(iv)
                 except Exception:
                     messagebox.showerror("Zlá váha", "Váha musí byť celé nezáporné číslo.")
                     return
@@ -469,10 +328,7 @@ class App(tk.Tk):
                 # After ID edit, try refresh summary for this row (async)
                 self.refresh_row_async(row_id, new_val)
 
-            vals = list(self.tree.item(row_id, "values"))
-            idx = self.columns.index(colname)
-            vals[idx] = new_val
-            self.tree.item(row_id, values=vals)
+            self.table.update(row_id, **{self.table.field_of[colname]: new_val})
 
         entry.bind("<Return>", save_edit)
         entry.bind("<FocusOut>", save_edit)
@@ -518,43 +374,130 @@ class App(tk.Tk):
             return
 
         issue = extract_issue_key(raw_issue).upper()
-        self.tree.insert("", "end", values=("☑", issue, "", str(w)))
+        row_id = self.table.add(Ticket(issue, w))
         self.new_issue_var.set("")
         self.new_weight_var.set("1")
         # Try refresh just this new row
-        row_id = self.tree.get_children()[-1]
+        self._summary_requested.add(row_id)
         self.refresh_row_async(row_id, issue)
 
+    def open_bulk_import(self):
+        """Paste many keys / URLs / numeric ids (or one JQL query) and add them in one go."""
+        top = tk.Toplevel(self)
+        top.title("Hromadný import tiketov")
+        top.geometry("640x420")
+        top.transient(self)
+        ttk.Label(top, text="Vlož kľúče, URL (/browse/…), číselné ID – alebo JQL dopyt (napr. project = SINT AND sprint in openSprints()):")\
+            .pack(anchor="w", padx=8, pady=(8, 4))
+        txt = tk.Text(top, height=16, wrap="word")
+        txt.pack(fill="both", expand=True, padx=8)
+        fr = ttk.Frame(top)
+        fr.pack(fill="x", padx=8, pady=8)
+        weight_var = tk.StringVar(value="1")
+        ttk.Label(fr, text="Váha:").pack(side="left")
+        ttk.Entry(fr, textvariable=weight_var, width=6).pack(side="left", padx=(4, 16))
+
+        def do_import():
+            try:
+                w = int(weight_var.get().strip())
+                if w < 0:
+                    raise ValueError()
+            except Exception:
+                messagebox.showwarning("Zlá váha", "Váha musí byť celé nezáporné číslo.", parent=top)
+                return
+            text = txt.get("1.0", "end").strip()
+            top.destroy()
+            self.bulk_import(text, w)
+
+        ttk.Button(fr, text="Importovať", command=do_import).pack(side="right")
+        ttk.Button(fr, text="Zrušiť", command=top.destroy).pack(side="right", padx=8)
+        txt.focus_set()
+
+    def bulk_import(self, text: str, weight: int = 1):
+        if not text:
+            return
+        email = self.email_var.get().strip()
+        token = self.api_token_var.get().strip()
+        if looks_like_jql(text):
+            if not email or not token:
+                messagebox.showerror("Prihlásenie", "Na JQL import zadaj Email aj API token.")
+                return
+            self._set_status("Hľadám tikety podľa JQL…")
+            threading.Thread(target=self._import_jql, args=(email, token, text, weight), daemon=True).start()
+            return
+
+        tickets, skipped = parse_ticket_block(text)
+        rows = self._insert_new_tickets([(t, "") for t in tickets], weight)
+        msg = f"Pridaných {len(rows)} tiketov"
+        if len(tickets) > len(rows):
+            msg += f", {len(tickets) - len(rows)} už v tabuľke"
+        if skipped:
+            msg += f", nerozpoznané: {', '.join(skipped[:5])}{'…' if len(skipped) > 5 else ''}"
+        self._set_status(msg + ".")
+        if rows and email and token:
+            threading.Thread(target=self._resolve_rows, args=(email, token, rows), daemon=True).start()
+
+    def _insert_new_tickets(self, tickets, weight, checked=True):
+        """Append (issue, summary) rows not yet in the table; returns [(iid, issue)] of the new rows."""
+        rows = []
+        for issue, summary in tickets:
+            if self.table.has_issue(issue):
+                continue
+            rows.append((self.table.add(Ticket(issue, weight, summary, checked)), issue))
+        self._summary_requested.update(iid for iid, _ in rows)  # resolved by the caller / came with summary
+        return rows
+
+    def _import_jql(self, email, token, jql, weight):
+        try:
+            issues = jira_search_issues(self.session, JIRA_CLOUD_BASE, email, token, jql)
+        except Exception as e:
+            log_exc("_import_jql", e)
+            self._fail_with_popup(f"JQL import zlyhal: {e}")
+            return
+        found = [(i["key"].upper(), (i.get("fields") or {}).get("summary") or "") for i in issues]
+
+        def apply():
+            rows = self._insert_new_tickets(found, weight)
+            self.status_var.set(f"JQL: nájdených {len(found)} tiketov, pridaných {len(rows)}.")
+        self._post_ui(apply)
+
+    def load_my_tickets(self):
+        """Add my assigned / worklogged / watched issues (unchecked): cached ones now, Jira changes in the background."""
+        email = self.email_var.get().strip()
+        token = self.api_token_var.get().strip()
+        cached = self._insert_new_tickets(cached_my_issues(email), 1, checked=False) if email else []
+        if not email or not token:
+            self._set_status(f"Z cache pridaných {len(cached)} tiketov (na obnovu zadaj Email aj API token).")
+            return
+        self._set_status(f"Z cache pridaných {len(cached)} tiketov, hľadám zmeny v Jire…")
+        threading.Thread(target=self._discover_my_tickets, args=(email, token), daemon=True).start()
+
+    def _discover_my_tickets(self, email, token):
+        try:
+            issues, fetched = discover_my_issues(self.session, JIRA_CLOUD_BASE, email, token)
+        except Exception as e:
+            log_exc("_discover_my_tickets", e)
+            self._append_status(f"Načítanie mojich tiketov zlyhalo: {e}")
+            return
+
+        def apply():
+            rows = self._insert_new_tickets(issues, 1, checked=False)
+            self.status_var.set(f"Moje tikety: {len(issues)} (zmenených {fetched}), pridaných {len(rows)}.")
+        self._post_ui(apply)
+
     def remove_selected(self):
-        sel = self.tree.selection()
-        for s in sel:
-            self.tree.delete(s)
+        self.table.remove(self.table.selection())
 
     def read_checked_tickets(self):
-        items = []
-        for iid in self.tree.get_children():
-            chk, issue, summary, weight = self.tree.item(iid, "values")
-            if chk != "☑":
-                continue
-            issue_norm = extract_issue_key(str(issue)).upper()
-            try:
-                w = int(weight)
-            except Exception:
-                w = 1
-            items.append({"issue": issue_norm, "weight": max(0, w), "summary": summary or ""})
-        return items
+        return [{"issue": extract_issue_key(t.issue).upper(), "weight": t.weight, "summary": t.summary}
+                for t in self.table.tickets(only_checked=True)]
 
     def read_all_tickets(self):
         items = []
-        for iid in self.tree.get_children():
-            chk, issue, summary, weight = self.tree.item(iid, "values")
-            issue_norm = extract_issue_key(str(issue)).upper()
-            try:
-                w = int(weight)
-            except Exception:
-                w = 1
-            items.append({"checked": 1 if chk == "☑" else 0,
-                          "issue": issue_norm, "weight": max(0, w), "summary": summary or ""})
+        for t in self.table.tickets():
+            item = t.to_config()
+            item["issue"] = extract_issue_key(t.issue).upper()
+            items.append(item)
         return items
 
     # ---------- Refresh actions ----------
@@ -564,35 +507,82 @@ class App(tk.Tk):
         if not email or not token:
             messagebox.showerror("Prihlásenie", "Zadaj Email aj API token.")
             return
-        session = build_session()
+        session = self.session
         ok, info = jira_get_myself(session, JIRA_CLOUD_BASE, email, token)
         if ok:
             messagebox.showinfo("OK", "Prihlásenie úspešné (myself).")
         else:
             messagebox.showerror("Chyba prihlásenia", info)
 
+    # ---------- Runtime hooks (see WorklogAppMixin) ----------
+    def _credentials(self):
+        return self.email_var.get().strip(), self.api_token_var.get().strip()
+
+    def _credential_entries(self):
+        return self.email_entry, self.api_token_entry
+
+    def _engine(self, secret, headless=False):
+        return CloudEngine(self.session, JIRA_CLOUD_BASE, self.email_var.get().strip(), secret)
+
+    # ---------- Lazy summaries ----------
+    def _on_rows_visible(self, tickets):
+        """Rows shown for the first time: queue their summaries and fetch them in one batch shortly."""
+        fresh = [t for t in tickets if t.iid not in self._summary_requested]
+        if not fresh:
+            return
+        self._summary_pending.extend(fresh)
+        if self._summary_job is None:
+            self._summary_job = self.after(SUMMARY_DEBOUNCE_MS, self._load_visible_summaries)
+
+    def _load_visible_summaries(self):
+        self._summary_job = None
+        email = self.email_var.get().strip()
+        token = self.api_token_var.get().strip()
+        pending, self._summary_pending = self._summary_pending, []
+        rows = [(t.iid, t.issue) for t in pending if t.iid not in self._summary_requested and t.issue]
+        if not rows or not email or not token:
+            return  # without credentials they load via "Obnoviť tabuľku"
+        self._summary_requested.update(iid for iid, _ in rows)
+        threading.Thread(target=self._resolve_rows, args=(email, token, rows), daemon=True).start()
+
     def refresh_table_async(self):
         """Fetch summaries for all rows (if credentials present)."""
         email = self.email_var.get().strip()
         token = self.api_token_var.get().strip()
         if not email or not token:
             return
-        th = threading.Thread(target=self._refresh_all_summaries, args=(email, token), daemon=True)
+        rows = [(t.iid, t.issue) for t in self.table.tickets()]
+        self._summary_requested.update(iid for iid, _ in rows)
+        th = threading.Thread(target=self._refresh_all_summaries, args=(email, token, rows), daemon=True)
         th.start()
 
-    def _refresh_all_summaries(self, email, token):
-        try:
-            session = build_session()
-            ok, info = jira_get_myself(session, JIRA_CLOUD_BASE, email, token)
-            if not ok:
-                self._append_status("Prihlásenie zlyhalo – obnova tabuľky preskočená.")
-                return
-            for iid in self.tree.get_children():
-                _, issue, _, _ = self.tree.item(iid, "values")
-                self._refresh_row(session, email, token, iid, issue)
+    def _refresh_all_summaries(self, email, token, rows):
+        session = self.session
+        ok, info = jira_get_myself(session, JIRA_CLOUD_BASE, email, token)
+        if not ok:
+            self._append_status("Prihlásenie zlyhalo – obnova tabuľky preskočená.")
+            return
+        if self._resolve_rows(email, token, rows, session):
             self._append_status("Tabuľka obnovená.")
+
+    def _resolve_rows(self, email, token, rows, session=None):
+        """Batch-resolve keys + summaries for [(iid, issue)] and update the rows in one UI step."""
+        try:
+            found, missing = jira_resolve_issues(session or self.session, JIRA_CLOUD_BASE, email, token,
+                                                 [issue for _, issue in rows])
         except Exception as e:
-            log_exc("_refresh_all_summaries", e)
+            log_exc("_resolve_rows", e)
+            self._append_status(f"Načítanie názvov zlyhalo: {e}")
+            return False
+        updates = [(iid, *found[issue]) for iid, issue in rows if issue in found]
+
+        def apply():
+            for iid, key, summary in updates:
+                self._apply_row_refresh(iid, key, summary)
+        self._post_ui(apply)
+        if missing:
+            self._append_status(f"Nenájdené alebo bez prístupu: {', '.join(missing[:5])}{'…' if len(missing) > 5 else ''}")
+        return True
 
     def refresh_row_async(self, row_id, issue):
         email = self.email_var.get().strip()
@@ -604,7 +594,7 @@ class App(tk.Tk):
 
     def _refresh_row_wrapper(self, email, token, row_id, issue):
         try:
-            session = build_session()
+            session = self.session
             ok, _ = jira_get_myself(session, JIRA_CLOUD_BASE, email, token)
             if not ok:
                 return
@@ -616,14 +606,14 @@ class App(tk.Tk):
         try:
             ok, key, summary, err = jira_resolve_issue(session, JIRA_CLOUD_BASE, email, token, issue)
             if ok:
-                vals = list(self.tree.item(row_id, "values"))
-                # Keep checkbox & weight, update ID + summary
-                vals[1] = key
-                vals[2] = summary or ""
-                self.after(0, lambda: self.tree.item(row_id, values=vals))
+                self._post_ui(lambda: self._apply_row_refresh(row_id, key, summary))
         except Exception as e:
             log_exc("_refresh_row", e)
 
+    def _apply_row_refresh(self, row_id, key, summary):
+        # Keep checkbox & weight, update ID + summary (no-op if the row was removed meanwhile)
+        self.table.update(row_id, issue=key, summary=summary or "")
+
     # ---------- Run ----------
     def run_clicked(self):
         try:
@@ -641,9 +631,24 @@ class App(tk.Tk):
         if not email or not api_token:
             messagebox.showerror("Prihlásenie", "Zadaj Email aj API token.")
             return
+        if self._flushing:
+            messagebox.showinfo("Fronta", "Práve sa odosielajú worklogy z offline fronty, skús to o chvíľu.")
+            return
+
+        # A cancelled run can continue with exactly its unsent worklogs
+        resume = last_run("cloud", JIRA_CLOUD_BASE, email, field="pending")
+        if resume is not None:
+            answer = messagebox.askyesnocancel(
+                "Prerušený beh", f"Beh {resume['id']} má {len(resume['pending'])} neodoslaných worklogov.\n\n"
+                                 "Pokračovať v ňom? (Nie = naplánovať nový beh)")
+            if answer is None:
+                return
+            if not answer:
+                drop_pending(resume["id"])
+                resume = None
 
         tickets = self.read_checked_tickets()
-        if not tickets:
+        if not tickets and resume is None:
             messagebox.showerror("Tikety", "Zaškrtni aspoň jeden riadok.")
             return
 
@@ -655,6 +660,7 @@ class App(tk.Tk):
             cfg["start_date"] = self.start_var.get().strip()
             cfg["end_date"] = self.end_var.get().strip()
             cfg["save_token"] = bool(self.save_token_var.get())
+            cfg["fill_gaps"] = bool(self.fill_gaps_var.get())
             save_config(cfg)
         if self.save_token_var.get():
             set_saved_secret(email, api_token)
@@ -662,62 +668,41 @@ class App(tk.Tk):
             clear_saved_secret(email)
 
         self.run_btn.config(state="disabled")
+        self.undo_btn.config(state="disabled")
+        self.pause_btn.config(state="normal", text="Pozastaviť")
+        self.cancel_btn.config(state="normal")
         self.status_var.set("Prebieha logovanie…")
-        th = threading.Thread(target=self._do_logging, args=(email, api_token, tickets, start, end), daemon=True)
-        th.start()
+        # Tk variables are read here, never from the worker thread
+        opts = {
+            "skip_weekends": bool(self.skip_weekends_var.get()),
+            "skip_holidays": bool(self.skip_holidays_var.get()),
+            "fill_gaps": bool(self.fill_gaps_var.get()),
+            "resume": resume,
+        }
+        self._control = RunControl()
+        self._worker = threading.Thread(target=self._do_logging, args=(email, api_token, tickets, start, end, opts),
+                                        daemon=True)
+        self._worker.start()
 
-    def _do_logging(self, email, api_token, tickets, start, end):
+    def _do_logging(self, email, api_token, tickets, start, end, opts):
+        scope = start_run()  # the summary covers this run only, not table refreshes or warm-up beside it
         try:
-            session = build_session()
-
-            ok, info = jira_get_myself(session, JIRA_CLOUD_BASE, email, api_token)
-            if not ok:
-                self._fail_with_popup(f"Prihlásenie zlyhalo: {info}")
+            engine = self._engine(api_token)
+            stats = run_logging(engine, tickets, start, end, on_status=self._append_status, control=self._control,
+                                warm=self.warmup,
+                                on_plan=lambda plan: self._post_ui(lambda: self.progress.set_plan(plan)),
+                                on_entry=lambda i, entry: self._post_entry(i),
+                                **opts)
+            if not stats["days"]:
                 return
-
-            # resolve keys + summaries (final check)
-            resolved = []
-            for t in tickets:
-                ok_i, key, summary, err = jira_resolve_issue(session, JIRA_CLOUD_BASE, email, api_token, t["issue"])
-                if not ok_i:
-                    self._fail_with_popup(f"Issue {t['issue']} neexistuje alebo nemáš prístup: {err}")
-                    return
-                resolved.append({"issue": key, "weight": t["weight"], "summary": summary or ""})
-            tickets = resolved
-
-            days = working_days(start, end, self.skip_weekends_var.get(), self.skip_holidays_var.get())
-            if not days:
-                self._set_status("Žiadne pracovné dni v zadanom rozsahu.")
-                self._reenable()
+            if stats["cancelled"]:
+                self._append_status(f"Beh zrušený: zalogovaných {stats['ok']}, zvyšok sa dá dokončiť"
+                                    " ďalším spustením (bez nového plánovania).")
+                return
+            if stats["queued"]:
+                self._append_status(f"📤 Zalogovaných {stats['ok']}, {stats['queued']} čaká vo fronte – odošlú sa"
+                                    " automaticky, keď bude Jira znova dostupná.")
                 return
-
-            weights = [t["weight"] for t in tickets]
-            minutes_per_day = proportional_split(8 * 60, weights, round_to=15)
-
-            for day in days:
-                started_iso = local_iso_with_tz(day, hour=16, minute=0)
-                for idx, t in enumerate(tickets):
-                    issue_key = t["issue"]
-                    mins = minutes_per_day[idx] if idx < len(minutes_per_day) else 0
-                    if mins <= 0:
-                        continue
-                    ok, err = log_work_cloud(
-                        session=session, base_url=JIRA_CLOUD_BASE,
-                        email=email, api_token=api_token,
-                        issue_key=issue_key, started_iso_tz=started_iso,
-                        seconds=int(mins * 60), comment=None,
-                    )
-                    day_str = day.strftime("%d.%m.%Y")
-                    time_str = (f"{mins//60}h {mins%60}m") if mins >= 60 else f"{mins}m"
-                    if ok:
-                        self._append_status(f"✔ {day_str} – {issue_key}: {time_str}")
-                    else:
-                        self._append_status(f"✖ {day_str} – {issue_key}: {err}")
-                        log_text(f"Worklog error {issue_key} {day_str}: {err}")
-                        if "HTTP 400" in err or "HTTP 401" in err or "HTTP 403" in err:
-                            self.after(0, lambda e=err, k=issue_key, d=day_str: messagebox.showerror(
-                                "Jira odpoveď", f"Chyba pri logovaní do {k} ({d}):\n\n{e}"
-                            ))
 
             # Optional ping
             try:
@@ -725,38 +710,32 @@ class App(tk.Tk):
                 q_from = start.strftime("%Y-%m-%d")
                 q_to = end.strftime("%Y-%m-%d")
                 final_url = f"{TIME_TRACKING_URL}?user={q_user}&from={q_from}&to={q_to}&token={TIME_TRACKING_TOKEN}"
-                session.get(final_url, timeout=10)
+                engine.session.get(final_url, timeout=10)
             except Exception as e:
                 log_exc("time_tracking_ping", e)
 
-            self._append_status("Hotovo. Zalogované do Jira Cloud.")
+            if stats["errors"]:
+                self._append_status(f"⚠ Zalogované {stats['ok']}/{stats['planned']}, zlyhalo {stats['failed']},"
+                                    f" preskočené {stats['skipped']}.")
+                report = format_error_report(stats["errors"])
+                self._post_ui(lambda: messagebox.showerror(
+                    "Jira odpoveď", f"Niektoré worklogy sa nezalogovali:\n\n{report}\n\nPozri log: {LOG_PATH}"))
+            elif stats["full_days"]:
+                self._append_status(f"Hotovo. Zalogované do Jira Cloud. Už plných dní: {stats['full_days']}"
+                                    f" (nadčas: {stats['overtime_days']}).")
+            else:
+                self._append_status("Hotovo. Zalogované do Jira Cloud.")
+        except RunError as e:
+            self._fail_with_popup(str(e))
         except Exception as e:
             log_exc("_do_logging", e)
             self._fail_with_popup(f"Chyba: {e}")
         finally:
+            log_text("Jira calls of this run:\n" + finish_run(scope=scope))
             self._reenable()
 
-    # ---------- UI helpers ----------
-    def _set_status(self, msg: str):
-        self.status_var.set(msg)
-
-    def _append_status(self, line: str):
-        self.status_var.set(line)
-
-    def _fail_with_popup(self, msg: str):
-        self._set_status(msg)
-        try:
-            self.after(0, lambda: messagebox.showerror("Chyba", f"{msg}\n\nPozri log: {LOG_PATH}"))
-        except Exception:
-            pass
-
-    def _reenable(self):
-        try:
-            self.run_btn.config(state="normal")
-        except Exception:
-            pass
-
-    def on_close(self):
+    # ---------- Close ----------
+    def _save_and_destroy(self):
         try:
             cfg = load_config()
             cfg["email"] = self.email_var.get().strip()
@@ -764,6 +743,7 @@ class App(tk.Tk):
             cfg["start_date"] = self.start_var.get().strip()
             cfg["end_date"] = self.end_var.get().strip()
             cfg["save_token"] = bool(self.save_token_var.get())
+            cfg["fill_gaps"] = bool(self.fill_gaps_var.get())
             save_config(cfg)
 
             if self.save_token_var.get():
@@ -773,22 +753,6 @@ class App(tk.Tk):
         finally:
             self.destroy()
 
-# ===== Dup helpers (clarity) =====
-def start_of_week(d: dt.date) -> dt.date:
-    return d - dt.timedelta(days=d.weekday())
-
-def end_of_week(d: dt.date) -> dt.date:
-    return start_of_week(d) + dt.timedelta(days=4)
-
-def first_day_of_month(d: dt.date) -> dt.date:
-    return dt.date(d.year, d.month, 1)
-
-def last_day_of_month(d: dt.date) -> dt.date:
-    if d.month == 12:
-        return dt.date(d.year, 12, 31)
-    next_month = dt.date(d.year, d.month + 1, 1)
-    return next_month - dt.timedelta(days=1)
-
 if __name__ == "__main__":
     app = App()
     app.mainloop()
@@ -0,0 +1,179 @@
+# jira_worklog_progress.py
+# Live progress panel for a logging run, shared by both GUIs.
+# One row per planned entry (state, day, issue, time, latency, retries, error) and a
+# throughput / ETA header. Rows are drawn on a Canvas and only the visible ones exist
+# as canvas items, so a run with thousands of entries costs the same to redraw as ten.
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import List
+
+from jira_worklog_helpers import minutes_to_jira_time
+
+ROW_HEIGHT = 18
+STATE_ICONS = {"pending": "·", "running": "…", "ok": "✔", "failed": "✖", "dry": "○", "skipped": "↷",
+               "queued": "✉"}
+STATE_COLORS = {"pending": "#777777", "running": "#1f5fbf", "ok": "#1d7f2e", "failed": "#b3261e", "dry": "#777777",
+                "skipped": "#b36b00", "queued": "#6a3d9a"}
+DONE_STATES = ("ok", "failed", "dry", "skipped", "queued")
+# x offset of each column in pixels
+COLUMNS = (("state", 8), ("day", 30), ("issue", 120), ("time", 250), ("latency", 320), ("retries", 410), ("error", 470))
+COLUMN_TITLES = {"state": "", "day": "Deň", "issue": "Issue", "time": "Čas", "latency": "Latencia",
+                 "retries": "Opak.", "error": "Chyba"}
+
+
+def format_eta(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class ProgressPanel(ttk.Frame):
+    """Virtualized list of planned worklogs. All methods must run on the Tk thread."""
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.entries: List[dict] = []
+        self._counted = set()  # indices already counted as done (updates may be drained late / twice)
+        self._done = 0
+        self._timed = 0
+        self._latency_sum = 0.0
+        self._retries = 0
+        self._started = None
+        self._follow = True
+        self._redraw_pending = False
+
+        self.header_var = tk.StringVar(value="Žiadny beh.")
+        ttk.Label(self, textvariable=self.header_var).grid(row=0, column=0, columnspan=2, sticky="w", padx=4, pady=(0, 2))
+
+        titles = tk.Canvas(self, height=ROW_HEIGHT, highlightthickness=0)
+        titles.grid(row=1, column=0, sticky="ew")
+        for name, x in COLUMNS:
+            titles.create_text(x, ROW_HEIGHT // 2, text=COLUMN_TITLES[name], anchor="w")
+
+        self.canvas = tk.Canvas(self, background="white", highlightthickness=0)
+        self.canvas.grid(row=2, column=0, sticky="nsew")
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.vsb.grid(row=2, column=1, sticky="ns")
+        self.canvas.configure(yscrollcommand=self.vsb.set, yscrollincrement=ROW_HEIGHT)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(2, weight=1)
+
+        self.canvas.bind("<Configure>", lambda e: self._schedule_redraw())
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_units(-3))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_units(3))
+
+    # ---------- data ----------
+    def set_plan(self, entries: List[dict]):
+        """Start a new run; `entries` are the runner's plan dicts (updated in place by the worker)."""
+        self.entries = entries
+        self._counted = set()
+        self._done = 0
+        self._timed = 0
+        self._latency_sum = 0.0
+        self._retries = 0
+        self._started = time.perf_counter()
+        self._follow = True
+        self.canvas.configure(scrollregion=(0, 0, 0, len(entries) * ROW_HEIGHT))
+        self.canvas.yview_moveto(0)
+        self._update_header()
+        self._schedule_redraw()
+
+    def update_entry(self, index: int):
+        """Entry `index` changed state; cheap when it is scrolled out of view.
+
+        The entry is read live, so a "running" update drained after the entry finished already
+        sees it done; every entry is counted once however many updates follow.
+        """
+        entry = self.entries[index]
+        if entry["state"] in DONE_STATES and index not in self._counted:
+            self._counted.add(index)
+            self._done += 1
+            if entry.get("latency") is not None:  # skipped / queued entries never hit Jira
+                self._timed += 1
+                self._latency_sum += entry["latency"]
+            self._retries += entry.get("retries") or 0
+            self._update_header()
+        elif entry["state"] == "running" and self._follow:
+            self._scroll_to(index)
+        if self._is_visible(index):
+            self._schedule_redraw()
+
+    def _update_header(self):
+        total = len(self.entries)
+        if not total:
+            self.header_var.set("Nič na zalogovanie.")
+            return
+        elapsed = max(time.perf_counter() - self._started, 1e-6)
+        text = f"{self._done}/{total} hotovo"
+        if self._done:
+            rate = self._done / elapsed
+            text += f" · {rate * 60:.1f} záznamov/min"
+            if self._done < total:
+                text += f" · ETA {format_eta((total - self._done) / rate)}"
+            if self._timed:
+                text += f" · ⌀ latencia {self._latency_sum / self._timed * 1000:.0f} ms"
+            if self._retries:
+                text += f" · opakovaní {self._retries}"
+        self.header_var.set(text)
+
+    # ---------- scrolling ----------
+    def _visible_range(self):
+        top = int(self.canvas.canvasy(0)) // ROW_HEIGHT
+        rows = self.canvas.winfo_height() // ROW_HEIGHT + 2
+        return max(top, 0), min(top + rows, len(self.entries))
+
+    def _is_visible(self, index: int) -> bool:
+        first, last = self._visible_range()
+        return first <= index < last
+
+    def _scroll_to(self, index: int):
+        if not self._is_visible(index) and self.entries:
+            rows = max(self.canvas.winfo_height() // ROW_HEIGHT, 1)
+            self.canvas.yview_moveto(max(index - rows + 2, 0) / len(self.entries))
+            self._schedule_redraw()
+
+    def _on_scrollbar(self, *args):
+        self._follow = False  # the user took over; stop jumping to the running entry
+        self.canvas.yview(*args)
+        self._schedule_redraw()
+
+    def _scroll_units(self, units: int):
+        self._follow = False
+        self.canvas.yview_scroll(units, "units")
+        self._schedule_redraw()
+
+    def _on_wheel(self, event):
+        self._scroll_units(-1 if event.delta > 0 else 1)
+
+    # ---------- drawing ----------
+    def _schedule_redraw(self):
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        self.canvas.delete("row")
+        first, last = self._visible_range()
+        for i in range(first, last):
+            self._draw_row(i, self.entries[i])
+
+    def _draw_row(self, i: int, entry: dict):
+        y = i * ROW_HEIGHT + ROW_HEIGHT // 2
+        state = entry.get("state", "pending")
+        latency = entry.get("latency")
+        values = {
+            "state": STATE_ICONS.get(state, "?"),
+            "day": entry["day"].strftime("%d.%m.%Y"),
+            "issue": entry["issue"],
+            "time": minutes_to_jira_time(entry["minutes"]),
+            "latency": f"{latency * 1000:.0f} ms" if latency is not None else "",
+            "retries": str(entry.get("retries") or ""),
+            "error": (entry.get("error") or "")[:120],
+        }
+        color = STATE_COLORS.get(state, "black")
+        for name, x in COLUMNS:
+            self.canvas.create_text(x, y, text=values[name], anchor="w", fill=color, tags="row")
@@ -0,0 +1,1497 @@
+# jira_worklog_runner.py
+# Headless planning + submission of worklogs (8h/day split by weights), shared by both GUIs.
+# Engines: Jira Cloud over REST (CloudEngine) and Jira Server through Selenium (SeleniumEngine).
+#
+#   python jira_worklog_runner.py run    --config jobs.json [--job NAME] [--from D --to D] [--dry-run] [--trace FILE]
+#   python jira_worklog_runner.py daemon --config jobs.json      # e.g. every workday at 16:00
+import os
+import re
+import sys
+import copy
+import json
+import time
+import queue
+import atexit
+import random
+import threading
+import argparse
+import datetime as dt
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+# --- HTTP client (requests with retries) ---
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, NewConnectionError
+from urllib3.util.retry import Retry
+
+# --- Pure helpers (keys, workdays, 8h split, Jira formats, ranges) ---
+from jira_worklog_helpers import (
+    KEY_RE, SK_HOLIDAYS_2025, day_balances, extract_issue_key, format_jira_date, local_iso_with_tz,
+    minutes_to_jira_time, resolve_range, split_missing_minutes, working_days,
+)
+
+# --- Request spans for every Jira call (summary after each run, optional trace file) ---
+from jira_worklog_trace import TRACER, TRACE_FORMAT, finish_run, instrument_session, start_run
+
+# --- Optional safe password store ---
+try:
+    import keyring  # pip install keyring
+except Exception:
+    keyring = None
+
+# --- Optional: Selenium (only for the Jira Server engine) ---
+try:
+    from selenium import webdriver  # pip install selenium
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+except Exception:
+    webdriver = None
+
+# ================== CONFIG ==================
+LOG_PATH = os.path.join(os.path.expanduser("~"), ".jira_worklog_gui.log")
+LOG_MAX_BYTES = 2 * 1024 * 1024  # rotate to .log.1 … .log.N above this size
+LOG_BACKUPS = 3
+LOG_QUEUE_MAX = 10000            # records waiting for the writer; extra ones are counted and dropped
+LOG_BATCH = 500                  # records per write() call
+RUNNER_CONFIG_PATH = os.path.join(os.path.expanduser("~"), ".jira_worklog_runner.json")
+ISSUE_BATCH = 100  # keys / ids per "key in (...)" search when resolving many tickets
+RUNS_PATH = os.path.join(os.path.expanduser("~"), ".jira_worklog_runs.json")
+RUNS_KEEP = 20     # newest runs kept in the journal (for "undo run")
+UNDO_WORKERS = 8   # parallel DELETEs when undoing a run (stays below the session's pool size)
+WARMUP_TTL_S = 120  # prefetched auth / tickets / logged minutes older than this are fetched again by the run
+OUTBOX_PATH = os.path.join(os.path.expanduser("~"), ".jira_worklog_outbox.json")
+OUTBOX_BATCH = 20   # queued worklogs sent per flush round; the outbox file is rewritten after each round
+OUTBOX_WORKERS = 4  # parallel POSTs while flushing (Cloud; the browser engine sends one at a time)
+DISCOVERY_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".jira_worklog_my_issues.json")
+DISCOVERY_DAYS = 30         # a full pull looks at issues with activity in the last N days
+DISCOVERY_FULL_AFTER = 7    # days; older caches are pulled in full again (drops stale issues)
+DISCOVERY_OVERLAP_H = 24    # incremental pulls re-read this much history (Jira evaluates JQL dates in the user's timezone)
+DISCOVERY_JQL = "(assignee = currentUser() OR worklogAuthor = currentUser() OR watcher = currentUser())"
+
+class RunError(Exception):
+    """A run cannot start or continue (login failed, issue missing, ...)."""
+
+
+class AuthError(RunError):
+    """Jira refused the credentials (retrying the same ones only risks a login CAPTCHA)."""
+
+
+# ================== LOGGING HELPERS ==================
+class FileLog:
+    """JSON-lines log written by one background thread.
+
+    Callers only enqueue a record (never block on the disk); the writer drains the
+    queue in batches, keeps the file open between batches and rotates it by size.
+    """
+
+    def __init__(self, path: str, max_bytes: int = LOG_MAX_BYTES, backups: int = LOG_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=LOG_QUEUE_MAX)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def write(self, record: dict):
+        record.setdefault("ts", dt.datetime.now().isoformat(timespec="milliseconds"))
+        record.setdefault("thread", threading.current_thread().name)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="FileLog", daemon=True)
+                    self._thread.start()
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _run(self):
+        f = None
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < LOG_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in batch]
+            if self.dropped:
+                lines.append(json.dumps({"ts": dt.datetime.now().isoformat(timespec="milliseconds"), "level": "warning",
+                                         "msg": f"log queue full, {self.dropped} records dropped"}) + "\n")
+                self.dropped = 0
+            try:
+                if f is None:
+                    f = open(self.path, "a", encoding="utf-8")
+                f.write("".join(lines))
+                f.flush()
+                if f.tell() >= self.max_bytes:
+                    f.close()
+                    f = None
+                    self._rotate()
+            except Exception:
+                f = None  # disk full / file locked: drop this batch, reopen next time
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+LOG = FileLog(LOG_PATH)
+atexit.register(LOG.flush)
+
+def log_exc(prefix: str, exc: Exception):
+    LOG.write({
+        "level": "error", "msg": prefix, "exc": repr(exc),
+        "traceback": "".join(traceback.format_exception(type(exc), exc, exc.__traceback__)),
+    })
+
+def log_text(text: str):
+    LOG.write({"level": "info", "msg": text})
+
+# ================== PLANNING ==================
+def plan_worklogs(tickets: List[dict], days: List[dt.date], logged_minutes: Optional[dict] = None,
+                  randomize_k: int = 0, rnd=random) -> Tuple[List[dict], dict]:
+    """Plan [{"day", "issue", "minutes"}] filling each day up to 8h.
+
+    With randomize_k > 0 only that many randomly chosen tickets share a day.
+    Returns (plan, stats) where stats counts days already full / in overtime.
+    """
+    plan = []
+    stats = {"days": len(days), "full_days": 0, "overtime_days": 0}
+    for day, missing in day_balances(days, logged_minutes or {}):
+        if missing <= 0:
+            stats["full_days"] += 1
+            if missing < 0:
+                stats["overtime_days"] += 1
+                log_text(f"Overtime {day.isoformat()}: {-missing} min nad 8h")
+            continue
+
+        todays = list(tickets)
+        if randomize_k and len(todays) > 1:
+            todays = rnd.sample(todays, max(1, min(int(randomize_k), len(todays))))
+
+        weights = [max(0, int(t.get("weight", 1))) for t in todays]
+        if sum(weights) == 0:
+            weights = [1] * len(todays)
+
+        for t, mins in zip(todays, split_missing_minutes(missing, weights, round_to=15)):
+            if mins > 0:
+                plan.append({"day": day, "issue": t["issue"], "minutes": mins})
+    return plan, stats
+
+# ================== JIRA CLOUD CLIENT ==================
+def build_session(pool_size: int = 10) -> requests.Session:
+    s = requests.Session()
+    retries = Retry(
+        total=5, connect=3, read=3, backoff_factor=0.6,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["HEAD","GET","POST","PUT","DELETE","OPTIONS","TRACE","PATCH"])
+    )
+    adapter = HTTPAdapter(max_retries=retries, pool_connections=pool_size, pool_maxsize=pool_size)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers.update({"Accept": "application/json"})
+    return instrument_session(s)
+
+def jira_get_myself(session: requests.Session, base_url: str, email: str, api_token: str) -> Tuple[bool, str]:
+    try:
+        resp = session.get(f"{base_url}/rest/api/3/myself", auth=(email, api_token), timeout=15)
+        if resp.status_code == 200:
+            return True, ""
+        return False, f"/myself status {resp.status_code}: {resp.text[:500]}"
+    except Exception as e:
+        log_exc("jira_get_myself", e)
+        return False, repr(e)
+
+def jira_resolve_issue(session: requests.Session, base_url: str, email: str, api_token: str, raw_input: str) -> Tuple[bool, str, str, str]:
+    """Resolve input to (key, summary)."""
+    candidate = extract_issue_key(raw_input)
+
+    try:
+        r = session.get(f"{base_url}/rest/api/3/issue/{candidate}?fields=key,summary",
+                        auth=(email, api_token), timeout=15)
+        if r.status_code == 200:
+            data = r.json()
+            key = data.get("key", candidate).upper()
+            summary = (data.get("fields", {}) or {}).get("summary", "")
+            return True, key, summary or "", ""
+    except Exception as e:
+        log_exc("jira_resolve_issue(GET)", e)
+        return False, "", "", repr(e)
+
+    if candidate.isdigit():
+        try:
+            jql = f"id={candidate}"
+            sr = session.get(f"{base_url}/rest/api/3/search",
+                             params={"jql": jql, "fields": "key,summary"},
+                             auth=(email, api_token), timeout=20)
+            if sr.status_code == 200:
+                issues = sr.json().get("issues", [])
+                if issues:
+                    key = issues[0]["key"].upper()
+                    summary = (issues[0].get("fields", {}) or {}).get("summary", "")
+                    return True, key, summary or "", ""
+            return False, "", "", f"{raw_input}: Nie je možné nájsť podľa numerického ID. Použi issue key (napr. SINT-1234)."
+        except Exception as e:
+            log_exc("jira_resolve_issue(JQL)", e)
+            return False, "", "", repr(e)
+
+    try:
+        txt = r.text[:500]
+    except Exception:
+        txt = "neznáma odpoveď"
+    return False, "", "", f"{raw_input}: status {r.status_code if 'r' in locals() else '?'}: {txt}"
+
+def jira_search_issues(session: requests.Session, base_url: str, email: str, api_token: str,
+                       jql: str, fields: str = "summary", page_size: int = 100) -> List[dict]:
+    """All issues matching `jql` (paginated). Raises RuntimeError when Jira does not answer 200."""
+    issues = []
+    while True:
+        r = session.get(f"{base_url}/rest/api/3/search",
+                        params={"jql": jql, "fields": fields, "startAt": len(issues), "maxResults": page_size,
+                                "validateQuery": "warn"},
+                        auth=(email, api_token), timeout=30)
+        if r.status_code != 200:
+            raise RuntimeError(f"search status {r.status_code}: {r.text[:500]}")
+        data = r.json()
+        page = data.get("issues", [])
+        issues.extend(page)
+        if not page or len(issues) >= data.get("total", 0):
+            return issues
+
+def jira_resolve_issues(session: requests.Session, base_url: str, email: str, api_token: str,
+                        raw_inputs: List[str], batch: int = ISSUE_BATCH) -> Tuple[Dict[str, Tuple[str, str]], List[str]]:
+    """Resolve many keys / URLs / numeric ids at once: ({raw: (key, summary)}, [raw not found]).
+
+    One `key in (...)` / `id in (...)` search per `batch` inputs instead of one GET per issue;
+    whatever the search does not return (moved issues, odd ids) falls back to jira_resolve_issue.
+    """
+    wanted = {raw: extract_issue_key(raw).upper() for raw in raw_inputs}
+    keys = list(dict.fromkeys(c for c in wanted.values() if KEY_RE.match(c)))
+    ids = list(dict.fromkeys(c for c in wanted.values() if c.isdigit()))
+    found = {}
+    for field, values in (("key", keys), ("id", ids)):
+        for i in range(0, len(values), batch):
+            jql = f"{field} in ({', '.join(values[i:i + batch])})"
+            for issue in jira_search_issues(session, base_url, email, api_token, jql):
+                entry = (issue["key"].upper(), (issue.get("fields") or {}).get("summary") or "")
+                found[issue["key"].upper()] = entry
+                found[str(issue.get("id"))] = entry
+    resolved, missing = {}, []
+    for raw, candidate in wanted.items():
+        if candidate in found:
+            resolved[raw] = found[candidate]
+            continue
+        ok, key, summary, _ = jira_resolve_issue(session, base_url, email, api_token, raw)
+        if ok:
+            resolved[raw] = (key, summary)
+        else:
+            missing.append(raw)
+    return resolved, missing
+
+def load_discovery_cache(path: str = DISCOVERY_CACHE_PATH) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def cached_my_issues(email: str, path: str = DISCOVERY_CACHE_PATH) -> List[Tuple[str, str]]:
+    """[(key, summary)] from the last discovery for `email`, newest activity first; no network."""
+    entry = load_discovery_cache(path).get(email.lower()) or {}
+    return [tuple(i) for i in entry.get("issues", [])]
+
+
+def discover_my_issues(session: requests.Session, base_url: str, email: str, api_token: str,
+                       path: str = DISCOVERY_CACHE_PATH, full: bool = False) -> Tuple[List[Tuple[str, str]], int]:
+    """Issues I'm assigned to, logged work on or watch: ([(key, summary)], fetched now).
+
+    One paginated search with only `summary` requested. With a fresh cache only issues
+    updated since the last pull (minus DISCOVERY_OVERLAP_H) are fetched and merged in.
+    """
+    cache = load_discovery_cache(path)
+    entry = cache.get(email.lower()) or {}
+    now = dt.datetime.now()
+    try:
+        pulled = dt.datetime.fromisoformat(entry["pulled_at"])
+    except Exception:
+        pulled = None
+    if full or pulled is None or now - pulled > dt.timedelta(days=DISCOVERY_FULL_AFTER):
+        since, known = f"-{DISCOVERY_DAYS}d", {}
+    else:
+        since = f'"{pulled - dt.timedelta(hours=DISCOVERY_OVERLAP_H):%Y-%m-%d %H:%M}"'
+        known = {k: s for k, s in entry.get("issues", [])}
+    jql = f"{DISCOVERY_JQL} AND updated >= {since} ORDER BY updated DESC"
+    fetched = [(i["key"].upper(), (i.get("fields") or {}).get("summary") or "")
+               for i in jira_search_issues(session, base_url, email, api_token, jql)]
+    fresh = {k for k, _ in fetched}
+    issues = fetched + [(k, s) for k, s in known.items() if k not in fresh]
+    cache[email.lower()] = {"pulled_at": now.isoformat(timespec="seconds"), "issues": issues}
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except Exception as e:
+        log_exc("discover_my_issues cache", e)
+    return issues, len(fetched)
+
+
+def jira_fetch_logged_minutes(session: requests.Session, base_url: str, email: str, api_token: str,
+                              start: dt.date, end: dt.date) -> Tuple[bool, dict, str]:
+    """Minutes already logged by the current user per day in [start, end].
+
+    One paginated search returns the issues with their first page of worklogs
+    inline; only issues with more worklogs than that are fetched separately.
+    """
+    auth = (email, api_token)
+    try:
+        me = session.get(f"{base_url}/rest/api/3/myself", auth=auth, timeout=15)
+        if me.status_code != 200:
+            return False, {}, f"/myself status {me.status_code}: {me.text[:500]}"
+        account_id = me.json().get("accountId")
+
+        jql = (f'worklogAuthor = currentUser() AND worklogDate >= "{start.isoformat()}" '
+               f'AND worklogDate <= "{end.isoformat()}"')
+        logged_s = {}
+        start_at = 0
+        while True:
+            r = session.get(f"{base_url}/rest/api/3/search",
+                            params={"jql": jql, "fields": "worklog", "startAt": start_at, "maxResults": 100},
+                            auth=auth, timeout=30)
+            if r.status_code != 200:
+                return False, {}, f"search status {r.status_code}: {r.text[:500]}"
+            data = r.json()
+            issues = data.get("issues", [])
+            for issue in issues:
+                wl_page = (issue.get("fields", {}) or {}).get("worklog", {}) or {}
+                worklogs = wl_page.get("worklogs", [])
+                if wl_page.get("total", 0) > len(worklogs):
+                    wr = session.get(f"{base_url}/rest/api/3/issue/{issue['key']}/worklog",
+                                     params={"maxResults": 5000}, auth=auth, timeout=30)
+                    if wr.status_code != 200:
+                        return False, {}, f"{issue['key']} worklog status {wr.status_code}"
+                    worklogs = wr.json().get("worklogs", [])
+                for wl in worklogs:
+                    if (wl.get("author") or {}).get("accountId") != account_id:
+                        continue
+                    day = dt.date.fromisoformat(wl["started"][:10])
+                    if start <= day <= end:
+                        logged_s[day] = logged_s.get(day, 0) + int(wl.get("timeSpentSeconds", 0))
+            start_at += len(issues)
+            if not issues or start_at >= data.get("total", 0):
+                break
+        return True, {d: sec // 60 for d, sec in logged_s.items()}, ""
+    except Exception as e:
+        log_exc("jira_fetch_logged_minutes", e)
+        return False, {}, repr(e)
+
+def response_retries(resp: requests.Response) -> int:
+    """How many times urllib3 retried before `resp` came back (0 without a Retry adapter)."""
+    retries = getattr(getattr(resp, "raw", None), "retries", None)
+    return len(getattr(retries, "history", ()) or ())
+
+def request_never_sent(exc: Exception) -> bool:
+    """True when Jira was never reached (DNS, refused connection, connect timeout), so a POST
+    cannot have been created. Read timeouts and broken responses may come after it was."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(exc, requests.exceptions.ConnectionError):
+        return False
+    reason = exc.args[0] if exc.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))  # NameResolutionError is a NewConnectionError
+
+def log_work_cloud(session: requests.Session, base_url: str, email: str, api_token: str,
+                   issue_key: str, started_iso_tz: str, seconds: int, comment: str = None,
+                   hooks: dict = None) -> Tuple[bool, str]:
+    url = f"{base_url}/rest/api/3/issue/{issue_key}/worklog"
+    payload = {"started": started_iso_tz, "timeSpentSeconds": int(seconds)}
+    if comment:
+        payload["comment"] = {
+            "type": "doc", "version": 1,
+            "content": [{"type": "paragraph", "content": [{"type": "text", "text": comment}]}],
+        }
+    try:
+        resp = session.post(url, json=payload, auth=(email, api_token), timeout=20, hooks=hooks)
+    except Exception as e:
+        log_exc("log_work_cloud(request)", e)
+        if request_never_sent(e):
+            return False, f"offline: {repr(e)}"
+        return False, f"request error: {repr(e)}"
+
+    if resp.status_code == 201:
+        return True, ""
+    try:
+        data = resp.json()
+    except Exception:
+        data = {"raw": resp.text}
+    return False, f"HTTP {resp.status_code}: {data}"
+
+# ================== JIRA SERVER (REST read) ==================
+def server_fetch_logged_minutes(base_url: str, username: str, password: str,
+                                start: dt.date, end: dt.date, session: requests.Session = None) -> dict:
+    """Minutes the user already has per day in [start, end] on Jira Server (REST v2, one search).
+
+    Raises RuntimeError when Jira does not answer with 200.
+    """
+    auth = (username, password)
+    jql = (f'worklogAuthor = currentUser() AND worklogDate >= "{start.isoformat()}" '
+           f'AND worklogDate <= "{end.isoformat()}"')
+    s = session or instrument_session(requests.Session())
+    logged_s = {}
+    start_at = 0
+    while True:
+        r = s.get(f"{base_url}/rest/api/2/search",
+                  params={"jql": jql, "fields": "worklog", "startAt": start_at, "maxResults": 100},
+                  auth=auth, timeout=30)
+        if r.status_code != 200:
+            raise RuntimeError(f"Jira search: HTTP {r.status_code}")
+        data = r.json()
+        issues = data.get("issues", [])
+        for issue in issues:
+            wl_page = (issue.get("fields") or {}).get("worklog") or {}
+            worklogs = wl_page.get("worklogs", [])
+            if wl_page.get("total", 0) > len(worklogs):
+                wr = s.get(f"{base_url}/rest/api/2/issue/{issue['key']}/worklog", auth=auth, timeout=30)
+                if wr.status_code != 200:
+                    raise RuntimeError(f"{issue['key']} worklog: HTTP {wr.status_code}")
+                worklogs = wr.json().get("worklogs", [])
+            for wl in worklogs:
+                if (wl.get("author") or {}).get("name", "").lower() != username.lower():
+                    continue
+                day = dt.date.fromisoformat(wl["started"][:10])
+                if start <= day <= end:
+                    logged_s[day] = logged_s.get(day, 0) + int(wl.get("timeSpentSeconds", 0))
+        start_at += len(issues)
+        if not issues or start_at >= data.get("total", 0):
+            break
+    return {d: sec // 60 for d, sec in logged_s.items()}
+
+# ================== ENGINES ==================
+class CloudEngine:
+    """Jira Cloud REST v3 (email + API token). The session may be shared by many users."""
+
+    def __init__(self, session: requests.Session, base_url: str, email: str, api_token: str):
+        self.session = session
+        self.base_url = base_url
+        self.email = email
+        self.api_token = api_token
+        self.last_retries = 0
+        self.last_worklog_id = None
+
+    def open(self):
+        ok, info = jira_get_myself(self.session, self.base_url, self.email, self.api_token)
+        if not ok:
+            if info.startswith(("/myself status 401", "/myself status 403")):
+                raise AuthError(f"Prihlásenie zlyhalo: {info}")
+            raise RunError(f"Prihlásenie zlyhalo: {info}")
+
+    def resolve(self, tickets: List[dict]) -> List[dict]:
+        try:
+            found, missing = jira_resolve_issues(self.session, self.base_url, self.email, self.api_token,
+                                                 [t["issue"] for t in tickets])
+        except RuntimeError as e:
+            raise RunError(f"Tikety sa nepodarilo overiť: {e}")
+        if missing:
+            raise RunError(f"Issue {', '.join(missing)} neexistuje alebo nemáš prístup.")
+        return [{"issue": found[t["issue"]][0], "weight": t["weight"], "summary": found[t["issue"]][1]}
+                for t in tickets]
+
+    def logged_minutes(self, start: dt.date, end: dt.date) -> dict:
+        ok, logged, info = jira_fetch_logged_minutes(self.session, self.base_url, self.email, self.api_token, start, end)
+        if not ok:
+            raise RunError(f"Nepodarilo sa načítať existujúce worklogy: {info}")
+        return logged
+
+    def submit(self, day: dt.date, issue: str, minutes: int) -> Tuple[bool, str]:
+        self.last_retries = 0
+        self.last_worklog_id = None
+        return log_work_cloud(
+            session=self.session, base_url=self.base_url,
+            email=self.email, api_token=self.api_token,
+            issue_key=issue, started_iso_tz=local_iso_with_tz(day, hour=16, minute=0),
+            seconds=int(minutes * 60), comment=None,
+            hooks={"response": self._note_response},
+        )
+
+    @staticmethod
+    def failure_scope(err: str) -> Optional[str]:
+        """What a failed submit says about the rest of the run: "all" (auth), "issue", "offline"
+        (Jira not reachable, the request never got there) or None (transient)."""
+        if (err or "").startswith("offline: "):
+            return "offline"  # see request_never_sent: only errors before anything was sent
+        m = re.match(r"HTTP (\d{3})", err or "")
+        status = int(m.group(1)) if m else None
+        if status == 401:
+            return "all"
+        if status in (400, 403, 404):
+            return "issue"
+        return None  # 429 / 5xx / network errors were already retried by the session
+
+    @staticmethod
+    def rejected(err: str) -> bool:
+        """Jira answered and refused this worklog for good (bad issue, no permission)."""
+        return bool(re.match(r"HTTP (400|403|404)\b", err or ""))
+
+    def _note_response(self, resp, *args, **kwargs):
+        self.last_retries = response_retries(resp)
+        if resp.status_code == 201:  # the created worklog; its id is what "undo run" deletes
+            try:
+                self.last_worklog_id = str(resp.json()["id"])
+            except Exception:
+                self.last_worklog_id = None
+
+    def close(self):
+        pass  # the session stays warm for the next run
+
+
+class SeleniumEngine:
+    """Jira Server through the browser form (username + password); reads via REST."""
+
+    def __init__(self, base_url: str, username: str, password: str, headless: bool = False,
+                 session: requests.Session = None):
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.headless = headless
+        self.session = session or build_session()  # REST reads; shared sessions keep their connections warm
+        self.driver = None
+        self.wait = None
+        self.last_retries = 0  # the browser form has no retry layer
+        self.last_worklog_id = None  # the form does not tell; undo looks the worklog up over REST
+
+    def open(self):
+        # the browser starts lazily (nothing to submit -> no browser at all); a wrong password
+        # is caught here over REST instead of after starting Chrome
+        try:
+            r = self.session.get(f"{self.base_url}/rest/api/2/myself", auth=(self.username, self.password), timeout=15)
+        except Exception as e:
+            log_exc("SeleniumEngine.open", e)
+            return  # the browser login decides
+        if r.status_code == 401:
+            raise AuthError("Nesprávne meno alebo heslo do Jira.")
+
+    def ensure_driver(self):
+        """Start Chrome and log in on first use; returns the driver."""
+        if self.driver is not None:
+            return self.driver
+        if webdriver is None:
+            raise RunError("Chýba Selenium (pip install selenium).")
+        options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument("--headless=new")
+        self.driver = webdriver.Chrome(options=options)
+        self.wait = WebDriverWait(self.driver, 15)
+
+        with TRACER.span("GET", "selenium:/login"):
+            self.driver.get(self.base_url)
+            self.wait.until(EC.presence_of_element_located((By.ID, "login-form-username"))).send_keys(self.username)
+        self.driver.find_element(By.ID, "login-form-password").send_keys(self.password)
+        with TRACER.span("POST", "selenium:/login"):
+            self.driver.find_element(By.ID, "login").click()
+
+        # Check for a possible error message
+        try:
+            err = WebDriverWait(self.driver, 5).until(
+                EC.presence_of_element_located((By.ID, "login-error-message"))
+            )
+        except Exception:
+            err = None
+        if err is not None and err.is_displayed():
+            raise AuthError("Nesprávne meno alebo heslo do Jira.")
+        return self.driver
+
+    def resolve(self, tickets: List[dict]) -> List[dict]:
+        return list(tickets)
+
+    def logged_minutes(self, start: dt.date, end: dt.date) -> dict:
+        try:
+            return server_fetch_logged_minutes(self.base_url, self.username, self.password, start, end, self.session)
+        except Exception as e:
+            raise RunError(f"Nepodarilo sa načítať existujúce worklogy: {e}")
+
+    def submit(self, day: dt.date, issue: str, minutes: int) -> Tuple[bool, str]:
+        self.ensure_driver()
+        try:
+            with TRACER.span("GET", "selenium:/secure/CreateWorklog!default.jspa"):
+                self.driver.get(f"{self.base_url}/secure/CreateWorklog!default.jspa?id={issue}")
+                time_spent_input = self.wait.until(
+                    EC.presence_of_element_located((By.ID, "log-work-time-logged"))
+                )
+            time_spent_input.clear()
+            time_spent_input.send_keys(minutes_to_jira_time(minutes))
+
+            date_picker = self.wait.until(
+                EC.presence_of_element_located((By.ID, "log-work-date-logged-date-picker"))
+            )
+            date_picker.clear()
+            date_picker.send_keys(f"{format_jira_date(day)} 04:00 PM")
+
+            with TRACER.span("POST", "selenium:/secure/CreateWorklog.jspa"):
+                self.driver.find_element(By.ID, "log-work-submit").click()
+            return True, ""
+        except Exception as e:
+            return False, str(e)
+
+    @staticmethod
+    def failure_scope(err: str) -> Optional[str]:
+        # a form that did not show up (no permission, wrong id) costs a full wait every day
+        return "offline" if "net::ERR_" in (err or "") else "issue"
+
+    @staticmethod
+    def rejected(err: str) -> bool:
+        # a missing form may just be a slow server (WebDriverWait timeout): never a definite "no"
+        return False
+
+    def close(self):
+        try:
+            if self.driver is not None:
+                self.driver.quit()
+        except Exception:
+            pass
+        self.driver = None
+
+# ================== WARM-UP ==================
+class Warmup:
+    """Prefetch for the run the user is about to start, while they are still editing.
+
+    One background thread validates auth (engine.open, which also opens pooled TLS
+    connections of a shared session), resolves the tickets and reads the logged minutes
+    of the range. Results are keyed by account + inputs and used once by run_logging when
+    they still match and are younger than `ttl`; anything else is fetched by the run itself.
+
+    Logged minutes are cached per account and day, so a range that overlaps what was
+    already read only fetches the missing days; `on_logged(start, end, logged, error)` gets
+    them – or logged=None and the error when they could not be read – on the worker thread,
+    unless a newer request or cancel() superseded the request. Resolve and the logged time are
+    independent steps; credentials Jira refused (AuthError) stop the warm-up for that
+    account + secret, without another login attempt, until they change.
+    """
+
+    def __init__(self, ttl: float = WARMUP_TTL_S,
+                 on_logged: Optional[Callable[[dt.date, dt.date, Optional[dict], Optional[str]], None]] = None):
+        self.ttl = ttl
+        self.on_logged = on_logged
+        self._lock = threading.Lock()
+        self._results: Dict[tuple, Tuple[float, object]] = {}
+        self._days: Dict[tuple, Dict[dt.date, Tuple[float, int]]] = {}  # account -> day -> (fetched at, minutes)
+        self._bad_auth: Dict[tuple, str] = {}  # account + secret hash -> why Jira refused it
+        self._generation = 0
+        self._wanted = None
+        self._busy = False
+
+    @staticmethod
+    def key(engine, *parts) -> tuple:
+        secret = getattr(engine, "api_token", None) or getattr(engine, "password", "")
+        return engine_account(engine) + (hash(secret),) + parts
+
+    @staticmethod
+    def tickets_key(tickets: List[dict]) -> tuple:
+        return tuple((str(t["issue"]), t["weight"]) for t in tickets)
+
+    def request(self, engine, tickets: List[dict], start: dt.date, end: dt.date, fill_gaps: bool = True):
+        """Warm up for these inputs; cheap to call on every edit (the newest request wins)."""
+        with self._lock:
+            self._generation += 1
+            self._wanted = (engine, list(tickets), start, end, fill_gaps)
+            if self._busy:
+                return
+            self._busy = True
+        threading.Thread(target=self._work, daemon=True).start()
+
+    def cancel(self):
+        """Drop the pending request; the one in flight stops after its current step, unreported."""
+        with self._lock:
+            self._generation += 1
+            self._wanted = None
+
+    def logged(self, engine, start: dt.date, end: dt.date) -> Optional[dict]:
+        """Logged minutes per day of [start, end] from the day cache, or None unless every day is fresh."""
+        now = time.monotonic()
+        logged = {}
+        with self._lock:
+            days = self._days.get(self.key(engine), {})
+            for i in range((end - start).days + 1):
+                day = start + dt.timedelta(days=i)
+                if day not in days or now - days[day][0] > self.ttl:
+                    return None
+                if days[day][1]:
+                    logged[day] = days[day][1]
+        return logged
+
+    def forget(self, engine=None):
+        """Drop cached logged time of `engine`'s account (all accounts without one): a run or undo changed it."""
+        with self._lock:
+            if engine is None:
+                self._days.clear()
+            else:
+                self._days.pop(self.key(engine), None)
+
+    def refused(self, engine) -> Optional[str]:
+        """Why Jira refused `engine`'s current credentials, or None (not refused / not tried)."""
+        with self._lock:
+            return self._bad_auth.get(self.key(engine))
+
+    def refuse(self, engine, reason: str):
+        """Remember refused credentials; nothing logs in with them again until they change."""
+        with self._lock:
+            self._bad_auth[self.key(engine)] = reason
+
+    def take(self, key: tuple):
+        """The prefetched value for `key` (consumed), or None when missing or stale."""
+        with self._lock:
+            hit = self._results.pop(key, None)
+        if hit is None or time.monotonic() - hit[0] > self.ttl:
+            return None
+        return hit[1]
+
+    def _work(self):
+        while True:
+            with self._lock:
+                job, self._wanted = self._wanted, None
+                if job is None:
+                    self._busy = False
+                    return
+                generation = self._generation
+            engine, tickets, start, end, fill_gaps = job
+
+            def current():
+                return self._generation == generation
+
+            # refused credentials are not tried again until they change: every failed login
+            # counts towards Jira's CAPTCHA, which then also blocks the browser login
+            refused = self.refused(engine)
+            if refused is None and current():
+                try:
+                    self._fetch(self.key(engine, "open"), lambda: engine.open() or True)
+                except AuthError as e:
+                    refused = str(e)
+                    self.refuse(engine, refused)
+                except Exception as e:
+                    log_exc("warmup open", e)
+            if refused is not None:
+                if self.on_logged is not None and start and end and current():
+                    self.on_logged(start, end, None, refused)
+                continue
+
+            # every other step on its own: a ticket that does not resolve must not hide the logged time
+            if tickets:
+                self._step("resolve", current, lambda: self._fetch(
+                    self.key(engine, "resolve", self.tickets_key(tickets)), lambda: engine.resolve(tickets)))
+            if start and end and start <= end and current():
+                try:
+                    logged, error = self._fetch_logged(engine, start, end), None
+                except Exception as e:
+                    log_exc("warmup logged", e)
+                    logged, error = None, str(e)
+                if self.on_logged is not None and current():
+                    self.on_logged(start, end, logged, error)
+
+    @staticmethod
+    def _step(name: str, current: Callable[[], bool], fn: Callable[[], object]):
+        if not current():
+            return
+        try:
+            fn()
+        except Exception as e:
+            log_exc(f"warmup {name}", e)  # not fatal: the run fetches (and reports) it again
+
+    def _fetch(self, key: tuple, fn: Callable[[], object]):
+        with self._lock:
+            hit = self._results.get(key)
+        if hit is not None and time.monotonic() - hit[0] <= self.ttl:
+            return
+        value = fn()
+        with self._lock:
+            self._results[key] = (time.monotonic(), value)
+
+    def _fetch_logged(self, engine, start: dt.date, end: dt.date) -> dict:
+        """Read only the span of days in [start, end] that is not cached yet (or went stale)."""
+        span = [start + dt.timedelta(days=i) for i in range((end - start).days + 1)]
+        now = time.monotonic()
+        with self._lock:
+            days = self._days.get(self.key(engine), {})
+            missing = [d for d in span if d not in days or now - days[d][0] > self.ttl]
+        if missing:
+            fetched = engine.logged_minutes(missing[0], missing[-1])
+            now = time.monotonic()
+            with self._lock:
+                days = self._days.setdefault(self.key(engine), {})
+                for i in range((missing[-1] - missing[0]).days + 1):
+                    day = missing[0] + dt.timedelta(days=i)
+                    days[day] = (now, fetched.get(day, 0))
+        with self._lock:
+            days = self._days.get(self.key(engine), {})
+            return {d: days[d][1] for d in span if d in days and days[d][1]}
+
+
+# ================== RUN ==================
+class RunControl:
+    """Cancel / pause switch shared by a GUI and its worker; checked before every submit.
+
+    The request in flight always finishes (its outcome is recorded); nothing new is sent
+    after cancel(), and pause() holds the loop until resume() or cancel().
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._go = threading.Event()
+        self._go.set()
+
+    def pause(self):
+        self._go.clear()
+
+    def resume(self):
+        self._go.set()
+
+    def cancel(self):
+        self._cancelled.set()
+        self._go.set()  # wake a paused loop so it can stop
+
+    @property
+    def paused(self) -> bool:
+        return not self._go.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def wait_turn(self, on_pause: Callable[[], None] = None) -> bool:
+        """Block while paused; False once cancelled."""
+        if self.paused and on_pause:
+            on_pause()
+        self._go.wait()
+        return not self.cancelled
+
+
+class CircuitBreaker:
+    """Stops submitting after a hard failure: for that issue, or for the whole run (auth).
+
+    Also aggregates every failure per issue for one report at the end of the run.
+    """
+
+    def __init__(self):
+        self.tripped: Dict[str, str] = {}      # issue -> first hard error
+        self.all_error: Optional[str] = None   # set once the whole run is doomed
+        self.errors: Dict[str, dict] = {}      # issue -> {"error", "failed", "skipped"}
+
+    def blocked(self, issue: str) -> Optional[str]:
+        return self.all_error or self.tripped.get(issue)
+
+    def failed(self, issue: str, err: str, scope: Optional[str]):
+        report = self.errors.setdefault(issue, {"error": err, "failed": 0, "skipped": 0})
+        report["failed"] += 1
+        if scope in ("all", "offline"):
+            self.all_error = err
+        elif scope == "issue":
+            self.tripped.setdefault(issue, err)
+
+    def skipped(self, issue: str, reason: str):
+        self.errors.setdefault(issue, {"error": reason, "failed": 0, "skipped": 0})["skipped"] += 1
+
+
+def format_error_report(errors: Dict[str, dict], limit: int = 20) -> str:
+    """One line per failed issue: first error, failed and skipped entry counts."""
+    lines = []
+    for issue, r in list(errors.items())[:limit]:
+        counts = ", ".join(f"{n}× {what}" for n, what in ((r["failed"], "zlyhalo"), (r["skipped"], "preskočené")) if n)
+        lines.append(f"{issue}: {r['error'][:200]} ({counts})")
+    if len(errors) > limit:
+        lines.append(f"… a ďalších {len(errors) - limit} tiketov")
+    return "\n".join(lines)
+
+def run_logging(engine, tickets: List[dict], start: dt.date, end: dt.date,
+                skip_weekends=True, skip_holidays=True, fill_gaps=True, randomize_k=0,
+                dry_run=False, on_status: Callable[[str], None] = print,
+                on_error: Callable[[dict, str], None] = None,
+                on_plan: Callable[[List[dict]], None] = None,
+                on_entry: Callable[[int, dict], None] = None,
+                journal: Optional[str] = RUNS_PATH, control: RunControl = None,
+                resume: dict = None, warm: Warmup = None, outbox: Optional[str] = OUTBOX_PATH) -> dict:
+    """Plan and submit worklogs for [start, end] through `engine` (opened here, closed by the caller).
+
+    `on_plan` receives the planned entries once; `on_entry(i, entry)` follows every state
+    change of entry i (state pending/running/ok/failed/dry/skipped, latency in seconds, retries, error).
+    After a hard failure (engine.failure_scope) the remaining entries of that issue – or of the
+    whole run on auth errors – are skipped; `on_error(entry, err)` still sees every failure.
+    Created worklogs are recorded in `journal` (None = not recorded) so the run can be undone.
+    `control` (RunControl) pauses or cancels between two submits; a cancelled run keeps its
+    unsent entries in the journal and `resume=<journal run>` sends exactly those (no replanning,
+    tickets/start/end are then ignored). With `warm`, matching fresh prefetched auth / tickets /
+    logged minutes replace the calls the run would otherwise start with.
+    When Jira stops answering mid-run, the failed entry and everything not sent yet go to the
+    `outbox` (state "queued", see flush_outbox) instead of failing one by one; minutes already
+    queued there count as logged when planning. Without an outbox the rest is skipped.
+    Returns stats: planned / ok / failed / skipped / queued / days / full_days / overtime_days, errors
+    ({issue: {"error", "failed", "skipped"}}, see format_error_report), cancelled and run_id when recorded.
+    Raises RunError when the run cannot proceed at all.
+    """
+    stats = {"planned": 0, "ok": 0, "failed": 0, "skipped": 0, "queued": 0, "days": 0, "full_days": 0,
+             "overtime_days": 0, "errors": {}, "cancelled": False}
+    if resume is not None:
+        plan = run_entries(resume, "pending")
+        stats["days"] = len({e["day"] for e in plan})
+        engine.open()
+    else:
+        days = working_days(start, end, skip_weekends, skip_holidays)
+        stats["days"] = len(days)
+        if not days:
+            on_status("Žiadne pracovné dni v zadanom rozsahu.")
+            return stats
+        def prefetched(*key):
+            return warm.take(Warmup.key(engine, *key)) if warm is not None else None
+
+        if prefetched("open") is None:
+            engine.open()
+        tickets = prefetched("resolve", Warmup.tickets_key(tickets)) or engine.resolve(tickets)
+        logged = (warm.logged(engine, start, end) if warm is not None else None) if fill_gaps else {}
+        if logged is None:
+            logged = engine.logged_minutes(start, end)
+        if fill_gaps and outbox:
+            logged = dict(logged)
+            for day, minutes in outbox_minutes(engine, start, end, outbox).items():
+                logged[day] = logged.get(day, 0) + minutes
+        plan, plan_stats = plan_worklogs(tickets, days, logged, randomize_k)
+        stats.update(plan_stats)
+    stats["planned"] = len(plan)
+    for entry in plan:
+        entry.update(state="pending", latency=None, retries=0, error="")
+    if on_plan:
+        on_plan(plan)
+
+    try:
+        _submit_plan(engine, plan, stats, dry_run, on_status, on_error, on_entry, control, outbox)
+    finally:
+        if warm is not None and stats["ok"]:
+            warm.forget(engine)  # the cached logged time of this account is out of date now
+        if journal and not dry_run:
+            stats["run_id"] = record_run(engine, plan, journal, resume["id"] if resume else None)
+    return stats
+
+def _submit_plan(engine, plan, stats, dry_run, on_status, on_error, on_entry, control, outbox=None):
+    breaker = CircuitBreaker()
+    stats["errors"] = breaker.errors
+    scope_of = getattr(engine, "failure_scope", lambda err: None)
+    for i, entry in enumerate(plan):
+        if control is not None and not control.wait_turn(lambda: on_status("⏸ Pozastavené.")):
+            stats["cancelled"] = True
+            on_status(f"⏹ Zrušené – odoslaných {stats['ok'] + stats['failed']}, neodoslaných {len(plan) - i}.")
+            return
+        day_str = entry["day"].strftime("%d.%m.%Y")
+        time_str = minutes_to_jira_time(entry["minutes"])
+        reason = breaker.blocked(entry["issue"])
+        if reason:
+            entry.update(state="skipped", error=f"preskočené po chybe: {reason}")
+            breaker.skipped(entry["issue"], reason)
+            stats["skipped"] += 1
+            if on_entry:
+                on_entry(i, entry)
+            continue
+        if dry_run:
+            entry["state"] = "dry"
+            if on_entry:
+                on_entry(i, entry)
+            on_status(f"· {day_str} – {entry['issue']}: {time_str}")
+            continue
+        entry["state"] = "running"
+        if on_entry:
+            on_entry(i, entry)
+        t0 = time.perf_counter()
+        ok, err = engine.submit(entry["day"], entry["issue"], entry["minutes"])
+        if not ok and outbox and scope_of(err) == "offline" and _queue_rest(engine, plan, i, err, stats, outbox,
+                                                                           on_status, on_entry):
+            return
+        entry.update(state="ok" if ok else "failed", latency=time.perf_counter() - t0,
+                     retries=getattr(engine, "last_retries", 0), error=err,
+                     worklog_id=getattr(engine, "last_worklog_id", None) if ok else None)
+        if on_entry:
+            on_entry(i, entry)
+        if ok:
+            stats["ok"] += 1
+            on_status(f"✔ {day_str} – {entry['issue']}: {time_str}")
+        else:
+            stats["failed"] += 1
+            on_status(f"✖ {day_str} – {entry['issue']}: {err}")
+            log_text(f"Worklog error {entry['issue']} {day_str}: {err}")
+            scope = scope_of(err)
+            breaker.failed(entry["issue"], err, scope)
+            if scope == "all":
+                on_status("⛔ Chyba prihlásenia – zvyšok behu preskakujem.")
+            elif scope == "offline":
+                on_status("⛔ Jira je nedostupná – zvyšok behu preskakujem.")
+            elif scope == "issue":
+                on_status(f"⛔ {entry['issue']}: ďalšie dni tohto tiketu preskakujem.")
+            if on_error:
+                on_error(entry, err)
+
+def _queue_rest(engine, plan, i, err, stats, outbox, on_status, on_entry) -> bool:
+    """Jira went away at entry i: move it and every unsent entry to the outbox (False if that failed)."""
+    rest = [j for j in range(i, len(plan)) if plan[j]["state"] in ("pending", "running")]
+    if not enqueue_outbox(engine, [plan[j] for j in rest], outbox, err):
+        return False
+    for j in rest:
+        plan[j].update(state="queued", error="čaká vo fronte (Jira nedostupná)")
+        if on_entry:
+            on_entry(j, plan[j])
+    stats["queued"] = len(rest)
+    log_text(f"Jira unreachable ({err}), {len(rest)} worklogs queued in {outbox}")
+    on_status(f"📤 Jira je nedostupná – {len(rest)} worklogov čaká vo fronte, odošlú sa po obnovení spojenia.")
+    return True
+
+# ================== RUN JOURNAL & UNDO ==================
+# [{"id": "2025-10-07T16:05:12", "engine": "cloud", "base_url": "...", "user": "jan@firma.sk",
+#   "created": [{"issue": "SINT-1", "day": "2025-10-06", "minutes": 240, "worklog_id": "10412"}]}]
+def load_runs(path: str = RUNS_PATH) -> List[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return []
+
+def save_runs(runs: List[dict], path: str = RUNS_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(runs[-RUNS_KEEP:], f, ensure_ascii=False)
+
+def engine_account(engine) -> Tuple[str, str, str]:
+    """(engine kind, base_url, user) identifying whose worklogs a run created."""
+    if isinstance(engine, CloudEngine):
+        return "cloud", engine.base_url, engine.email
+    return "server", engine.base_url, getattr(engine, "username", "")
+
+def record_run(engine, plan: List[dict], path: str = RUNS_PATH, run_id: str = None) -> Optional[str]:
+    """Journal what a run created and what it never sent (cancelled); returns the run id.
+
+    With `run_id` (a resumed run) the new worklogs are added to that record and its pending
+    list is replaced.
+    """
+    kind, base_url, user = engine_account(engine)
+    created = [{"issue": e["issue"], "day": e["day"].isoformat(), "minutes": e["minutes"],
+                "worklog_id": e.get("worklog_id")} for e in plan if e.get("state") == "ok"]
+    pending = [{"issue": e["issue"], "day": e["day"].isoformat(), "minutes": e["minutes"]}
+               for e in plan if e.get("state") == "pending"]
+    try:
+        runs = load_runs(path)
+        run = next((r for r in runs if run_id and r.get("id") == run_id), None)
+        if run is None:
+            if not created and not pending:
+                return None
+            run = {"id": dt.datetime.now().isoformat(timespec="seconds"), "engine": kind, "base_url": base_url,
+                   "user": user, "created": []}
+            runs.append(run)
+        run["created"] = run.get("created", []) + created
+        run["pending"] = pending
+        save_runs(runs, path)
+    except Exception as e:
+        log_exc("record_run", e)
+        return None
+    return run["id"]
+
+def last_run(kind: str, base_url: str, user: str, path: str = RUNS_PATH, field: str = "created") -> Optional[dict]:
+    """Newest recorded run of this account that still has worklogs to undo
+    (field="created") or unsent entries to resume (field="pending")."""
+    for run in reversed(load_runs(path)):
+        if (run.get("engine"), run.get("base_url"), (run.get("user") or "").lower()) == (kind, base_url, user.lower()) \
+                and run.get(field):
+            return run
+    return None
+
+def drop_pending(run_id: str, path: str = RUNS_PATH):
+    """Forget a cancelled run's unsent entries (the user planned anew instead of resuming)."""
+    runs = load_runs(path)
+    for run in runs:
+        if run.get("id") == run_id:
+            run["pending"] = []
+    save_runs([r for r in runs if r.get("created") or r.get("pending")], path)
+
+def update_run(run_id: str, remaining: List[dict], path: str = RUNS_PATH):
+    """Keep only the worklogs an undo could not delete; the run disappears once none are left."""
+    runs = []
+    for run in load_runs(path):
+        if run.get("id") == run_id:
+            if not remaining and not run.get("pending"):
+                continue
+            run = dict(run, created=[{"issue": e["issue"], "day": str(e["day"]), "minutes": e["minutes"],
+                                      "worklog_id": e.get("worklog_id")} for e in remaining])
+        runs.append(run)
+    save_runs(runs, path)
+
+def run_entries(run: dict, field: str = "created") -> List[dict]:
+    """The run's created (for undo_run) or pending (to resume) worklogs as progress entries."""
+    return [dict(e, day=dt.date.fromisoformat(e["day"]), state="pending", latency=None, retries=0, error="")
+            for e in run.get(field, [])]
+
+def server_find_worklog_ids(session: requests.Session, base_url: str, username: str, password: str,
+                            entries: List[dict]):
+    """Fill in `worklog_id` of browser-created entries: my worklog on that issue, day 16:00 and duration."""
+    by_issue = {}
+    for e in entries:
+        if not e.get("worklog_id"):
+            by_issue.setdefault(e["issue"], []).append(e)
+    for issue, wanted in by_issue.items():
+        r = session.get(f"{base_url}/rest/api/2/issue/{issue}/worklog", auth=(username, password), timeout=30)
+        if r.status_code != 200:
+            continue
+        candidates = sorted((wl for wl in r.json().get("worklogs", [])
+                             if (wl.get("author") or {}).get("name", "").lower() == username.lower()
+                             and wl.get("started", "")[11:16] == "16:00"),
+                            key=lambda wl: int(wl["id"]), reverse=True)  # newest first: this run's
+        for e in wanted:
+            for wl in candidates:
+                if wl["started"][:10] == str(e["day"])[:10] and int(wl.get("timeSpentSeconds", 0)) == e["minutes"] * 60:
+                    e["worklog_id"] = str(wl["id"])
+                    candidates.remove(wl)
+                    break
+
+def undo_run(run: dict, secret: str, entries: List[dict] = None, session: requests.Session = None,
+             workers: int = UNDO_WORKERS, on_entry: Callable[[int, dict], None] = None,
+             control: RunControl = None) -> List[dict]:
+    """Delete the worklogs a recorded run created, `workers` DELETEs at a time.
+
+    `entries` default to the run's "created" list; each gets state ok/failed, latency and error
+    (an already deleted worklog counts as ok) and is reported via `on_entry(i, entry)` as it
+    finishes. After `control` is cancelled no new DELETE starts; the rest end as skipped.
+    Returns the entries that could not be deleted (skipped ones included).
+    """
+    entries = entries if entries is not None else [dict(e) for e in run["created"]]
+    s = session or build_session()
+    user, base_url = run["user"], run["base_url"]
+    api = "3" if run.get("engine") == "cloud" else "2"
+    if api == "2":
+        server_find_worklog_ids(s, base_url, user, secret, entries)
+
+    def delete(entry):
+        if control is not None and control.cancelled:
+            return None, "zrušené"
+        if not entry.get("worklog_id"):
+            return False, "worklog sa nenašiel"
+        try:
+            r = s.delete(f"{base_url}/rest/api/{api}/issue/{entry['issue']}/worklog/{entry['worklog_id']}",
+                         auth=(user, secret), timeout=20)
+        except Exception as e:
+            return False, f"request error: {e!r}"
+        if r.status_code in (204, 404):
+            return True, ""
+        return False, f"HTTP {r.status_code}: {r.text[:300]}"
+
+    def timed(entry):
+        t0 = time.perf_counter()
+        ok, err = delete(entry)
+        return ok, err, time.perf_counter() - t0
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        timed = TRACER.carry(timed)  # the DELETEs count in the caller's run
+        futures = {pool.submit(timed, e): i for i, e in enumerate(entries)}
+        for fut in as_completed(futures):
+            i = futures[fut]
+            ok, err, latency = fut.result()
+            state = "ok" if ok else "skipped" if ok is None else "failed"
+            entries[i].update(state=state, latency=latency, retries=0, error=err)
+            if not ok:
+                failed.append(entries[i])
+            if ok is False:
+                log_text(f"Undo error {entries[i]['issue']} {entries[i]['day']}: {err}")
+            if on_entry:
+                on_entry(i, entries[i])
+    return failed
+
+# ================== OUTBOX (offline queue) ==================
+# [{"id": "1760000000000000000-0", "engine": "cloud", "base_url": "...", "user": "jan@firma.sk",
+#   "issue": "SINT-1", "day": "2025-10-06", "minutes": 240, "queued": "2025-10-07T16:05:12", "error": "..."}]
+_OUTBOX_LOCK = threading.Lock()  # one read-modify-write of the file at a time
+_FLUSH_LOCK = threading.Lock()   # one flush at a time (GUI timer vs. runner)
+
+def load_outbox(path: str = OUTBOX_PATH) -> List[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return []
+
+def save_outbox(items: List[dict], path: str = OUTBOX_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(items, f, ensure_ascii=False)
+
+def enqueue_outbox(engine, entries: List[dict], path: str = OUTBOX_PATH, error: str = "") -> int:
+    """Queue planned worklogs of `engine`'s account for a later flush_outbox; returns how many."""
+    kind, base_url, user = engine_account(engine)
+    stamp, prefix = dt.datetime.now().isoformat(timespec="seconds"), time.time_ns()
+    items = [{"id": f"{prefix}-{i}", "engine": kind, "base_url": base_url, "user": user, "issue": e["issue"],
+              "day": e["day"].isoformat(), "minutes": e["minutes"], "queued": stamp, "error": error}
+             for i, e in enumerate(entries)]
+    try:
+        with _OUTBOX_LOCK:
+            save_outbox(load_outbox(path) + items, path)
+    except Exception as e:
+        log_exc("enqueue_outbox", e)
+        return 0
+    return len(items)
+
+def outbox_entries(engine, path: str = OUTBOX_PATH) -> List[dict]:
+    """Queued worklogs of `engine`'s account (day as a date)."""
+    kind, base_url, user = engine_account(engine)
+    return [dict(e, day=dt.date.fromisoformat(e["day"])) for e in load_outbox(path)
+            if (e.get("engine"), e.get("base_url"), (e.get("user") or "").lower()) == (kind, base_url, user.lower())]
+
+def outbox_minutes(engine, start: dt.date, end: dt.date, path: str = OUTBOX_PATH) -> dict:
+    """Queued minutes per day in [start, end]; planning counts them as logged."""
+    minutes = {}
+    for e in outbox_entries(engine, path):
+        if start <= e["day"] <= end:
+            minutes[e["day"]] = minutes.get(e["day"], 0) + e["minutes"]
+    return minutes
+
+def _drop_outbox(ids: set, path: str):
+    if ids:
+        with _OUTBOX_LOCK:
+            save_outbox([e for e in load_outbox(path) if e.get("id") not in ids], path)
+
+def jira_reachable(engine) -> bool:
+    """Cheap probe: does /myself answer at all? Sent without credentials (any status counts),
+    so probing never adds a failed login; auth is checked by engine.open."""
+    api = "3" if isinstance(engine, CloudEngine) else "2"
+    try:
+        engine.session.get(f"{engine.base_url}/rest/api/{api}/myself", timeout=10)
+        return True
+    except requests.RequestException:
+        return False
+
+def flush_outbox(engine, path: str = OUTBOX_PATH, batch: int = OUTBOX_BATCH, workers: int = OUTBOX_WORKERS,
+                 on_status: Callable[[str], None] = print, journal: Optional[str] = RUNS_PATH,
+                 control: RunControl = None) -> Tuple[int, int]:
+    """Send the queued worklogs of `engine`'s account once Jira answers again; returns (sent, left).
+
+    Rounds of `batch` entries, `workers` POSTs at a time (the browser engine: one); the file
+    is rewritten after every round, so nothing sent is queued twice. Jira becoming unreachable
+    again, or any failure that is not a definite rejection (timeouts, auth, server errors), ends
+    the flush and that entry waits for the next one with the rest; only an entry Jira refused
+    for good (engine.rejected) is dropped and reported. After `control` is cancelled no new
+    POST starts; what was sent is still dropped from the file and journaled. Sent worklogs
+    are journaled as one run, so "undo last run" can take them back.
+    """
+    if not _FLUSH_LOCK.acquire(blocking=False):
+        return 0, len(outbox_entries(engine, path))
+    try:
+        queued = outbox_entries(engine, path)
+        if not queued or not jira_reachable(engine):
+            return 0, len(queued)
+        engine.open()
+        parallel = isinstance(engine, CloudEngine)  # a copy per worker keeps last_worklog_id apart
+        idle = queue.Queue()
+        for _ in range(max(1, workers) if parallel else 1):
+            idle.put(copy.copy(engine) if parallel else engine)
+
+        def send(entry):
+            if control is not None and control.cancelled:
+                return None, "", None
+            eng = idle.get()
+            try:
+                ok, err = eng.submit(entry["day"], entry["issue"], entry["minutes"])
+                return ok, err, getattr(eng, "last_worklog_id", None) if ok else None
+            finally:
+                idle.put(eng)
+
+        send = TRACER.carry(send)  # the POSTs count in the caller's run
+        rejected = getattr(engine, "rejected", lambda err: False)
+        sent, stop = [], False
+        on_status(f"📤 Odosielam {len(queued)} worklogov z fronty…")
+        with ThreadPoolExecutor(max_workers=idle.qsize()) as pool:
+            for first in range(0, len(queued), max(1, batch)):
+                chunk = queued[first:first + max(1, batch)]
+                done = set()
+                for entry, (ok, err, worklog_id) in zip(chunk, pool.map(send, chunk)):
+                    day_str = entry["day"].strftime("%d.%m.%Y")
+                    if ok is None:  # cancelled before it was sent; stays queued
+                        stop = True
+                        continue
+                    if ok:
+                        done.add(entry["id"])
+                        sent.append(dict(entry, state="ok", worklog_id=worklog_id))
+                        continue
+                    log_text(f"Outbox error {entry['issue']} {day_str}: {err}")
+                    if rejected(err):
+                        done.add(entry["id"])
+                        on_status(f"✖ {day_str} – {entry['issue']}: {err} (vyradené z fronty)")
+                    else:
+                        stop = True
+                        on_status(f"⚠ {day_str} – {entry['issue']}: {err} (zostáva vo fronte)")
+                _drop_outbox(done, path)
+                if stop:
+                    break
+        if sent and journal:
+            record_run(engine, sent, journal)
+        left = len(outbox_entries(engine, path))
+        on_status(f"📤 Z fronty odoslaných {len(sent)}" + (f", čaká ešte {left}." if left else "."))
+        return len(sent), left
+    finally:
+        _FLUSH_LOCK.release()
+
+# ================== JOBS (config driven) ==================
+# {
+#   "schedule": {"at": "16:00", "weekdays_only": true},
+#   "parallel_jobs": 4,
+#   "jobs": [
+#     {"name": "jan", "engine": "cloud", "base_url": "https://xxx.atlassian.net", "email": "jan@firma.sk",
+#      "tickets": [{"issue": "SINT-1234", "weight": 2}], "range": "today", "fill_gaps": true},
+#     {"name": "eva", "engine": "server", "base_url": "https://jira.cargo-partner.com", "username": "eva",
+#      "tickets": [{"issue": "147331", "weight": 1}], "range": "this_week", "randomize_k": 2}
+#   ]
+# }
+# Secrets: "api_token" / "password" in the job, otherwise the GUIs' keyring entries.
+def load_runner_config(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def job_secret(job: dict) -> str:
+    if job.get("engine", "cloud") == "cloud":
+        field, service, user = "api_token", "jira_worklog_cloud", job.get("email", "")
+    else:
+        field, service, user = "password", "jira_worklog", job.get("username", "")
+    if job.get(field):
+        return job[field]
+    if keyring:
+        try:
+            return keyring.get_password(service, user) or ""
+        except Exception as e:
+            log_exc("job_secret(keyring)", e)
+    return ""
+
+def make_engine(job: dict, sessions: Dict[str, requests.Session]):
+    secret = job_secret(job)
+    cloud = job.get("engine", "cloud") == "cloud"
+    if not job.get("email" if cloud else "username") or not secret:
+        raise RunError("Chýba email alebo API token." if cloud else "Chýba používateľ alebo heslo.")
+    base_url = job["base_url"]
+    if base_url not in sessions:
+        sessions[base_url] = build_session()
+    if cloud:
+        return CloudEngine(sessions[base_url], base_url, job["email"], secret)
+    return SeleniumEngine(base_url, job["username"], secret, headless=job.get("headless", True),
+                          session=sessions[base_url])
+
+def run_job(job: dict, sessions: Dict[str, requests.Session], start=None, end=None, dry_run=False) -> dict:
+    name = job.get("name") or job.get("email") or job.get("username") or "?"
+    if start is None or end is None:
+        start, end = resolve_range(job.get("range", "today"))
+    tickets = [{"issue": extract_issue_key(str(t["issue"])).upper() if job.get("engine", "cloud") == "cloud" else str(t["issue"]),
+                "weight": max(0, int(t.get("weight", 1)))}
+               for t in job.get("tickets", []) if t.get("track", t.get("checked", 1))]
+    engine = make_engine(job, sessions)
+    try:
+        flush_outbox(engine, on_status=lambda line: print(f"[{name}] {line}", flush=True))
+        stats = run_logging(
+            engine, tickets, start, end,
+            skip_weekends=job.get("skip_weekends", True),
+            skip_holidays=job.get("skip_holidays", True),
+            fill_gaps=job.get("fill_gaps", True),
+            randomize_k=int(job.get("randomize_k", 0) or 0),
+            dry_run=dry_run,
+            on_status=lambda line: print(f"[{name}] {line}", flush=True),
+        )
+    finally:
+        engine.close()
+    log_text(f"runner job {name} {start}..{end}: {stats}")
+    if stats.get("errors"):
+        print(f"[{name}] Chyby:\n{format_error_report(stats['errors'])}", flush=True)
+    return stats
+
+def run_jobs(cfg: dict, sessions: Dict[str, requests.Session], only=None, start=None, end=None, dry_run=False,
+             trace_path: str = None, trace_format: str = None) -> int:
+    """Run all (or the named) jobs; returns the number of failed jobs.
+
+    Prints the per-endpoint latency summary afterwards and appends the spans to
+    `trace_path` (default: $JIRA_WORKLOG_TRACE) when set.
+    """
+    jobs = [j for j in cfg.get("jobs", []) if not only or j.get("name") in only]
+
+    def one(job):
+        try:
+            stats = run_job(job, sessions, start, end, dry_run)
+            return stats["failed"] == 0
+        except Exception as e:
+            log_exc(f"runner job {job.get('name')}", e)
+            print(f"[{job.get('name')}] Chyba: {e}", flush=True)
+            return False
+
+    scope = start_run()
+    with ThreadPoolExecutor(max_workers=max(1, int(cfg.get("parallel_jobs", 1)))) as pool:
+        results = list(pool.map(TRACER.carry(one), jobs))
+    summary = finish_run(path=trace_path, fmt=trace_format, scope=scope)
+    print(summary, flush=True)
+    log_text("runner trace summary\n" + summary)
+    return results.count(False)
+
+def next_run_at(now: dt.datetime, at: str = "16:00", weekdays_only=True) -> dt.datetime:
+    hh, mm = (int(x) for x in at.split(":"))
+    cand = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
+    if cand <= now:
+        cand += dt.timedelta(days=1)
+    while weekdays_only and (cand.weekday() >= 5 or cand.date() in SK_HOLIDAYS_2025):
+        cand += dt.timedelta(days=1)
+    return cand
+
+def daemon(config_path: str, only=None, dry_run=False, trace_path: str = None, trace_format: str = None):
+    """Long-running scheduler; the config is re-read before every run, sessions stay warm."""
+    sessions: Dict[str, requests.Session] = {}
+    while True:
+        sched = load_runner_config(config_path).get("schedule", {})
+        when = next_run_at(dt.datetime.now(), sched.get("at", "16:00"), sched.get("weekdays_only", True))
+        print(f"Ďalší beh: {when:%d.%m.%Y %H:%M}", flush=True)
+        while (left := (when - dt.datetime.now()).total_seconds()) > 0:
+            time.sleep(min(left, 60))
+        try:
+            run_jobs(load_runner_config(config_path), sessions, only, dry_run=dry_run,
+                     trace_path=trace_path, trace_format=trace_format)
+        except Exception as e:
+            log_exc("runner daemon", e)
+            print(f"Chyba behu: {e}", flush=True)
+
+# ================== CLI ==================
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Headless Jira worklog runner (8h/day split by weights).")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for name, text in (("run", "run the jobs once"), ("daemon", "run the jobs on the configured schedule")):
+        p = sub.add_parser(name, help=text)
+        p.add_argument("--config", default=RUNNER_CONFIG_PATH, help="jobs file (default: %(default)s)")
+        p.add_argument("--job", action="append", help="only this job name, repeatable")
+        p.add_argument("--dry-run", action="store_true", help="plan and print, submit nothing")
+        p.add_argument("--trace", metavar="PATH", help="append request spans to this file (default: $JIRA_WORKLOG_TRACE)")
+        p.add_argument("--trace-format", choices=("jsonl", "otel"), default=TRACE_FORMAT,
+                       help="trace file format (default: %(default)s)")
+        if name == "run":
+            p.add_argument("--from", dest="start", type=dt.date.fromisoformat, help="YYYY-MM-DD (overrides job range)")
+            p.add_argument("--to", dest="end", type=dt.date.fromisoformat, help="YYYY-MM-DD (overrides job range)")
+    args = ap.parse_args(argv)
+    if args.cmd == "run" and (args.start is None) != (args.end is None):
+        ap.error("--from and --to go together")
+    return args
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.cmd == "daemon":
+        daemon(args.config, args.job, args.dry_run, args.trace, args.trace_format)
+        return 0
+    failed = run_jobs(load_runner_config(args.config), {}, args.job, args.start, args.end, args.dry_run,
+                      args.trace, args.trace_format)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
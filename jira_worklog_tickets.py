@@ -0,0 +1,354 @@
+# jira_worklog_tickets.py
+# Ticket rows of both GUIs: a typed in-memory model is the source of truth and the
+# ttk.Treeview only mirrors it. Reads never go back to Tk, the checked count is kept
+# incrementally, and every change writes just the cells that differ (one Tk call each).
+# The tree is virtualized: only the rows that fit on screen exist as Treeview items, the
+# scrollbar drives a window over the (filtered) model, so hundreds of tickets cost the
+# same to show and scroll as ten. The selection lives in the model too (Ctrl-A, Shift- and
+# Ctrl-click cover rows outside the window); the tree only shows its part in the window.
+import itertools
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional
+
+CHECKED, UNCHECKED = "☑", "☐"
+FIELDS = ("checked", "issue", "summary", "weight")  # model field shown in Treeview column 1..4
+
+
+class Ticket:
+    __slots__ = ("issue", "weight", "summary", "checked", "iid")
+
+    def __init__(self, issue: str, weight: int = 1, summary: str = "", checked: bool = True):
+        self.issue = issue
+        self.weight = weight
+        self.summary = summary
+        self.checked = checked
+        self.iid: Optional[str] = None  # model id, also the Treeview item id while the row is shown
+
+    @classmethod
+    def from_config(cls, d: dict, checked_key: str = "checked", summary_key: str = "summary") -> "Ticket":
+        try:
+            weight = max(0, int(d.get("weight", 1)))
+        except (TypeError, ValueError):
+            weight = 1
+        return cls(str(d.get("issue", "")).strip(), weight, str(d.get(summary_key, "") or ""),
+                   bool(d.get(checked_key, True)))
+
+    def to_config(self, checked_key: str = "checked", summary_key: str = "summary", checked_as=int) -> dict:
+        return {checked_key: checked_as(self.checked), "issue": self.issue, summary_key: self.summary,
+                "weight": self.weight}
+
+    def cell(self, field: str) -> str:
+        if field == "checked":
+            return CHECKED if self.checked else UNCHECKED
+        return str(getattr(self, field))
+
+    def values(self) -> tuple:
+        return tuple(self.cell(f) for f in FIELDS)
+
+
+class TicketTable:
+    """Model-backed, virtualized Treeview. All methods must run on the Tk thread.
+
+    `columns` are the tree's column ids in FIELDS order. `yscrollcommand` is the
+    scrollbar's `set` (wire the scrollbar's command to `yview`), `on_visible` gets the
+    tickets that scrolled into view for the first time (e.g. to load their summaries) and
+    `on_change` is called after every add / remove / field change. Space toggles the
+    check mark of every selected row.
+    """
+
+    def __init__(self, tree, columns: Iterable[str], yscrollcommand: Optional[Callable] = None,
+                 on_visible: Optional[Callable[[List[Ticket]], None]] = None,
+                 on_change: Optional[Callable[[], None]] = None):
+        self.tree = tree
+        self.column_of = dict(zip(FIELDS, columns))
+        self.field_of = {c: f for f, c in self.column_of.items()}
+        self.rows: Dict[str, Ticket] = {}
+        self.order: List[str] = []
+        self.checked_count = 0
+        self._issues = Counter()
+        self._ids = itertools.count(1)
+
+        # view = filtered order, window = view[top:top + rows] materialized in the tree
+        self.view: List[str] = []
+        self.top = 0
+        self._filter = ""
+        self._shown: List[str] = []
+        self._seen = set()
+        self._row_height = 20
+        self._header_height = 24
+        self._render_pending = False
+        self.selected = set()  # selected iids, also the ones outside the window
+        self._anchor = None    # Shift-click ranges start here
+        self._pushed = set()   # tree selection as last set by us (see _on_tree_select)
+        self.yscrollcommand = yscrollcommand
+        self.on_visible = on_visible
+        self.on_change = on_change
+
+        tree.bind("<Configure>", lambda e: self._schedule_render(), add="+")
+        tree.bind("<MouseWheel>", lambda e: self.scroll(-3 if e.delta > 0 else 3) or "break")
+        tree.bind("<Button-4>", lambda e: self.scroll(-3) or "break")
+        tree.bind("<Button-5>", lambda e: self.scroll(3) or "break")
+        tree.bind("<Up>", lambda e: self._step_focus(-1))
+        tree.bind("<Down>", lambda e: self._step_focus(1))
+        tree.bind("<<TreeviewSelect>>", self._on_tree_select, add="+")
+        tree.bind("<Control-Button-1>", self._ctrl_click)
+        tree.bind("<Shift-Button-1>", self._shift_click)
+        tree.bind("<Control-a>", lambda e: self.select_all() or "break")
+        tree.bind("<Control-A>", lambda e: self.select_all() or "break")
+        tree.bind("<space>", lambda e: self.toggle_selected() or "break")
+
+    # ---------- reads (no Tk) ----------
+    def __len__(self):
+        return len(self.order)
+
+    def get(self, iid: str) -> Optional[Ticket]:
+        return self.rows.get(iid)
+
+    def tickets(self, only_checked: bool = False) -> List[Ticket]:
+        rows = (self.rows[iid] for iid in self.order)
+        return [t for t in rows if t.checked] if only_checked else list(rows)
+
+    @property
+    def all_checked(self) -> bool:
+        return self.checked_count == len(self.order)
+
+    def has_issue(self, issue: str) -> bool:
+        return self._issues[issue.upper()] > 0
+
+    def selection(self) -> List[str]:
+        """Selected iids in model order, including rows scrolled out of the window."""
+        return [iid for iid in self.order if iid in self.selected]
+
+    # ---------- writes ----------
+    def load(self, tickets: Iterable[Ticket]):
+        for t in tickets:
+            self.add(t)
+
+    def add(self, ticket: Ticket) -> str:
+        """Append to the model; the row shows up on the next render if it is in the window."""
+        ticket.iid = f"t{next(self._ids)}"
+        self.rows[ticket.iid] = ticket
+        self.order.append(ticket.iid)
+        self.checked_count += ticket.checked
+        self._issues[ticket.issue.upper()] += 1
+        if self._matches(ticket):
+            self.view.append(ticket.iid)
+            self._schedule_render()
+        self._changed()
+        return ticket.iid
+
+    def remove(self, iids: Iterable[str]):
+        gone = {iid for iid in iids if iid in self.rows}
+        if not gone:
+            return
+        for iid in gone:
+            t = self.rows.pop(iid)
+            self.checked_count -= t.checked
+            self._issues[t.issue.upper()] -= 1
+        self.order = [iid for iid in self.order if iid not in gone]
+        self.view = [iid for iid in self.view if iid not in gone]
+        self._seen -= gone
+        self.selected -= gone
+        self._schedule_render()
+        self._changed()
+
+    def update(self, iid: str, **changes):
+        """Set model fields; only the cells whose text changed are written to the tree."""
+        t = self.rows.get(iid)
+        if t is None:
+            return
+        changed = refilter = False
+        for field, value in changes.items():
+            if getattr(t, field) == value:
+                continue
+            changed = True
+            if field == "checked":
+                self.checked_count += 1 if value else -1
+            elif field == "issue":
+                self._issues[t.issue.upper()] -= 1
+                self._issues[value.upper()] += 1
+            setattr(t, field, value)
+            refilter = refilter or field in ("issue", "summary")
+            if iid in self._shown:
+                self.tree.set(iid, self.column_of[field], t.cell(field))
+        if refilter and self._filter:
+            self._refilter()  # the row may have started or stopped matching
+        if changed:
+            self._changed()
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
+
+    def toggle(self, iid: str):
+        t = self.rows.get(iid)
+        if t is not None:
+            self.update(iid, checked=not t.checked)
+
+    def set_all(self, checked: bool):
+        self.set_checked(self.order, checked)
+
+    def set_checked(self, iids: Iterable[str], checked: bool):
+        for iid in iids:
+            t = self.rows.get(iid)
+            if t is not None and t.checked != checked:
+                self.update(iid, checked=checked)
+
+    def toggle_selected(self):
+        """Check every selected row, or uncheck them all when they already are."""
+        iids = self.selection()
+        if iids:
+            self.set_checked(iids, not all(self.rows[iid].checked for iid in iids))
+
+    # ---------- selection ----------
+    def select_all(self):
+        """Select every row of the (filtered) view, not just the ones in the window."""
+        self.selected = set(self.view)
+        self._push_selection()
+
+    def _ctrl_click(self, event):
+        iid = self.tree.identify_row(event.y)
+        if iid:
+            self.selected ^= {iid}
+            self._anchor = iid
+            self.tree.focus(iid)
+            self._push_selection()
+        return "break"
+
+    def _shift_click(self, event):
+        iid = self.tree.identify_row(event.y)
+        if not iid:
+            return "break"
+        if self._anchor in self.view:
+            a, b = sorted((self.view.index(self._anchor), self.view.index(iid)))
+            self.selected = set(self.view[a:b + 1])
+        else:
+            self.selected, self._anchor = {iid}, iid
+        self.tree.focus(iid)
+        self._push_selection()
+        return "break"
+
+    def _push_selection(self):
+        """Show the window's part of the model selection in the tree."""
+        shown = [iid for iid in self._shown if iid in self.selected]
+        self._pushed = set(shown)
+        if set(self.tree.selection()) != self._pushed:
+            self.tree.selection_set(shown)
+
+    def _on_tree_select(self, _event=None):
+        # <<TreeviewSelect>> arrives later through the event queue, also for our own
+        # selection_set / deleted rows – only a selection we did not push is the user's
+        # (plain click, arrow keys), and it replaces the model selection
+        current = set(self.tree.selection())
+        if current == self._pushed:
+            return
+        self._pushed = current
+        self.selected = current
+        focus = self.tree.focus()
+        if focus in current:
+            self._anchor = focus
+
+    def sort(self, field: str, reverse: bool = False):
+        """Sort by a model field and reorder the tree in a single call."""
+        def key(iid):
+            value = getattr(self.rows[iid], field)
+            return value.lower() if isinstance(value, str) else int(value)
+
+        new_order = sorted(self.order, key=key, reverse=reverse)
+        if new_order != self.order:
+            self.order = new_order
+            self._refilter()
+
+    def set_filter(self, text: str):
+        """Show only tickets whose issue or summary contains `text` (case-insensitive)."""
+        text = text.strip().lower()
+        if text != self._filter:
+            self._filter = text
+            self.top = 0
+            self._refilter()
+
+    def _matches(self, t: Ticket) -> bool:
+        return not self._filter or self._filter in t.issue.lower() or self._filter in t.summary.lower()
+
+    def _refilter(self):
+        self.view = [iid for iid in self.order if self._matches(self.rows[iid])]
+        self.selected &= set(self.view)  # hidden rows must not be removed or toggled by accident
+        self.render()
+
+    # ---------- virtual scrolling ----------
+    def _window_rows(self) -> int:
+        """Rows that fit into the tree; measured from a shown row once the tree is mapped."""
+        if self._shown:
+            bbox = self.tree.bbox(self._shown[0])
+            if bbox:
+                self._header_height, self._row_height = bbox[1], bbox[3]
+        height = self.tree.winfo_height()
+        if height <= 1:  # not mapped yet
+            return int(self.tree.cget("height"))
+        return max((height - self._header_height) // self._row_height, 1)
+
+    def yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"|"pages")."""
+        rows = self._window_rows()
+        if args[0] == "moveto":
+            top = int(round(float(args[1]) * len(self.view)))
+        else:
+            step = int(args[1])
+            top = self.top + (step * rows if args[2].startswith("page") else step)
+        self._scroll_to(top, rows)
+
+    def scroll(self, rows: int):
+        self._scroll_to(self.top + rows, self._window_rows())
+
+    def _scroll_to(self, top: int, rows: int):
+        top = max(0, min(top, len(self.view) - rows))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def _step_focus(self, delta: int):
+        """Arrow keys past the first/last shown row scroll the window by one row."""
+        focus = self.tree.focus()
+        if focus not in self._shown:
+            return None
+        i = self._shown.index(focus) + delta
+        if 0 <= i < len(self._shown):
+            return None  # the Treeview moves within the window itself
+        self.scroll(delta)
+        pos = self.view.index(focus) + delta
+        if 0 <= pos < len(self.view) and self.view[pos] in self._shown:
+            self.tree.selection_set(self.view[pos])
+            self.tree.focus(self.view[pos])
+        return "break"
+
+    def _schedule_render(self):
+        if not self._render_pending:
+            self._render_pending = True
+            self.tree.after_idle(self.render)
+
+    def render(self):
+        """Make the tree hold exactly the rows of the current window, in order."""
+        self._render_pending = False
+        rows = self._window_rows()
+        self.top = max(0, min(self.top, len(self.view) - rows))
+        window = self.view[self.top:self.top + rows]
+        if window != self._shown:
+            keep = set(window)
+            gone = [iid for iid in self._shown if iid not in keep]
+            if gone:
+                self.tree.delete(*gone)
+            shown = set(self._shown)
+            for iid in window:
+                if iid not in shown:
+                    self.tree.insert("", "end", iid=iid, values=self.rows[iid].values())
+            self.tree.set_children("", *window)
+            self._shown = window
+            self._push_selection()
+        if self.yscrollcommand is not None:
+            n = len(self.view)
+            self.yscrollcommand(self.top / n if n else 0.0, (self.top + len(window)) / n if n else 1.0)
+        fresh = [iid for iid in window if iid not in self._seen]
+        if fresh:
+            self._seen.update(fresh)
+            if self.on_visible is not None:
+                self.on_visible([self.rows[iid] for iid in fresh])
@@ -0,0 +1,267 @@
+# jira_worklog_trace.py
+# Request-level instrumentation for every Jira call (REST through requests, page loads through Selenium).
+# Each call becomes one span: method, endpoint template, status, bytes, retries, duration.
+# A run collects its spans in its own scope (start_run / finish_run); when it ends they are
+# exported as JSON Lines or as OpenTelemetry-compatible spans (OTLP/JSON shape) and
+# summarised as p50/p95 per endpoint. Calls outside a run land in a bounded buffer.
+#
+#   JIRA_WORKLOG_TRACE=~/jira_trace.jsonl JIRA_WORKLOG_TRACE_FORMAT=otel python main.py ...
+import os
+import re
+import json
+import math
+import time
+import secrets
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# ================== CONFIG ==================
+TRACE_PATH = os.environ.get("JIRA_WORKLOG_TRACE", "")  # empty = keep spans only for the summary
+TRACE_FORMAT = os.environ.get("JIRA_WORKLOG_TRACE_FORMAT", "jsonl")  # "jsonl" | "otel"
+SERVICE_NAME = "jira-worklog"
+SPAN_BUFFER = 10_000  # spans kept from calls outside a run (warm-up, refreshes); oldest dropped first
+
+_ISSUE_KEY_RE = re.compile(r"/[A-Za-z][A-Za-z0-9_]+-\d+(?=/|$)")
+_NUMERIC_RE = re.compile(r"(?<!/api)/\d+(?=/|$)")  # keep /rest/api/2
+
+
+def endpoint_template(url: str) -> str:
+    """'https://x/rest/api/3/issue/SINT-12/worklog?a=1' -> '/rest/api/3/issue/{key}/worklog'."""
+    path = urlparse(url).path or "/"
+    path = _ISSUE_KEY_RE.sub("/{key}", path)
+    return _NUMERIC_RE.sub("/{id}", path)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+class RunScope:
+    """Spans of one run, kept apart from whatever else the process calls meanwhile."""
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)  # one trace per run
+        self.spans: List[dict] = []
+
+
+class Tracer:
+    """Thread-safe span recorder shared by all sessions and engines of one process.
+
+    A span goes to the run scope active in the calling context (see start_run / carry),
+    otherwise to a buffer bounded by `maxlen`.
+    """
+
+    def __init__(self, maxlen: int = SPAN_BUFFER):
+        self._lock = threading.Lock()
+        self._spans = deque(maxlen=maxlen)
+        self._scope = contextvars.ContextVar("jira_worklog_trace_scope", default=None)
+        self.trace_id = secrets.token_hex(16)
+
+    def start_run(self) -> RunScope:
+        """Open a run scope for the calling thread; its calls record there until end_run."""
+        scope = RunScope()
+        self._scope.set(scope)
+        return scope
+
+    def end_run(self, scope: RunScope) -> List[dict]:
+        """Close `scope` (if it is the caller's) and return its spans."""
+        if self._scope.get() is scope:
+            self._scope.set(None)
+        with self._lock:
+            return list(scope.spans)
+
+    def carry(self, fn):
+        """Wrap `fn` so it records into the caller's run scope on any thread (executor workers)."""
+        scope = self._scope.get()
+
+        def run(*args, **kwargs):
+            token = self._scope.set(scope)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._scope.reset(token)
+        return run
+
+    def record(self, method: str, endpoint: str, status: Optional[int], duration: float,
+               nbytes: int = 0, retries: int = 0, error: str = "", start: float = None):
+        span = {
+            "ts": start if start is not None else time.time() - duration,
+            "method": method,
+            "endpoint": endpoint,
+            "status": status,
+            "bytes": nbytes,
+            "retries": retries,
+            "duration_ms": round(duration * 1000, 3),
+            "error": error,
+        }
+        scope = self._scope.get()
+        with self._lock:
+            (scope.spans if scope is not None else self._spans).append(span)
+
+    @contextmanager
+    def span(self, method: str, endpoint: str):
+        """Time a block that is not an HTTP call we can hook (e.g. a Selenium page load)."""
+        start = time.time()
+        t0 = time.perf_counter()
+        error = ""
+        try:
+            yield
+        except Exception as e:
+            error = repr(e)
+            raise
+        finally:
+            self.record(method, endpoint, None, time.perf_counter() - t0, error=error, start=start)
+
+    def drain(self) -> List[dict]:
+        """Take the spans recorded outside any run scope and start over."""
+        with self._lock:
+            spans = list(self._spans)
+            self._spans.clear()
+        return spans
+
+
+TRACER = Tracer()
+
+
+# ================== requests HOOK ==================
+def instrument_session(session, tracer: Tracer = TRACER):
+    """Record a span for every request sent through `session` (idempotent).
+
+    Wraps the mounted adapters, so the duration covers urllib3 retries and the
+    retry count comes from the final response.
+    """
+    for adapter in session.adapters.values():
+        if getattr(adapter, "_traced", False):
+            continue
+        adapter.send = _traced_send(adapter.send, tracer)
+        adapter._traced = True
+    return session
+
+
+def _traced_send(send, tracer: Tracer):
+    def wrapper(request, *args, **kwargs):
+        start = time.time()
+        t0 = time.perf_counter()
+        try:
+            resp = send(request, *args, **kwargs)
+        except Exception as e:
+            tracer.record(request.method, endpoint_template(request.url), None,
+                          time.perf_counter() - t0, error=type(e).__name__, start=start)
+            raise
+        retries = getattr(getattr(resp.raw, "retries", None), "history", ()) or ()
+        nbytes = int(resp.headers.get("Content-Length") or 0) if kwargs.get("stream") else len(resp.content)
+        tracer.record(request.method, endpoint_template(request.url), resp.status_code,
+                      time.perf_counter() - t0, nbytes=nbytes, retries=len(retries), start=start)
+        return resp
+    return wrapper
+
+
+# ================== EXPORT ==================
+def to_otel(spans: List[dict], trace_id: str) -> dict:
+    """OTLP/JSON 'resourceSpans' document (loadable by an OTel collector file receiver)."""
+    otel = []
+    for s in spans:
+        start_ns = int(s["ts"] * 1e9)
+        attrs = [
+            {"key": "http.request.method", "value": {"stringValue": s["method"]}},
+            {"key": "url.path", "value": {"stringValue": s["endpoint"]}},
+            {"key": "http.response.body.size", "value": {"intValue": s["bytes"]}},
+            {"key": "http.request.resend_count", "value": {"intValue": s["retries"]}},
+        ]
+        if s["status"] is not None:
+            attrs.append({"key": "http.response.status_code", "value": {"intValue": s["status"]}})
+        failed = bool(s["error"]) or (s["status"] or 0) >= 400
+        otel.append({
+            "traceId": trace_id,
+            "spanId": secrets.token_hex(8),
+            "name": f"{s['method']} {s['endpoint']}",
+            "kind": 3,  # SPAN_KIND_CLIENT
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(s["duration_ms"] * 1e6)),
+            "attributes": attrs,
+            "status": {"code": 2, "message": s["error"]} if failed else {"code": 1},
+        })
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": "jira_worklog_trace"}, "spans": otel}],
+    }]}
+
+
+def export_spans(spans: List[dict], path: str = None, fmt: str = None, trace_id: str = None) -> bool:
+    """Append spans to `path` (default TRACE_PATH); returns False when tracing to a file is off."""
+    path = os.path.expanduser(path or TRACE_PATH)
+    fmt = fmt or TRACE_FORMAT
+    if not path or not spans:
+        return False
+    with open(path, "a", encoding="utf-8") as f:
+        if fmt == "otel":
+            # one OTLP document per line, as written by the collector's file exporter
+            f.write(json.dumps(to_otel(spans, trace_id or TRACER.trace_id)) + "\n")
+        else:
+            for s in spans:
+                f.write(json.dumps(s, ensure_ascii=False) + "\n")
+    return True
+
+
+def summarize(spans: List[dict]) -> List[dict]:
+    """Per (method, endpoint): count, errors, retries, bytes, p50/p95/max duration in ms."""
+    groups: Dict[tuple, List[dict]] = {}
+    for s in spans:
+        groups.setdefault((s["method"], s["endpoint"]), []).append(s)
+    rows = []
+    for (method, endpoint), items in groups.items():
+        durations = sorted(s["duration_ms"] for s in items)
+        rows.append({
+            "method": method,
+            "endpoint": endpoint,
+            "count": len(items),
+            "errors": sum(1 for s in items if s["error"] or (s["status"] or 0) >= 400),
+            "retries": sum(s["retries"] for s in items),
+            "bytes": sum(s["bytes"] for s in items),
+            "p50_ms": percentile(durations, 0.50),
+            "p95_ms": percentile(durations, 0.95),
+            "max_ms": durations[-1],
+            "total_ms": sum(durations),
+        })
+    rows.sort(key=lambda r: r["total_ms"], reverse=True)
+    return rows
+
+
+def format_summary(spans: List[dict]) -> str:
+    rows = summarize(spans)
+    if not rows:
+        return "No Jira calls recorded."
+    width = max(len(f"{r['method']} {r['endpoint']}") for r in rows)
+    lines = [f"{'endpoint':<{width}}  {'calls':>5}  {'err':>3}  {'retry':>5}  {'p50 ms':>8}  {'p95 ms':>8}  {'total s':>8}"]
+    for r in rows:
+        name = f"{r['method']} {r['endpoint']}"
+        lines.append(f"{name:<{width}}  {r['count']:>5}  {r['errors']:>3}  {r['retries']:>5}  "
+                     f"{r['p50_ms']:>8.1f}  {r['p95_ms']:>8.1f}  {r['total_ms'] / 1000:>8.2f}")
+    return "\n".join(lines)
+
+
+def start_run(tracer: Tracer = TRACER) -> RunScope:
+    """Start of a run on the calling thread; pass the scope to finish_run."""
+    return tracer.start_run()
+
+
+def finish_run(tracer: Tracer = TRACER, path: str = None, fmt: str = None, scope: RunScope = None) -> str:
+    """End of a run: export the run's spans (if a trace file is set) and return the summary table.
+
+    Without `scope` the spans recorded outside any run are taken instead.
+    """
+    if scope is not None:
+        spans, trace_id = tracer.end_run(scope), scope.trace_id
+    else:
+        spans, trace_id = tracer.drain(), tracer.trace_id
+        tracer.trace_id = secrets.token_hex(16)  # one trace per run
+    export_spans(spans, path, fmt, trace_id)
+    return format_summary(spans)
@@ -1,110 +1,579 @@
+import sys
+import csv
+import json
+import argparse
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import date, datetime, timedelta
 from collections import defaultdict
-import calendar
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from array import array
+
+# --- Optional: vectorized group-by in WorklogStore ---
+try:
+    import numpy as np  # pip install numpy
+except Exception:
+    np = None
+
+# --- Optional: Parquet output ---
+try:
+    import pyarrow as pa  # pip install pyarrow
+    import pyarrow.parquet as pq
+except Exception:
+    pa = pq = None
+
+# --- Workday/holiday helpers shared with the GUIs and the runner ---
+from jira_worklog_helpers import is_workday, month_range
+
+# --- Request spans (p50/p95 summary on stderr, optional trace file) ---
+from jira_worklog_trace import TRACE_FORMAT, TRACER, finish_run, instrument_session, start_run
 
 # === CONFIG ===
 JIRA_URL = "https://jira.cargo-partner.com"
 USERNAME = "XXXX"  # Your Jira username
 PAT = "XXXX"  # Paste your PAT here
 
+# How worklogs are ingested:
+#   "search" – JQL search for issues with their first worklog page inline; a /worklog call
+#              only for issues with more worklogs than that page holds
+#   "bulk"   – /worklog/updated ids + batched POST /worklog/list (a handful of calls)
+INGEST_MODE = "search"
+WORKLOG_LIST_BATCH = 1000  # max ids per POST /worklog/list
+ISSUE_LOOKUP_BATCH = 100   # max issue ids per "id in (...)" search
+SEARCH_PAGE_SIZE = 1000    # maxResults asked per search page; Jira may cap it (its answer's maxResults is used)
+SEARCH_WORKERS = 8         # search pages fetched in parallel once the first page told the total
+PARQUET_ROW_GROUP = 10000  # rows buffered before a Parquet row group is written
+
 HEADERS = {
     "Authorization": f"Bearer {PAT}",
     "Content-Type": "application/json"
 }
+# one keep-alive session for all calls; every request is recorded as a trace span.
+# 429/5xx answers are retried with backoff (Retry-After is honoured), the pool is
+# large enough for SEARCH_WORKERS parallel pages.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    max_retries=Retry(total=5, connect=3, read=3, backoff_factor=0.6,
+                      status_forcelist=(429, 500, 502, 503, 504)),
+    pool_connections=SEARCH_WORKERS, pool_maxsize=SEARCH_WORKERS))
+SESSION.mount("http://", SESSION.get_adapter("https://"))
+SESSION = instrument_session(SESSION)
 
-# === DATE RANGE FOR THIS MONTH ===
-today = datetime.now()
-start_date = today.replace(day=1)
-end_date = today.replace(day=calendar.monthrange(today.year, today.month)[1])
-
-# === SLOVAK HOLIDAYS (2025) ===
-SLOVAK_HOLIDAYS_2025 = {
-    "2025-01-01", "2025-01-06", "2025-04-18", "2025-04-21",
-    "2025-05-01", "2025-05-08", "2025-07-05", "2025-08-29",
-    "2025-09-01", "2025-09-15", "2025-11-01", "2025-11-17",
-    "2025-12-24", "2025-12-25", "2025-12-26"
-}
+# === FETCH ISSUES ===
+def jira_json(method, url, what, **kwargs):
+    """JSON answer of one SESSION call; RuntimeError when Jira still fails after the retries.
+
+    Every caller needs the whole answer – a skipped page or batch would silently
+    drop worklogs from the report.
+    """
+    try:
+        r = SESSION.request(method, url, headers=HEADERS, **kwargs)
+    except requests.RequestException as e:  # RetryError, ConnectionError, timeouts
+        raise RuntimeError(f"Failed to fetch {what}: {e}") from e
+    if r.status_code != 200:
+        raise RuntimeError(f"Failed to fetch {what}: {r.status_code}")
+    return r.json()
 
-def is_workday(date_obj):
-    return (
-        date_obj.weekday() < 5 and
-        date_obj.strftime("%Y-%m-%d") not in SLOVAK_HOLIDAYS_2025
+def jql_quote(value):
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def build_worklog_jql(usernames, start, end, project=None):
+    """Only issues with a worklog by one of `usernames` inside [start, end] (and project)."""
+    if len(usernames) == 1:
+        author = f"worklogAuthor = {jql_quote(usernames[0])}"
+    else:
+        author = f"worklogAuthor in ({', '.join(jql_quote(u) for u in usernames)})"
+    jql = (
+        author +
+        f" AND worklogDate >= {jql_quote(start.isoformat())}"
+        f" AND worklogDate <= {jql_quote(end.isoformat())}"
     )
+    if project:
+        jql += f" AND project = {jql_quote(project)}"
+    return jql
 
-# === FETCH ISSUES ===
-def fetch_my_issues(username):
-    issues = []
-    start_at = 0
+def search_page(jql, start_at, fields="summary"):
+    """One page of a JQL search with only `fields` per issue.
+
+    Raises RuntimeError when Jira still refuses it after the retries – a missing page
+    would silently drop issues from the report.
+    """
+    params = {
+        "jql": jql,
+        "fields": fields,
+        "startAt": start_at,
+        "maxResults": SEARCH_PAGE_SIZE
+    }
+    return jira_json("GET", f"{JIRA_URL}/rest/api/2/search", f"issues (startAt={start_at})", params=params)
+
+def fetch_my_issues(usernames, start, end, project=None, fields="summary"):
+    """Yield the matching issues as their pages arrive (page order is not kept).
+
+    The first page tells the total and the page size Jira really allows; all other
+    pages are then requested at once, SEARCH_WORKERS at a time.
+    """
+    jql = build_worklog_jql(usernames, start, end, project)
+    first = search_page(jql, 0, fields)
+    yield from first["issues"]
+    page = first.get("maxResults") or len(first["issues"])
+    total = first.get("total", 0)
+    if not page or len(first["issues"]) >= total:
+        return
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as pool:
+        fetch = TRACER.carry(search_page)  # pages count in the caller's run
+        futures = [pool.submit(fetch, jql, start_at, fields) for start_at in range(page, total, page)]
+        try:
+            for future in as_completed(futures):
+                yield from future.result()["issues"]
+        finally:
+            # an error (or a reader that stopped early) – don't wait for pages nobody reads
+            for future in futures:
+                future.cancel()
+
+def new_cache():
+    """Fetched data shared between the users of one run (see report_users)."""
+    return {"worklogs": {}, "issues": {}, "bulk": {}}
+
+def fetch_worklogs(issue_key, cache=None):
+    if cache is not None and issue_key in cache["worklogs"]:
+        return cache["worklogs"][issue_key]
+    url = f"{JIRA_URL}/rest/api/2/issue/{issue_key}/worklog"
+    worklogs = jira_json("GET", url, f"worklogs of {issue_key}").get("worklogs", [])
+    if cache is not None:
+        cache["worklogs"][issue_key] = worklogs
+    return worklogs
+
+# === BULK FETCH (worklog/updated + worklog/list) ===
+def fetch_updated_worklog_ids(since):
+    """Ids of all worklogs created/updated since `since` (datetime), all pages."""
+    ids = []
+    since_ms = int(since.timestamp() * 1000)
+    url = f"{JIRA_URL}/rest/api/2/worklog/updated"
     while True:
-        jql = f'worklogAuthor = "{username}" AND worklogDate >= startOfMonth()'
-        url = f"{JIRA_URL}/rest/api/2/search"
+        data = jira_json("GET", url, "updated worklogs", params={"since": since_ms})
+        ids += [v["worklogId"] for v in data.get("values", [])]
+        if data.get("lastPage", True):
+            break
+        since_ms = data["until"]
+    # pages overlap on `until`, keep each id once
+    return list(dict.fromkeys(ids))
+
+def fetch_worklogs_by_ids(ids):
+    """Yield the worklogs of `ids` one /worklog/list batch at a time."""
+    url = f"{JIRA_URL}/rest/api/2/worklog/list"
+    for i in range(0, len(ids), WORKLOG_LIST_BATCH):
+        yield jira_json("POST", url, "worklog batch", json={"ids": ids[i:i + WORKLOG_LIST_BATCH]})
+
+def fetch_issues_by_ids(issue_ids, issues=None):
+    """Map issue id -> (key, summary) using batched `id in (...)` searches.
+
+    `issues` holds the ones already known; it is filled in place and returned.
+    """
+    issues = {} if issues is None else issues
+    issue_ids = sorted(set(issue_ids) - set(issues), key=int)
+    url = f"{JIRA_URL}/rest/api/2/search"
+    for i in range(0, len(issue_ids), ISSUE_LOOKUP_BATCH):
+        chunk = issue_ids[i:i + ISSUE_LOOKUP_BATCH]
         params = {
-            "jql": jql,
+            "jql": f"id in ({','.join(chunk)})",
             "fields": "summary",
-            "startAt": start_at,
-            "maxResults": 50
+            "maxResults": len(chunk)
         }
-        r = requests.get(url, headers=HEADERS, params=params)
-        if r.status_code != 200:
-            print(f"❌ Failed to fetch issues: {r.status_code}")
-            break
-        data = r.json()
-        issues += data["issues"]
-        if start_at + 50 >= data.get("total", 0):
-            break
-        start_at += 50
+        for issue in jira_json("GET", url, "issues", params=params).get("issues", []):
+            issues[str(issue["id"])] = (issue["key"], issue["fields"]["summary"])
     return issues
 
-def fetch_worklogs(issue_key):
-    url = f"{JIRA_URL}/rest/api/2/issue/{issue_key}/worklog"
-    r = requests.get(url, headers=HEADERS)
-    if r.status_code != 200:
-        return []
-    return r.json().get("worklogs", [])
-
 # === GATHER WORKLOG DATA ===
-def tracked_hours_with_details(username):
-    issues = fetch_my_issues(username)
-    result = defaultdict(list)
+def worklog_author(wl):
+    return wl.get("author", {}).get("name") or wl.get("author", {}).get("accountId")
 
-    for issue in issues:
+def issue_worklogs(issue, cache=None):
+    """The issue's worklogs from the search result when they all came inline, else via /worklog.
+
+    Inline lists are not cached – the search yields every issue once; `cache` only
+    serves the /worklog fallback when the caller shares it between users.
+    """
+    inline = issue["fields"].get("worklog") or {}
+    worklogs = inline.get("worklogs")
+    if worklogs is None or inline.get("total", 0) > len(worklogs):
+        return fetch_worklogs(issue["key"], cache)
+    return worklogs
+
+def iter_worklogs_search(usernames, start, end, project=None, cache=None):
+    """One combined search for all users; each issue's worklogs are downloaded once (mostly inline)."""
+    wanted = set(usernames)
+    for issue in fetch_my_issues(usernames, start, end, project, fields="summary,worklog"):
         key = issue["key"]
         summary = issue["fields"]["summary"]
-        worklogs = fetch_worklogs(key)
+        for wl in issue_worklogs(issue, cache):
+            author = worklog_author(wl)
+            if author in wanted:
+                yield author, key, summary, wl
+
+def fetch_worklogs_bulk(start, cache=None):
+    """Yield the worklogs updated since `start`, one /worklog/list batch at a time.
 
-        for wl in worklogs:
-            author = wl.get("author", {}).get("name") or wl.get("author", {}).get("accountId")
-            if author != username:
+    Only a shared `cache` keeps the batches (for the next user); without one at most
+    one batch is held in memory.
+    """
+    # Worklogs are selected by their last update, so anything touched since the
+    # start of the range is included; entries outside the range are dropped later.
+    if cache is not None and start in cache["bulk"]:
+        yield from cache["bulk"][start]
+        return
+    since = datetime(start.year, start.month, start.day)
+    batches = []
+    for batch in fetch_worklogs_by_ids(fetch_updated_worklog_ids(since)):
+        if cache is not None:
+            batches.append(batch)
+        yield batch
+    if cache is not None:
+        cache["bulk"][start] = batches
+
+def iter_worklogs_bulk(usernames, start, end, project=None, cache=None):
+    wanted = set(usernames)
+    # id -> (key, summary) is small and kept for the whole run, the worklogs are not
+    issues = cache["issues"] if cache is not None else {}
+    for batch in fetch_worklogs_bulk(start, cache):
+        mine = [wl for wl in batch if worklog_author(wl) in wanted]
+        fetch_issues_by_ids([str(wl["issueId"]) for wl in mine], issues)
+        for wl in mine:
+            issue = issues.get(str(wl["issueId"]))
+            if issue is None:
                 continue
-            dt = datetime.strptime(wl["started"][:10], "%Y-%m-%d")
-            if not (start_date <= dt <= end_date) or not is_workday(dt):
+            key, summary = issue
+            if project and not key.startswith(f"{project}-"):
                 continue
-            date_str = dt.strftime("%Y-%m-%d")
-            hours = wl.get("timeSpentSeconds", 0) / 3600
-            result[date_str].append({
-                "issue": key,
-                "summary": summary,
-                "hours": round(hours, 2)
-            })
+            yield worklog_author(wl), key, summary, wl
+
+def iter_report_rows(usernames, start=None, end=None, project=None, mode=None, cache=None):
+    """Yield one flat row per in-range workday worklog, as soon as it is fetched."""
+    if start is None or end is None:
+        start, end = month_range(date.today())
+    mode = mode or INGEST_MODE
+    if mode == "bulk":
+        worklogs = iter_worklogs_bulk(usernames, start, end, project, cache)
+    elif mode == "search":
+        worklogs = iter_worklogs_search(usernames, start, end, project, cache)
+    else:
+        raise ValueError(f"Unknown ingest mode: {mode}")
+
+    for author, key, summary, wl in worklogs:
+        day = datetime.strptime(wl["started"][:10], "%Y-%m-%d").date()
+        if not (start <= day <= end) or not is_workday(day):
+            continue
+        seconds = wl.get("timeSpentSeconds", 0)
+        yield {
+            "user": author,
+            "date": day.strftime("%Y-%m-%d"),
+            "issue": key,
+            "summary": summary,
+            "seconds": seconds,
+            "hours": round(seconds / 3600, 2)
+        }
+
+def tracked_hours_by_user(usernames, start=None, end=None, project=None, mode=None, cache=None):
+    """{username: {date_str: [entries]}} for all users from a single fetch."""
+    result = {u: defaultdict(list) for u in usernames}
+    for row in iter_report_rows(usernames, start, end, project, mode, cache):
+        result[row["user"]][row["date"]].append({
+            "issue": row["issue"],
+            "summary": row["summary"],
+            "hours": row["hours"]
+        })
     return result
 
+def tracked_hours_with_details(username, start=None, end=None, project=None, mode=None, cache=None):
+    return tracked_hours_by_user([username], start, end, project, mode, cache)[username]
+
+def daily_totals(daily_logs):
+    return {day: round(sum(log["hours"] for log in logs), 2) for day, logs in daily_logs.items()}
+
+# === COMPACT WORKLOG STORE ===
+class WorklogStore:
+    """Column store for many worklogs: interned users/issues, int seconds, day ordinals.
+
+    One entry costs four machine integers instead of a dict with a repeated
+    summary string and a float, and totals are grouped over whole columns.
+    """
+
+    COLUMNS = ("user", "day", "issue")
+
+    def __init__(self):
+        self.users = []            # idx -> username
+        self.issues = []           # idx -> issue key
+        self.summaries = []        # idx -> summary (same idx as issues)
+        self._user_idx = {}
+        self._issue_idx = {}
+        self.user = array("i")
+        self.day = array("i")      # date.toordinal()
+        self.issue = array("i")
+        self.seconds = array("q")
+
+    @classmethod
+    def from_rows(cls, rows):
+        store = cls()
+        for row in rows:
+            store.add(row["user"], row["date"], row["issue"], row["summary"], row["seconds"])
+        return store
+
+    def __len__(self):
+        return len(self.seconds)
+
+    def add(self, user, day, issue, summary, seconds):
+        u = self._user_idx.get(user)
+        if u is None:
+            u = self._user_idx[user] = len(self.users)
+            self.users.append(user)
+        i = self._issue_idx.get(issue)
+        if i is None:
+            i = self._issue_idx[issue] = len(self.issues)
+            self.issues.append(issue)
+            self.summaries.append(summary)
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        self.user.append(u)
+        self.day.append(day.toordinal())
+        self.issue.append(i)
+        self.seconds.append(int(seconds))
+
+    def _decode(self, name, value, days):
+        if name == "user":
+            return self.users[value]
+        if name == "issue":
+            return self.issues[value]
+        day = days.get(value)
+        if day is None:
+            day = days[value] = date.fromordinal(value).strftime("%Y-%m-%d")
+        return day
+
+    def totals(self, *by):
+        """Sum of seconds grouped by any of "user", "day", "issue".
+
+        Returns {value: seconds} for one column, {(v1, v2, ...): seconds} for more.
+        """
+        for name in by:
+            if name not in self.COLUMNS:
+                raise ValueError(f"Unknown column: {name}")
+        if not by or not len(self):
+            return {} if by else sum(self.seconds)
+        cols = [getattr(self, name) for name in by]
+
+        if np is not None:
+            # mixed-radix code per row -> one 1-D unique + bincount
+            code = np.zeros(len(self), dtype=np.int64)
+            bounds = []
+            for c in cols:
+                a = np.frombuffer(c, dtype=np.int32).astype(np.int64)
+                lo, span = int(a.min()), int(a.max() - a.min()) + 1
+                code = code * span + (a - lo)
+                bounds.append((lo, span))
+            uniq, inv = np.unique(code, return_inverse=True)
+            sums = np.bincount(inv.reshape(-1), weights=np.frombuffer(self.seconds, dtype=np.int64))
+            parts = []
+            for lo, span in reversed(bounds):
+                parts.append((uniq % span + lo).tolist())
+                uniq = uniq // span
+            grouped = zip(zip(*reversed(parts)), (int(x) for x in sums))
+        else:
+            acc = defaultdict(int)
+            for key, sec in zip(zip(*cols), self.seconds):
+                acc[key] += sec
+            grouped = acc.items()
+
+        out = {}
+        days = {}
+        for key, sec in grouped:
+            decoded = tuple(self._decode(name, v, days) for name, v in zip(by, key))
+            out[decoded if len(by) > 1 else decoded[0]] = sec
+        return out
+
 # === OUTPUT ===
-daily_logs = tracked_hours_with_details(USERNAME)
-
-print(f"\n🕒 Tracked Worklogs (Workdays only) – {today.strftime('%B %Y')}")
-print("Date       | Hours | Task ID    | Summary")
-print("-----------|-------|------------|--------")
-
-for i in range(1, end_date.day + 1):
-    date_obj = start_date.replace(day=i)
-    if not is_workday(date_obj):
-        continue
-    date_str = date_obj.strftime("%Y-%m-%d")
-    logs = daily_logs.get(date_str, [])
-    total = 0.0
-    for log in logs:
-        total += log['hours']
-        print(f"{date_str} | {log['hours']:>5.2f} | {log['issue']:<10} | {log['summary']}")
-    if logs:
-        print(f"{' ' * 11}Total  | {total:>5.2f} h\n")
+def print_report(daily_logs, start, end, username=None):
+    who = f" – {username}" if username else ""
+    print(f"\n🕒 Tracked Worklogs (Workdays only){who} – {start:%d.%m.%Y} – {end:%d.%m.%Y}")
+    print("Date       | Hours | Task ID    | Summary")
+    print("-----------|-------|------------|--------")
+
+    date_obj = start
+    while date_obj <= end:
+        day_str = date_obj.strftime("%Y-%m-%d")
+        date_obj += timedelta(days=1)
+        logs = daily_logs.get(day_str, [])
+        total = 0.0
+        for log in logs:
+            total += log['hours']
+            print(f"{day_str} | {log['hours']:>5.2f} | {log['issue']:<10} | {log['summary']}")
+        if logs:
+            print(f"{' ' * 11}Total  | {total:>5.2f} h\n")
+
+def print_team_report(store, users, start, end):
+    """Per-user per-day totals side by side."""
+    totals = {u: {} for u in users}
+    for (user, day_str), seconds in store.totals("user", "day").items():
+        totals[user][day_str] = round(seconds / 3600, 2)
+    width = max([8] + [len(u) for u in users])
+    print(f"\n👥 Team Worklogs (Workdays only) – {start:%d.%m.%Y} – {end:%d.%m.%Y}")
+    print("Date       | " + " | ".join(f"{u:>{width}}" for u in users))
+    print("-----------|" + "|".join("-" * (width + 2) for _ in users))
+
+    date_obj = start
+    while date_obj <= end:
+        day_str = date_obj.strftime("%Y-%m-%d")
+        date_obj += timedelta(days=1)
+        if not any(day_str in totals[u] for u in users):
+            continue
+        print(f"{day_str} | " + " | ".join(f"{totals[u].get(day_str, 0.0):>{width}.2f}" for u in users))
+    print(f"{'Total':<10} | " + " | ".join(f"{sum(totals[u].values()):>{width}.2f}" for u in users))
+
+# === STREAMING SINKS (csv / jsonl / parquet) ===
+ROW_FIELDS = ("user", "date", "issue", "summary", "seconds", "hours")
+
+class CsvSink:
+    def __init__(self, f):
+        self.f = f
+        self.writer = csv.DictWriter(f, fieldnames=ROW_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+        self.f.flush()
+
+    def close(self):
+        self.f.flush()
+
+class JsonLinesSink:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, row):
+        self.f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.f.flush()
+
+    def close(self):
+        self.f.flush()
+
+class ParquetSink:
+    """Buffers at most PARQUET_ROW_GROUP rows, then writes them as one row group."""
+
+    def __init__(self, path):
+        if pq is None:
+            raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)")
+        self.schema = pa.schema([
+            ("user", pa.string()), ("date", pa.string()), ("issue", pa.string()),
+            ("summary", pa.string()), ("seconds", pa.int64()), ("hours", pa.float64()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.buffer = {name: [] for name in ROW_FIELDS}
+        self.rows = 0
+
+    def write(self, row):
+        for name in ROW_FIELDS:
+            self.buffer[name].append(row[name])
+        self.rows += 1
+        if self.rows >= PARQUET_ROW_GROUP:
+            self._flush()
+
+    def _flush(self):
+        if self.rows:
+            self.writer.write_table(pa.Table.from_pydict(self.buffer, schema=self.schema))
+            self.buffer = {name: [] for name in ROW_FIELDS}
+            self.rows = 0
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+def open_sink(fmt, path):
+    """Returns (sink, file to close or None). '-' means stdout (not for parquet)."""
+    if fmt == "parquet":
+        if path == "-":
+            raise ValueError("Parquet output needs --output FILE")
+        return ParquetSink(path), None
+    f = sys.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+    sink = CsvSink(f) if fmt == "csv" else JsonLinesSink(f)
+    return sink, (None if f is sys.stdout else f)
+
+def export_rows(usernames, start, end, fmt, path="-", project=None, mode=None):
+    """Stream rows to the sink while they are fetched; returns the row count.
+
+    No cache: nothing fetched is kept once its rows are written, so memory stays bounded.
+    """
+    sink, f = open_sink(fmt, path)
+    count = 0
+    try:
+        for row in iter_report_rows(usernames, start, end, project, mode):
+            sink.write(row)
+            count += 1
+    finally:
+        sink.close()
+        if f is not None:
+            f.close()
+    return count
+
+def report_users(usernames, start, end, project=None, mode=None, team=False):
+    """All users come from one combined fetch; detail per user or a team summary."""
+    if team:
+        # streamed straight into the compact store, no cache of the raw worklogs
+        rows = iter_report_rows(usernames, start, end, project, mode)
+        print_team_report(WorklogStore.from_rows(rows), usernames, start, end)
+        return
+    per_user = tracked_hours_by_user(usernames, start, end, project, mode, new_cache())
+    for username in usernames:
+        print_report(per_user[username], start, end, username if len(usernames) > 1 else None)
+
+# === CLI ===
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+def parse_args(argv=None):
+    first, last = month_range(date.today())
+    ap = argparse.ArgumentParser(description="Jira worklog report (workdays only).")
+    ap.add_argument("--from", dest="start", type=parse_date, default=first,
+                    help="first day, YYYY-MM-DD (default: first day of this month)")
+    ap.add_argument("--to", dest="end", type=parse_date, default=last,
+                    help="last day, YYYY-MM-DD (default: last day of this month)")
+    ap.add_argument("--user", dest="users", action="append",
+                    help=f"Jira username, repeatable (default: {USERNAME})")
+    ap.add_argument("--project", help="limit to one project key, e.g. SINT")
+    ap.add_argument("--mode", choices=("search", "bulk"), default=INGEST_MODE,
+                    help="ingest path (default: %(default)s)")
+    ap.add_argument("--team", action="store_true",
+                    help="print per-user per-day totals side by side instead of details")
+    ap.add_argument("--format", choices=("table", "csv", "jsonl", "parquet"), default="table",
+                    help="table = console report; others stream one row per worklog")
+    ap.add_argument("--output", default="-",
+                    help="output file for csv/jsonl/parquet (default: stdout)")
+    ap.add_argument("--trace", metavar="PATH",
+                    help="append one span per Jira call to this file (default: $JIRA_WORKLOG_TRACE)")
+    ap.add_argument("--trace-format", choices=("jsonl", "otel"), default=TRACE_FORMAT,
+                    help="trace file format (default: %(default)s)")
+    args = ap.parse_args(argv)
+    if args.end < args.start:
+        ap.error("--to must be >= --from")
+    if args.format == "parquet" and pq is None:
+        ap.error("--format parquet needs pyarrow (pip install pyarrow)")
+    args.users = list(dict.fromkeys(args.users or [USERNAME]))
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    status = 0
+    scope = start_run()
+    try:
+        if args.format == "table":
+            report_users(args.users, args.start, args.end, args.project, args.mode, args.team)
+        else:
+            try:
+                export_rows(args.users, args.start, args.end, args.format, args.output, args.project, args.mode)
+            except BrokenPipeError:
+                # reader (e.g. `| head`) went away – stop quietly
+                sys.stdout = None
+    except RuntimeError as e:
+        # incomplete data must not look like a successful run
+        print(f"❌ {e}", file=sys.stderr)
+        status = 1
+    print(finish_run(path=args.trace, fmt=args.trace_format, scope=scope), file=sys.stderr)
+    sys.exit(status)
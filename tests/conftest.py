@@ -0,0 +1,21 @@
+# conftest.py
+# The modules live in the repo root (no package); plan_worklogs and friends log through
+# the runner's module-level LOG, which must not end up in ~/.jira_worklog_gui.log.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jira_worklog_runner  # noqa: E402
+
+
+@pytest.fixture(autouse=True, scope="session")
+def runner_log(tmp_path_factory):
+    saved = jira_worklog_runner.LOG
+    jira_worklog_runner.LOG = jira_worklog_runner.FileLog(str(tmp_path_factory.mktemp("log") / "runner.log"))
+    yield jira_worklog_runner.LOG
+    jira_worklog_runner.LOG.flush()
+    jira_worklog_runner.LOG = saved
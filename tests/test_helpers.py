@@ -0,0 +1,158 @@
+# test_helpers.py
+# Hypothesis properties for the pure helpers in jira_worklog_helpers (and plan_worklogs):
+# every property must hold for every generated example; failures are shrunk to the smallest one.
+# Skipped when hypothesis is not installed (pip install hypothesis).
+
+import re
+import random
+import datetime as dt
+
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, strategies as st  # noqa: E402
+
+from jira_worklog_helpers import (  # noqa: E402
+    DAY_TARGET_MINUTES, end_of_week, extract_issue_key, format_logged_days, is_workday, last_week_range,
+    local_iso_with_tz, looks_like_jql, minutes_to_jira_time, month_range, parse_ticket_block, proportional_split,
+    resolve_range, split_missing_minutes, start_of_week, working_days,
+)
+from jira_worklog_runner import plan_worklogs  # noqa: E402
+
+days = st.dates(min_value=dt.date(2024, 1, 1), max_value=dt.date(2026, 12, 31))
+weights = st.lists(st.sampled_from((0, 1, 2, 3, 5, 10)), min_size=1, max_size=12)
+nonzero_weights = weights.filter(sum)
+keys = st.from_regex(r"[A-Z][A-Z0-9_]{1,7}-[1-9][0-9]{0,5}", fullmatch=True)
+numeric_ids = st.integers(min_value=1, max_value=10 ** 7).map(str)
+
+
+def jira_time_to_minutes(text):
+    m = re.fullmatch(r"(?:(\d+)h)?\s?(?:(\d+)m)?", text)
+    return int(m.group(1) or 0) * 60 + int(m.group(2) or 0)
+
+
+# ---------- 8h split ----------
+@given(st.integers(min_value=0, max_value=64).map(lambda n: 15 * n), weights)
+def test_proportional_split_keeps_total(total, w):
+    res = proportional_split(total, w)
+    assert len(res) == len(w)
+    assert sum(res) == total
+    assert all(x >= 0 for x in res)
+    if sum(w):
+        assert all(x % 15 == 0 for x in res)
+
+
+@given(st.integers(min_value=-60, max_value=DAY_TARGET_MINUTES), nonzero_weights)
+def test_split_missing_minutes_fills_the_gap(missing, w):
+    res = split_missing_minutes(missing, w)
+    assert len(res) == len(w)
+    assert sum(res) == max(missing, 0)
+    assert all(x >= 0 for x in res)
+
+
+@given(nonzero_weights, days, st.integers(min_value=0, max_value=20),
+       st.lists(st.sampled_from((0, 60, 240, 470, 480, 600)), min_size=21, max_size=21),
+       st.integers(min_value=0, max_value=3), st.randoms(use_true_random=False))
+def test_plan_fills_days(w, start, span, logged_list, k, rnd):
+    tickets = [{"issue": f"PRJ-{i}", "weight": x} for i, x in enumerate(w)]
+    wd = working_days(start, start + dt.timedelta(days=span))
+    logged = dict(zip(wd, logged_list))
+    plan, stats = plan_worklogs(tickets, wd, logged, k, random.Random(rnd.random()))
+    per_day = {}
+    for e in plan:
+        assert e["minutes"] > 0
+        per_day[e["day"]] = per_day.get(e["day"], 0) + e["minutes"]
+    for d in wd:
+        assert per_day.get(d, 0) == max(DAY_TARGET_MINUTES - logged[d], 0)
+    assert stats["full_days"] == sum(1 for d in wd if logged[d] >= DAY_TARGET_MINUTES)
+
+
+# ---------- workdays / Jira formats ----------
+@given(days, st.integers(min_value=-3, max_value=60))
+def test_working_days_match_brute_force(start, span):
+    end = start + dt.timedelta(days=span)
+    brute = [start + dt.timedelta(days=i) for i in range(span + 1)]
+    assert working_days(start, end) == [d for d in brute if is_workday(d)]
+    assert working_days(start, end, skip_weekends=False, skip_sk_holidays=False) == brute
+
+
+@given(days, st.integers(min_value=0, max_value=13),
+       st.lists(st.sampled_from((0, 60, 240, 480)), min_size=14, max_size=14))
+def test_format_logged_days_totals_only_the_listed_days(start, span, minutes):
+    every_day = [start + dt.timedelta(days=i) for i in range(14)]
+    logged = dict(zip(every_day, minutes))
+    wd = working_days(start, start + dt.timedelta(days=span))
+    text = format_logged_days(wd, logged)
+    total = sum(logged[d] for d in wd)
+    assert f"| spolu {minutes_to_jira_time(total)} z {minutes_to_jira_time(DAY_TARGET_MINUTES * len(wd))}" in text
+    other = sum(minutes) - total
+    assert (f" + mimo týchto dní {minutes_to_jira_time(other)}" in text) == (other > 0)
+
+
+@given(st.integers(min_value=0, max_value=24 * 60))
+def test_minutes_to_jira_time_round_trips(m):
+    assert jira_time_to_minutes(minutes_to_jira_time(m)) == m
+
+
+@given(days)
+def test_local_iso_with_tz_keeps_day_and_time(day):
+    parsed = dt.datetime.strptime(local_iso_with_tz(day, hour=16, minute=0), "%Y-%m-%dT%H:%M:%S.%f%z")
+    assert parsed.date() == day and (parsed.hour, parsed.minute) == (16, 0)
+
+
+# ---------- issue keys / pasted blocks ----------
+@given(keys)
+def test_extract_issue_key_normalizes_every_form(key):
+    forms = (key, key.lower(), f"  {key}  ", f"https://x.atlassian.net/browse/{key.lower()}",
+             f"https://jira.example.com/browse/{key}?focusedCommentId=1")
+    for raw in forms:
+        assert extract_issue_key(raw) == key
+        assert extract_issue_key(extract_issue_key(raw)) == key
+
+
+@given(numeric_ids)
+def test_extract_issue_key_reads_jspa_ids(digits):
+    assert extract_issue_key(digits) == digits
+    for raw in (f"https://jira.example.com/secure/ViewIssue.jspa?id={digits}",
+                f"https://jira.example.com/secure/CreateWorklog!default.jspa?id={digits}&decorator=dialog"):
+        assert extract_issue_key(raw) == digits
+        assert not looks_like_jql(f"{raw} https://jira.example.com/issues/?filter={digits}")
+
+
+@given(st.lists(st.one_of(keys, numeric_ids), max_size=20), st.lists(st.sampled_from((" ", "\n", ",", ";", "|", ", ")),
+                                                                       min_size=20, max_size=20))
+def test_parse_ticket_block_keeps_order_without_duplicates(tickets, seps):
+    text = "".join(t + sep for t, sep in zip(tickets + tickets, seps + seps))
+    parsed, skipped = parse_ticket_block(text)
+    assert parsed == list(dict.fromkeys(tickets))
+    assert skipped == []
+
+
+# ---------- date ranges ----------
+@given(days)
+def test_date_ranges(d):
+    s = start_of_week(d)
+    assert s.weekday() == 0 and 0 <= (d - s).days < 7
+    assert end_of_week(d) - s == dt.timedelta(days=4)
+    first, last = month_range(d)
+    assert first.day == 1 and first <= d <= last
+    assert (last + dt.timedelta(days=1)).day == 1 and first.month == last.month
+    lw_start, lw_end = last_week_range(d)
+    assert lw_start == s - dt.timedelta(days=7) and lw_end == lw_start + dt.timedelta(days=4)
+
+
+@given(days, st.sampled_from(("today", "this_week", "last_week", "this_month")))
+def test_resolve_range_contains_a_sane_span(d, spec):
+    a, b = resolve_range(spec, d)
+    assert a <= b and (b - a).days < 31
+    if spec in ("this_week", "last_week"):
+        # Monday..Friday of d's week (or the one before), even when d is a weekend day
+        assert a.weekday() == 0 and b - a == dt.timedelta(days=4)
+        assert a == start_of_week(d) - dt.timedelta(days=7 if spec == "last_week" else 0)
+    else:
+        assert a <= d <= b
+
+
+@given(days, days)
+def test_resolve_range_explicit(a, b):
+    assert resolve_range({"from": a.isoformat(), "to": b.isoformat()}) == (a, b)
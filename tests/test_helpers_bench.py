@@ -0,0 +1,43 @@
+# test_helpers_bench.py
+# pytest-benchmark timings of the 8h split and the date helpers (the hot part of planning a range).
+# Skipped when pytest-benchmark is not installed (pip install pytest-benchmark);
+# compare runs with `pytest tests/test_helpers_bench.py --benchmark-autosave --benchmark-compare`.
+
+import datetime as dt
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from jira_worklog_helpers import (  # noqa: E402
+    day_balances, proportional_split, resolve_range, split_missing_minutes, working_days,
+)
+
+WEIGHTS5 = [1 + i % 3 for i in range(5)]
+WEIGHTS50 = [1 + i % 7 for i in range(50)]
+YEAR = working_days(dt.date(2025, 1, 1), dt.date(2025, 12, 31))
+HALF_LOGGED = {d: 240 for d in YEAR[::2]}
+
+
+@pytest.mark.parametrize("weights", [WEIGHTS5, WEIGHTS50], ids=["5", "50"])
+def test_bench_proportional_split(benchmark, weights):
+    assert sum(benchmark(proportional_split, 480, weights)) == 480
+
+
+@pytest.mark.parametrize("weights", [WEIGHTS5, WEIGHTS50], ids=["5", "50"])
+def test_bench_split_missing_minutes(benchmark, weights):
+    assert sum(benchmark(split_missing_minutes, 233, weights)) == 233
+
+
+def test_bench_working_days_year(benchmark):
+    assert benchmark(working_days, dt.date(2025, 1, 1), dt.date(2025, 12, 31)) == YEAR
+
+
+def test_bench_day_balances_year(benchmark):
+    assert len(benchmark(day_balances, YEAR, HALF_LOGGED)) == len(YEAR)
+
+
+@pytest.mark.parametrize("spec", ["last_week", "this_month"])
+def test_bench_resolve_range(benchmark, spec):
+    a, b = benchmark(resolve_range, spec, dt.date(2025, 10, 8))
+    assert a <= b